@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Set
 
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
@@ -33,13 +33,145 @@ PROXY_STATIC_DEFENCE: Set[UnitID] = {
     UnitID.COMMANDCENTER,
     UnitID.PHOTONCANNON,
 }
+DETECTOR_TYPES: Set[UnitID] = {
+    UnitID.PHOTONCANNON,
+    UnitID.MISSILETURRET,
+    UnitID.SPORECRAWLER,
+    UnitID.OBSERVER,
+    UnitID.OBSERVERSIEGEMODE,
+    UnitID.OVERSEER,
+    UnitID.OVERSEERSIEGEMODE,
+    UnitID.RAVEN,
+}
+
+# config keys, see `config.yml`
+CREEP_SPOTTERS: str = "CreepSpotters"
+COVERAGE_CHANGE_THRESHOLD: str = "CoverageChangeThreshold"
+UPDATE_INTERVAL: str = "UpdateInterval"
+WORKER_DEFENCE: str = "WorkerDefence"
+ACTIVE_DURATION: str = "ActiveDuration"
+CLOSE_WAKE_RADIUS: str = "CloseWakeRadius"
+EARLY_GAME_WINDOW: str = "EarlyGameWindow"
+WAKE_RADIUS: str = "WakeRadius"
+PERFORMANCE: str = "Performance"
+ESCALATE_AFTER_STEPS: str = "EscalateAfterSteps"
+RECOVER_AFTER_STEPS: str = "RecoverAfterSteps"
+RECOVER_RATIO: str = "RecoverRatio"
+REDUCED_TICK_INTERVAL: str = "ReducedTickInterval"
+STEP_TIME_BUDGET: str = "StepTimeBudget"
+STEP_TIME_SMOOTHING: str = "StepTimeSmoothing"
+TUMOR_THROTTLE_INTERVAL: str = "TumorThrottleInterval"
+GAME_STEP_CONTROL: str = "GameStepControl"
+COMBAT_GAME_STEP: str = "CombatGameStep"
+COMBAT_HOLD_TIME: str = "CombatHoldTime"
+ENABLED: str = "Enabled"
+HEADROOM_RATIO: str = "HeadroomRatio"
+INTENSE_COMBAT_UNITS: str = "IntenseCombatUnits"
+MAX_GAME_STEP: str = "MaxGameStep"
+MIN_GAME_STEP: str = "MinGameStep"
+THREAT_RADIUS: str = "ThreatRadius"
+TELEMETRY: str = "Telemetry"
+CAPACITY: str = "Capacity"
+DIRECTORY: str = "Directory"
+DECISION_LOG: str = "DecisionLog"
+NYDUS_TRANSIT: str = "NydusTransit"
+LOAD_TIME: str = "LoadTime"
+REPLAN_INTERVAL: str = "ReplanInterval"
+UNLOAD_TIME: str = "UnloadTime"
+NYDUS_TARGETING: str = "NydusTargeting"
+ARMY_DISTANCE_WEIGHT: str = "ArmyDistanceWeight"
+CANAL_LOSS_DECAY: str = "CanalLossDecay"
+CANAL_LOSS_WEIGHT: str = "CanalLossWeight"
+DETECTION_RADIUS: str = "DetectionRadius"
+DETECTION_WEIGHT: str = "DetectionWeight"
+PATH_DISTANCE_WEIGHT: str = "PathDistanceWeight"
+SAFETY_CHECK_INTERVAL: str = "SafetyCheckInterval"
+SPOT_COST_WEIGHT: str = "SpotCostWeight"
+SPOT_REFRESH_INTERVAL: str = "SpotRefreshInterval"
+REINFORCEMENT_CANALS: str = "ReinforcementCanals"
+ENEMY_RADIUS: str = "EnemyRadius"
+NYDUS_SPACING: str = "NydusSpacing"
+PATH_REFRESH_INTERVAL: str = "PathRefreshInterval"
+PLACEMENT_CHECKS: str = "PlacementChecks"
+TRANSFUSE: str = "Transfuse"
+HEALTH_THRESHOLD: str = "HealthThreshold"
+MIN_DEFICIT: str = "MinDeficit"
+ENERGY_PLANNER: str = "EnergyPlanner"
+EARLY_RESERVE: str = "EarlyReserve"
+HORIZON: str = "Horizon"
+LATE_GAME_TIME: str = "LateGameTime"
+LATE_RESERVE: str = "LateReserve"
+MID_GAME_TIME: str = "MidGameTime"
+MID_RESERVE: str = "MidReserve"
+THREAT_RESERVE: str = "ThreatReserve"
+THREAT_UNITS: str = "ThreatUnits"
+LEVEL_OF_DETAIL: str = "LevelOfDetail"
+CALM_INTERVAL: str = "CalmInterval"
+CONTESTED_RADIUS: str = "ContestedRadius"
+ENGAGEMENT_ESTIMATE: str = "EngagementEstimate"
+CONFIDENT_RATIO: str = "ConfidentRatio"
+SAMPLE_INTERVAL: str = "SampleInterval"
+ENEMY_MEMORY: str = "EnemyMemory"
+HALF_LIFE: str = "HalfLife"
+STRUCTURE_FORGET_AFTER: str = "StructureForgetAfter"
+UNIT_FORGET_AFTER: str = "UnitForgetAfter"
+ENEMY_CLUSTERS: str = "EnemyClusters"
+CELL_SIZE: str = "CellSize"
+MIN_SHARE: str = "MinShare"
+SQUAD_SHARE: str = "SquadShare"
+BASE_DISTANCES: str = "BaseDistances"
+PATHS_PER_JOB: str = "PathsPerJob"
+SAVE_TO_DISK: str = "SaveToDisk"
+
+
+class DegradationLevel(IntEnum):
+    """Each level includes all the levels before it."""
+
+    NONE = 0
+    NO_DEBUG_DRAWING = 1
+    # creep spotters and tumors update less often
+    THROTTLE_CREEP = 2
+    # scout and nydus managers run every few steps
+    REDUCED_TICK_RATE = 3
+    # queen squads get one order for the squad instead of per unit micro
+    SQUAD_ORDERS = 4
+
+
+class SquadEngagement(IntEnum):
+    """What a queen squad should do about the enemies near it."""
+
+    RETREAT = 0
+    # too close to call, only fight on creep
+    HOLD = 1
+    ENGAGE = 2
 
 
 class RequestType(str, Enum):
+    # base distance manager
+    GET_BASE_DISTANCES = "GET_BASE_DISTANCES"
+
     # combat manager
     GET_ATTACK_TARGET = "GET_ATTACK_TARGET"
+    GET_ENEMY_CLUSTERS = "GET_ENEMY_CLUSTERS"
+    GET_ENGAGEMENT_ESTIMATOR = "GET_ENGAGEMENT_ESTIMATOR"
     GET_SHOULD_BE_AGGRESSIVE = "GET_SHOULD_BE_AGGRESSIVE"
 
+    # energy manager
+    GET_ENERGY_PLAN = "GET_ENERGY_PLAN"
+
+    # enemy intel manager
+    GET_ENEMY_MEMORY = "GET_ENEMY_MEMORY"
+    GET_ENEMY_SPATIAL_INDEX = "GET_ENEMY_SPATIAL_INDEX"
+    GET_ENEMY_SPATIAL_INDEX_STATS = "GET_ENEMY_SPATIAL_INDEX_STATS"
+
+    # performance manager
+    GET_AVERAGE_STEP_TIME = "GET_AVERAGE_STEP_TIME"
+    GET_DEBUG_DRAWING_ENABLED = "GET_DEBUG_DRAWING_ENABLED"
+    GET_DEGRADATION_LEVEL = "GET_DEGRADATION_LEVEL"
+
+    # queen manager
+    GET_TRANSFUSE_STATS = "GET_TRANSFUSE_STATS"
+
     # nydus manager
     GET_CURRENT_CANAL_TARGET = "GET_CURRENT_CANAL_TARGET"
     GET_CURRENT_NYDUS_TARGET = "GET_CURRENT_NYDUS_TARGET"
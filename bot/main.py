@@ -1,32 +1,57 @@
-from typing import Optional
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Optional
 
 from ares import AresBot
 from ares.behaviors.combat.individual.tumor_spread_creep import TumorSpreadCreep
 from ares.behaviors.macro import Mining
 from ares.consts import UnitRole
 from cython_extensions.geometry import cy_distance_to_squared
+from sc2.data import Result
 from sc2.ids.ability_id import AbilityId
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.unit import Unit
 
-from bot.managers.combat_manager import CombatManager
-from bot.managers.macro_manager import MacroManager
-from bot.managers.nydus_manager import NydusManager
+from bot.consts import PERFORMANCE, TUMOR_THROTTLE_INTERVAL, DegradationLevel
 from bot.managers.queen_bot_mediator import QueenBotMediator
-from bot.managers.queen_manager import QueenManager
-from bot.managers.scout_manager import ScoutManager
-from bot.managers.worker_defence_manager import WorkerDefenceManager
+from bot.managers.tag_registry import TagRegistry
 from bot.unit_control.base_control import BaseControl
-from bot.unit_control.overlord_creep_spotters import OverlordCreepSpotters
+from bot.unit_control.maneuver_pool import ManeuverPool
+
+# not a unit tag, `Mining` is registered once per step for every worker
+MINING_POOL_KEY: int = 0
+
+# managers are imported in `on_start`, after the game has connected
+if TYPE_CHECKING:
+    from bot.managers.base_distance_manager import BaseDistanceManager
+    from bot.managers.combat_manager import CombatManager
+    from bot.managers.decision_log_manager import DecisionLogManager
+    from bot.managers.enemy_intel_manager import EnemyIntelManager
+    from bot.managers.energy_manager import EnergyManager
+    from bot.managers.game_step_manager import GameStepManager
+    from bot.managers.macro_manager import MacroManager
+    from bot.managers.nydus_manager import NydusManager
+    from bot.managers.performance_manager import PerformanceManager
+    from bot.managers.queen_manager import QueenManager
+    from bot.managers.scout_manager import ScoutManager
+    from bot.managers.telemetry_manager import TelemetryManager
+    from bot.managers.worker_defence_manager import WorkerDefenceManager
 
 
 class MyBot(AresBot):
-    macro_manager: MacroManager
-    queen_manager: QueenManager
-    combat_manager: CombatManager
-    scout_manager: ScoutManager
-    nydus_manager: NydusManager
-    worker_defence_manager: WorkerDefenceManager
+    base_distance_manager: "BaseDistanceManager"
+    decision_log_manager: "DecisionLogManager"
+    enemy_intel_manager: "EnemyIntelManager"
+    energy_manager: "EnergyManager"
+    game_step_manager: "GameStepManager"
+    macro_manager: "MacroManager"
+    queen_manager: "QueenManager"
+    combat_manager: "CombatManager"
+    scout_manager: "ScoutManager"
+    telemetry_manager: "TelemetryManager"
+    nydus_manager: "NydusManager"
+    performance_manager: "PerformanceManager"
+    worker_defence_manager: "WorkerDefenceManager"
     _overlord_creep_spotters: BaseControl
 
     def __init__(self, game_step_override: Optional[int] = None):
@@ -41,9 +66,39 @@ class MyBot(AresBot):
         super().__init__(game_step_override)
 
         self._queen_bot_mediator: QueenBotMediator = QueenBotMediator()
+        # managers register their tag keyed state here as they are created
+        self.tag_registry: TagRegistry = TagRegistry()
+        # per unit behaviors reused across steps by the unit controllers
+        self.maneuver_pool: ManeuverPool = ManeuverPool(self)
         self.sent_bm: bool = False
+        self._background_jobs: deque[Callable[[], None]] = deque()
+        # jobs that may still run before the next step, so a job queueing
+        # itself again waits a step rather than running straight away
+        self._runnable_jobs: int = 0
+
+    def queue_background_job(self, job: Callable[[], None]) -> None:
+        """Queue work that does not need the latest game state.
+
+        With `ladder.py --Pipelined` jobs run while we wait on the next
+        observation (see `bot/pipelined_game.py`), otherwise they run at the
+        start of the next step. Jobs must not issue unit commands, jobs they
+        queue run a step later.
+        """
+        self._background_jobs.append(job)
+
+    def next_background_job(self) -> Optional[Callable[[], None]]:
+        if self._runnable_jobs == 0:
+            return None
+        self._runnable_jobs -= 1
+        return self._background_jobs.popleft()
 
     async def on_step(self, iteration: int) -> None:
+        step_start: float = time.perf_counter()
+        # anything not picked up while waiting on the observation
+        self._runnable_jobs = len(self._background_jobs)
+        while job := self.next_background_job():
+            job()
+
         await super(MyBot, self).on_step(iteration)
         per_gas: int = 3
         if self.supply_workers < 30 and (
@@ -51,21 +106,40 @@ class MyBot(AresBot):
         ):
             per_gas = 0
 
-        self.register_behavior(Mining(workers_per_gas=per_gas))
+        self.register_behavior(
+            self.maneuver_pool.get(MINING_POOL_KEY, Mining, workers_per_gas=per_gas)
+        )
+        self.enemy_intel_manager.update()
         await self.macro_manager.update()
+        self.energy_manager.update()
         self.queen_manager.update()
         self.combat_manager.update()
-        self.scout_manager.update()
+        skip_tick: bool = self.performance_manager.should_skip_tick(iteration)
+        if not skip_tick:
+            self.scout_manager.update()
         self.worker_defence_manager.update()
-        await self.nydus_manager.update()
+        if not skip_tick:
+            await self.nydus_manager.update()
 
+        throttle_creep: bool = self.performance_manager.is_degraded(
+            DegradationLevel.THROTTLE_CREEP
+        )
         self._overlord_creep_spotters.execute(
-            self.mediator.get_units_from_role(role=UnitRole.OVERLORD_CREEP_SPOTTER)
+            self.mediator.get_units_from_role(role=UnitRole.OVERLORD_CREEP_SPOTTER),
+            throttle=throttle_creep,
         )
 
+        tumor_interval: int = (
+            self.config[PERFORMANCE][TUMOR_THROTTLE_INTERVAL] if throttle_creep else 1
+        )
         for tumor in self.structures(UnitID.CREEPTUMORBURROWED):
+            # spread the tumors over several steps
+            if tumor.tag % tumor_interval != iteration % tumor_interval:
+                continue
             self.register_behavior(
-                TumorSpreadCreep(tumor, self.enemy_start_locations[0])
+                self.maneuver_pool.get(
+                    tumor.tag, TumorSpreadCreep, tumor, self.enemy_start_locations[0]
+                )
             )
         if not self.sent_bm and self.mediator.get_creep_coverage > 85.0:
             await self.chat_send("That's over 85% of the map covered in creep")
@@ -104,22 +178,61 @@ class MyBot(AresBot):
                     to_role=UnitRole.GATHERING,
                 )
 
+        step_time: float = (time.perf_counter() - step_start) * 1000.0
+        self.performance_manager.record_step_time(step_time)
+        self.telemetry_manager.record(
+            step_time, self._overlord_creep_spotters.num_updates
+        )
+        self.game_step_manager.update()
+        self.decision_log_manager.update()
+        self._runnable_jobs = len(self._background_jobs)
+
     async def on_start(self) -> None:
         await super(MyBot, self).on_start()
+        # deferred from module import so `run.py` gets to the game sooner
+        from bot.managers.base_distance_manager import BaseDistanceManager
+        from bot.managers.combat_manager import CombatManager
+        from bot.managers.decision_log_manager import DecisionLogManager
+        from bot.managers.enemy_intel_manager import EnemyIntelManager
+        from bot.managers.energy_manager import EnergyManager
+        from bot.managers.game_step_manager import GameStepManager
+        from bot.managers.macro_manager import MacroManager
+        from bot.managers.nydus_manager import NydusManager
+        from bot.managers.performance_manager import PerformanceManager
+        from bot.managers.queen_manager import QueenManager
+        from bot.managers.scout_manager import ScoutManager
+        from bot.managers.telemetry_manager import TelemetryManager
+        from bot.managers.worker_defence_manager import WorkerDefenceManager
+        from bot.unit_control.overlord_creep_spotters import OverlordCreepSpotters
+
+        self.base_distance_manager = BaseDistanceManager(self)
+        self.decision_log_manager = DecisionLogManager(self)
+        self.enemy_intel_manager = EnemyIntelManager(self)
+        self.energy_manager = EnergyManager(self)
+        self.game_step_manager = GameStepManager(self)
         self.macro_manager = MacroManager(self)
         self.queen_manager = QueenManager(self)
         self.combat_manager = CombatManager(self)
         self.scout_manager = ScoutManager(self)
         self.nydus_manager = NydusManager(self)
+        self.performance_manager = PerformanceManager(self)
+        self.telemetry_manager = TelemetryManager(self)
         self.worker_defence_manager = WorkerDefenceManager(self)
 
         self._queen_bot_mediator.add_managers(
             [
+                self.base_distance_manager,
+                self.decision_log_manager,
+                self.enemy_intel_manager,
+                self.energy_manager,
+                self.game_step_manager,
                 self.macro_manager,
                 self.queen_manager,
                 self.combat_manager,
                 self.nydus_manager,
                 self.scout_manager,
+                self.performance_manager,
+                self.telemetry_manager,
                 self.worker_defence_manager,
             ]
         )
@@ -132,6 +245,16 @@ class MyBot(AresBot):
                 tag=unit.tag, role=UnitRole.OVERLORD_CREEP_SPOTTER
             )
 
+    async def on_end(self, game_result: Result) -> None:
+        await super(MyBot, self).on_end(game_result)
+        self.telemetry_manager.flush(game_result)
+        self.decision_log_manager.close()
+
+    async def on_building_construction_started(self, unit: Unit) -> None:
+        await super(MyBot, self).on_building_construction_started(unit)
+        self.decision_log_manager.on_building_construction_started(unit)
+        self.nydus_manager.on_building_construction_started(unit)
+
     async def on_unit_created(self, unit: Unit) -> None:
         await super(MyBot, self).on_unit_created(unit)
         if unit.type_id == UnitID.OVERLORD:
@@ -144,6 +267,11 @@ class MyBot(AresBot):
 
     async def on_unit_destroyed(self, unit_tag: int) -> None:
         await super(MyBot, self).on_unit_destroyed(unit_tag)
+        self.tag_registry.on_unit_destroyed(unit_tag)
+
+    async def on_unit_type_changed(self, unit: Unit, previous_type: UnitID) -> None:
+        await super(MyBot, self).on_unit_type_changed(unit, previous_type)
+        self.tag_registry.on_unit_type_changed(unit.tag)
 
     async def on_unit_took_damage(self, unit: Unit, amount_damage_taken: float) -> None:
         await super(MyBot, self).on_unit_took_damage(unit, amount_damage_taken)
@@ -0,0 +1,126 @@
+import os
+import re
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import numpy as np
+from loguru import logger
+from sc2.position import Point2
+
+from bot.consts import (
+    BASE_DISTANCES,
+    DIRECTORY,
+    PATHS_PER_JOB,
+    SAVE_TO_DISK,
+    RequestType,
+)
+from bot.managers.base_distances import BaseDistances, point_key
+from bot.managers.queen_bot_mediator import QueenBotMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class BaseDistanceManager:
+    """Ground distances and paths between bases, see `BaseDistances`.
+
+    Covers every expansion location and the top of both main ramps. The
+    matrix saved for this map is loaded if there is one, otherwise missing
+    paths are found a few at a time in background jobs and the matrix is
+    saved once it is complete. Pairs asked for before then are found on the
+    spot.
+    """
+
+    queen_bot_mediator: QueenBotMediator
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+
+        settings: dict = self.ai.config[BASE_DISTANCES]
+        map_name: str = re.sub(r"[^\w-]+", "_", self.ai.game_info.map_name)
+        self.file_path: str = os.path.join(settings[DIRECTORY], f"{map_name}.npz")
+        # before any influence, so paths only depend on the map
+        self._grid: np.ndarray = self.ai.mediator.get_ground_grid.copy()
+
+        points: list[Point2] = self._base_points()
+        loaded: Optional[BaseDistances] = None
+        if settings[SAVE_TO_DISK] and os.path.isfile(self.file_path):
+            try:
+                loaded = BaseDistances.load(self.file_path, points, self._find_path)
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Couldn't load {self.file_path}: {e}")
+        self.base_distances: BaseDistances = loaded or BaseDistances(
+            np.array(points), self._find_path
+        )
+        if not self.base_distances.complete:
+            self.ai.queue_background_job(self._fill_missing_paths)
+
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {
+            RequestType.GET_BASE_DISTANCES: lambda kwargs: self.base_distances,
+        }
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.queen_bot_requests_dict[request](kwargs)
+
+    def _base_points(self) -> list[Point2]:
+        """Mains, naturals and ramps first, so their paths are found first."""
+        points: list[Point2] = [
+            self.ai.start_location,
+            self.ai.mediator.get_own_nat,
+            self.ai.enemy_start_locations[0],
+            self.ai.mediator.get_enemy_nat,
+            self.ai.main_base_ramp.top_center,
+            self.ai.mediator.get_enemy_ramp.top_center,
+        ] + list(self.ai.expansion_locations_list)
+        unique: dict[tuple[int, int], Point2] = {}
+        for point in points:
+            unique.setdefault(point_key(point), point)
+        return list(unique.values())
+
+    def _find_path(
+        self, start: tuple[float, float], target: tuple[float, float]
+    ) -> Optional[np.ndarray]:
+        path: Optional[list[Point2]] = self.ai.mediator.find_raw_path(
+            start=Point2(start), target=Point2(target), grid=self._grid, sensitivity=1
+        )
+        return np.array(path, dtype=np.float32) if path else None
+
+    def _fill_missing_paths(self) -> None:
+        """Background job, queues itself again until every pair is known."""
+        settings: dict = self.ai.config[BASE_DISTANCES]
+        for i, j in self.base_distances.missing_pairs()[: settings[PATHS_PER_JOB]]:
+            self.base_distances.fill_pair(i, j)
+
+        if not self.base_distances.complete:
+            self.ai.queue_background_job(self._fill_missing_paths)
+        elif settings[SAVE_TO_DISK]:
+            os.makedirs(settings[DIRECTORY], exist_ok=True)
+            self.base_distances.save(self.file_path)
+            logger.info(
+                f"{self.ai.time_formatted} - Saved base distances to {self.file_path}"
+            )
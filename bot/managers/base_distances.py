@@ -0,0 +1,170 @@
+"""Ground paths and path distances between every base location on the map.
+
+Points are the expansion locations plus the ramps, given once when the map
+is known. A pair's path is found on first use, or ahead of time by
+`BaseDistanceManager`, then lookups are a dict and an array index. The
+whole matrix is saved per map so later games don't find any paths.
+
+Plain NumPy so it can be benchmarked without the game, see
+`scripts/benchmarks/base_distances_benchmark.py`.
+"""
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+# (start, target) -> path points, None if there is no path
+FindPath = Callable[[tuple[float, float], tuple[float, float]], Optional[np.ndarray]]
+
+
+def point_key(point: tuple[float, float]) -> tuple[int, int]:
+    """Half cell key, expansion locations and ramp centers fall on halves."""
+    return round(point[0] * 2.0), round(point[1] * 2.0)
+
+
+class BaseDistances:
+    """Symmetric matrix of ground path distances between points.
+
+    Parameters
+    ----------
+    points :
+        (k, 2) base locations, in order of importance.
+    find_path :
+        Finds a path for a pair nobody has asked about yet. Without it
+        unknown pairs stay unknown.
+    """
+
+    def __init__(self, points: np.ndarray, find_path: Optional[FindPath] = None):
+        self.points: np.ndarray = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.find_path: Optional[FindPath] = find_path
+
+        num_points: int = len(self.points)
+        # inf where there is no path, nan where we haven't looked yet
+        self.distances: np.ndarray = np.full((num_points, num_points), np.nan)
+        np.fill_diagonal(self.distances, 0.0)
+        # (i, j) with i < j -> path from i to j
+        self.paths: dict[tuple[int, int], np.ndarray] = {}
+        self._index: dict[tuple[int, int], int] = {
+            point_key(point): i for i, point in enumerate(self.points.tolist())
+        }
+
+    def __contains__(self, point: tuple[float, float]) -> bool:
+        return point_key(point) in self._index
+
+    @property
+    def complete(self) -> bool:
+        return not np.isnan(self.distances).any()
+
+    def index_of(self, point: tuple[float, float]) -> Optional[int]:
+        return self._index.get(point_key(point), None)
+
+    def nearest_index(self, point: tuple[float, float]) -> int:
+        """Index of the point closest to `point` in a straight line."""
+        offsets: np.ndarray = self.points - np.asarray(point, dtype=np.float32)
+        return int(np.argmin(np.einsum("ij,ij->i", offsets, offsets)))
+
+    def distance(
+        self, start: tuple[float, float], target: tuple[float, float]
+    ) -> Optional[float]:
+        """Ground distance, inf if there is no path, None if not base points."""
+        i: Optional[int] = self.index_of(start)
+        j: Optional[int] = self.index_of(target)
+        if i is None or j is None:
+            return None
+        if np.isnan(self.distances[i, j]):
+            self.fill_pair(i, j)
+        distance: float = float(self.distances[i, j])
+        return None if np.isnan(distance) else distance
+
+    def path(
+        self, start: tuple[float, float], target: tuple[float, float]
+    ) -> Optional[np.ndarray]:
+        """(p, 2) ground path from `start` to `target`, None if unknown."""
+        i: Optional[int] = self.index_of(start)
+        j: Optional[int] = self.index_of(target)
+        if i is None or j is None:
+            return None
+        if np.isnan(self.distances[i, j]):
+            self.fill_pair(i, j)
+        if i <= j:
+            return self.paths.get((i, j), None)
+        path: Optional[np.ndarray] = self.paths.get((j, i), None)
+        return None if path is None else path[::-1]
+
+    def missing_pairs(self) -> list[tuple[int, int]]:
+        """Pairs not looked up yet, pairs of earlier points first."""
+        rows, columns = np.nonzero(np.triu(np.isnan(self.distances), k=1))
+        return list(zip(rows.tolist(), columns.tolist()))
+
+    def fill_pair(self, i: int, j: int) -> None:
+        if self.find_path is None:
+            return
+        i, j = min(i, j), max(i, j)
+        path: Optional[np.ndarray] = self.find_path(
+            tuple(self.points[i].tolist()), tuple(self.points[j].tolist())
+        )
+        if path is None or len(path) == 0:
+            self.set_path(i, j, None)
+        else:
+            self.set_path(i, j, np.asarray(path, dtype=np.float32).reshape(-1, 2))
+
+    def set_path(self, i: int, j: int, path: Optional[np.ndarray]) -> None:
+        """Store the path from i to j (i < j), None if there isn't one."""
+        if path is None:
+            self.distances[i, j] = self.distances[j, i] = np.inf
+            return
+        self.paths[(i, j)] = path
+        # the path doesn't always start and end exactly on the points
+        ends: np.ndarray = np.vstack([self.points[i], path, self.points[j]])
+        length: float = float(np.linalg.norm(np.diff(ends, axis=0), axis=1).sum())
+        self.distances[i, j] = self.distances[j, i] = length
+
+    def save(self, file_path: str) -> None:
+        pairs: list[tuple[int, int]] = list(self.paths)
+        paths: list[np.ndarray] = [self.paths[pair] for pair in pairs]
+        np.savez_compressed(
+            file_path,
+            points=self.points,
+            distances=self.distances,
+            path_pairs=np.array(pairs, dtype=np.int32).reshape(-1, 2),
+            path_offsets=np.cumsum([0] + [len(path) for path in paths]),
+            path_points=(
+                np.concatenate(paths) if paths else np.empty((0, 2), np.float32)
+            ),
+        )
+
+    @classmethod
+    def load(
+        cls,
+        file_path: str,
+        points: Iterable[tuple[float, float]],
+        find_path: Optional[FindPath] = None,
+    ) -> Optional["BaseDistances"]:
+        """Matrix saved by `save`, reordered to `points`.
+
+        Spawns change the order of the points between games. None if any
+        point isn't in the saved matrix, eg. the map was updated.
+        """
+        distances: BaseDistances = cls(np.array(list(points)), find_path)
+        with np.load(file_path) as saved:
+            saved_index: dict[tuple[int, int], int] = {
+                point_key(point): i for i, point in enumerate(saved["points"].tolist())
+            }
+            order: list[Optional[int]] = [
+                saved_index.get(point_key(point), None)
+                for point in distances.points.tolist()
+            ]
+            if None in order:
+                return None
+            distances.distances = saved["distances"][np.ix_(order, order)]
+
+            new_index: dict[int, int] = {old: new for new, old in enumerate(order)}
+            offsets: np.ndarray = saved["path_offsets"]
+            path_points: np.ndarray = saved["path_points"]
+            for n, (a, b) in enumerate(saved["path_pairs"].tolist()):
+                path: np.ndarray = path_points[offsets[n] : offsets[n + 1]]
+                i, j = new_index[a], new_index[b]
+                if i < j:
+                    distances.paths[(i, j)] = path
+                else:
+                    distances.paths[(j, i)] = path[::-1].copy()
+        return distances
@@ -1,6 +1,8 @@
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
+import numpy as np
 from ares import AresBot
+from ares.cache import property_cache_once_per_frame
 from ares.consts import (
     LOSS_DECISIVE_OR_WORSE,
     VICTORY_CLOSE_OR_BETTER,
@@ -13,7 +15,23 @@ from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
 from sc2.units import Units
 
-from bot.consts import ATTACK_TARGET_IGNORE, RequestType
+from bot.consts import (
+    ATTACK_TARGET_IGNORE,
+    CELL_SIZE,
+    ENABLED,
+    ENEMY_CLUSTERS,
+    RequestType,
+)
+from bot.managers.enemy_clustering import EnemyClusters, cluster_enemies
+from bot.managers.enemy_memory import EnemyMemory
+from bot.managers.enemy_spatial_index import (
+    CLOAKED,
+    FLYING,
+    HALLUCINATION,
+    STRUCTURE,
+    EnemySpatialIndex,
+)
+from bot.managers.engagement_estimator import EngagementEstimator
 from bot.managers.queen_bot_mediator import QueenBotMediator
 
 
@@ -27,33 +45,66 @@ class CombatManager:
         # 2 ways of getting aggressive
         self._combat_sim_aggressive: bool = False
         self._supply_aggressive: bool = False
+        # skips the combat sim for lopsided fights
+        self._engagement_estimator: EngagementEstimator = EngagementEstimator(ai)
 
         self.queen_bot_requests_dict: dict[RequestType, Callable] = {
             RequestType.GET_ATTACK_TARGET: lambda kwargs: self.attack_target,
+            RequestType.GET_ENEMY_CLUSTERS: lambda kwargs: self.enemy_clusters,
+            RequestType.GET_ENGAGEMENT_ESTIMATOR: lambda kwargs: (
+                self._engagement_estimator
+            ),
             RequestType.GET_SHOULD_BE_AGGRESSIVE: lambda kwargs: self._should_be_aggressive,
         }
 
     @property
     def attack_target(self) -> Point2:
-        enemy_units: Units = self.ai.enemy_units.filter(
-            lambda u: u.type_id not in ATTACK_TARGET_IGNORE
-            and not u.is_flying
-            and not u.is_cloaked
-            and not u.is_hallucination
-        )
-        center_mass, num_units = cy_find_units_center_mass(enemy_units, 12.5)
-        enemy_structures: Units = self.ai.enemy_structures
+        enemy_index: EnemySpatialIndex = self.queen_bot_mediator.get_enemy_spatial_index
+        enemy_units: Units = enemy_index.to_units(self._target_indices(enemy_index))
         if enemy_units(UnitID.WIDOWMINEBURROWED):
             return cy_closest_to(self.ai.start_location, enemy_units).position
-        elif num_units > 6:
-            return Point2(center_mass)
-        elif enemy_structures:
-            return cy_closest_to(self.ai.start_location, enemy_structures).position
+        elif center_mass := self._main_enemy_group(enemy_units):
+            return center_mass
+
+        # structures stay in memory out of vision, so the target doesn't jump
+        # back to the start location when they're not visible
+        memory: EnemyMemory = self.queen_bot_mediator.get_enemy_memory
+        start: Point2 = self.ai.start_location
+        structures: np.ndarray = memory.query(include_flags=STRUCTURE)
+        if structures.size:
+            return Point2(memory.positions[memory.closest(structures, start)].tolist())
         elif enemy_units:
-            return cy_closest_to(self.ai.start_location, enemy_units).position
+            return cy_closest_to(start, enemy_units).position
+
+        remembered_units: np.ndarray = memory.query(
+            exclude_type_ids=ATTACK_TARGET_IGNORE,
+            exclude_flags=STRUCTURE | FLYING | CLOAKED,
+        )
+        if remembered_units.size:
+            return Point2(
+                memory.positions[memory.closest(remembered_units, start)].tolist()
+            )
         else:
             return self.ai.enemy_start_locations[0]
 
+    @property_cache_once_per_frame
+    def enemy_clusters(self) -> EnemyClusters:
+        """Ground enemies we'd attack, grouped once per frame.
+
+        `QueenManager` hands these out to defence squads, see `assign_squads`.
+        """
+        enemy_index: EnemySpatialIndex = self.queen_bot_mediator.get_enemy_spatial_index
+        indices: np.ndarray = self._target_indices(enemy_index)
+        ground_dps, _, hp, _ = self._engagement_estimator.army_arrays(
+            enemy_index.to_units(indices)
+        )
+        return cluster_enemies(
+            enemy_index.positions[indices],
+            hp,
+            ground_dps,
+            self.ai.config[ENEMY_CLUSTERS][CELL_SIZE],
+        )
+
     def manager_request(
         self,
         receiver: str,
@@ -86,6 +137,27 @@ class CombatManager:
     def update(self) -> None:
         self._update_aggressive_status()
 
+    def _main_enemy_group(self, enemy_units: Units) -> Optional[Point2]:
+        """Center of the biggest group of enemies, if it's more than 6 units."""
+        if self.ai.config[ENEMY_CLUSTERS][ENABLED]:
+            clusters: EnemyClusters = self.enemy_clusters
+            if len(clusters) == 0:
+                return None
+            biggest: int = int(np.argmax(clusters.counts))
+            if clusters.counts[biggest] > 6:
+                return Point2(clusters.centers[biggest].tolist())
+            return None
+
+        center_mass, num_units = cy_find_units_center_mass(enemy_units, 12.5)
+        return Point2(center_mass) if num_units > 6 else None
+
+    @staticmethod
+    def _target_indices(enemy_index: EnemySpatialIndex) -> np.ndarray:
+        return enemy_index.indices_of_types(
+            exclude_type_ids=ATTACK_TARGET_IGNORE,
+            exclude_flags=STRUCTURE | FLYING | CLOAKED | HALLUCINATION,
+        )
+
     def _update_aggressive_status(self):
         queens: Units = self.ai.mediator.get_own_army_dict[UnitID.QUEEN]
         num_queens: int = len(queens)
@@ -99,7 +171,7 @@ class CombatManager:
             self._should_be_aggressive = True
             return
 
-        combat_sim_result: EngagementResult = self.ai.mediator.can_win_fight(
+        combat_sim_result: EngagementResult = self._engagement_estimator.can_win_fight(
             own_units=queens, enemy_units=self.ai.mediator.get_cached_enemy_army
         )
 
@@ -117,15 +189,20 @@ class CombatManager:
                 )
                 self._combat_sim_aggressive = True
 
-        avg_energy: float = sum([unit.energy for unit in queens]) / num_queens
+        # energy the combat queens will have `EnergyPlanner.Horizon` seconds
+        # from now, less this frame's tumors. Same thresholds as for the
+        # current average, read as energy when the attack arrives
+        projected_energy: float = (
+            self.queen_bot_mediator.get_energy_plan.projected_energy
+        )
         if self._supply_aggressive:
-            if self.ai.supply_army < 30 or avg_energy < 35:
+            if self.ai.supply_army < 30 or projected_energy < 35:
                 logger.info(
                     f"{self.ai.time_formatted} - Turning off supply aggressive."
                 )
                 self._supply_aggressive = False
         else:
-            if self.ai.supply_used > 178 and avg_energy > 75:
+            if self.ai.supply_used > 178 and projected_energy > 75:
                 logger.info(f"{self.ai.time_formatted} - Turning on supply aggressive.")
                 self._supply_aggressive = True
 
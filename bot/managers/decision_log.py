@@ -0,0 +1,97 @@
+"""Compact binary log of the decisions the bot makes.
+
+A log is a short header followed by fixed size little endian records, one
+per decision, appended as the game runs. Reading it back gives a NumPy
+structured array, see `read_decision_log`.
+
+Kept free of `sc2` / `ares` imports so `scripts/diff_decision_logs.py` can
+read logs without the game installed.
+"""
+import struct
+from enum import IntEnum
+from typing import BinaryIO
+
+import numpy as np
+
+MAGIC: bytes = b"QBDL"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sB")
+# game loop, decision type, key, value, x, y
+RECORD: struct.Struct = struct.Struct("<IBQiff")
+RECORD_DTYPE: np.dtype = np.dtype(
+    [
+        ("game_loop", "<u4"),
+        ("decision", "u1"),
+        ("key", "<u8"),
+        ("value", "<i4"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+    ]
+)
+
+
+class DecisionType(IntEnum):
+    """What `key`, `value`, `x` and `y` mean depends on the decision."""
+
+    # key: unit tag, value: index of the new role in `UnitRole`
+    ROLE_ASSIGNED = 1
+    # key: 0, value: 1 if we are now aggressive else 0
+    AGGRESSION = 2
+    # x, y: new nydus canal target
+    NYDUS_CANAL_TARGET = 3
+    # x, y: new nydus attack target
+    NYDUS_ATTACK_TARGET = 4
+    # key: structure type id, x, y: structure position
+    STRUCTURE_PLACED = 5
+
+
+class DecisionLogWriter:
+    """Buffer records for a step, then append them to the file in one write."""
+
+    def __init__(self, file: BinaryIO):
+        self._file: BinaryIO = file
+        self._pending: bytearray = bytearray()
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def add(
+        self,
+        game_loop: int,
+        decision: DecisionType,
+        key: int = 0,
+        value: int = 0,
+        x: float = 0.0,
+        y: float = 0.0,
+    ) -> None:
+        self._pending += RECORD.pack(game_loop, decision, key, value, x, y)
+
+    def write_pending(self) -> None:
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending.clear()
+
+    def close(self) -> None:
+        self.write_pending()
+        self._file.close()
+
+
+def read_decision_log(file_path: str) -> np.ndarray:
+    """Load every record in a log written by `DecisionLogWriter`.
+
+    Parameters
+    ----------
+    file_path :
+        Path to the log.
+
+    Returns
+    -------
+    np.ndarray :
+        Structured array with `RECORD_DTYPE`, in the order decisions were made.
+    """
+    with open(file_path, "rb") as f:
+        magic, version = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{file_path} is not a version {VERSION} decision log")
+        data: bytes = f.read()
+    # a game that crashed mid write can leave a partial record at the end
+    usable: int = len(data) - len(data) % RECORD_DTYPE.itemsize
+    return np.frombuffer(data[:usable], dtype=RECORD_DTYPE)
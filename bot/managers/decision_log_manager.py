@@ -0,0 +1,150 @@
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ares.consts import UnitRole
+from loguru import logger
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.consts import DECISION_LOG, DIRECTORY, ENABLED, RequestType
+from bot.managers.decision_log import DecisionLogWriter, DecisionType
+from bot.managers.queen_bot_mediator import QueenBotMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+ROLE_INDEX: dict[UnitRole, int] = {role: i for i, role in enumerate(UnitRole)}
+
+
+class DecisionLogManager:
+    """Stream the decisions we make each step to a binary log.
+
+    Role changes, aggression toggles and nydus target changes are found by
+    comparing against the previous step, placed structures are logged from
+    `on_building_construction_started`. Logs from two versions of the bot
+    can be compared with `scripts/diff_decision_logs.py`.
+    """
+
+    queen_bot_mediator: QueenBotMediator
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+
+        self._writer: Optional[DecisionLogWriter] = None
+        if self.ai.config[DECISION_LOG][ENABLED]:
+            directory: str = self.ai.config[DECISION_LOG][DIRECTORY]
+            os.makedirs(directory, exist_ok=True)
+            opponent_id: str = getattr(self.ai, "opponent_id", None) or "unknown"
+            self.file_path: str = os.path.join(
+                directory, f"{opponent_id}_{int(time.time())}.qbdl"
+            )
+            self._writer = DecisionLogWriter(open(self.file_path, "wb"))
+
+        self._roles: dict[int, UnitRole] = {}
+        self._aggressive: bool = False
+        self._canal_target: Optional[Point2] = None
+        self._attack_target: Optional[Point2] = None
+        self.ai.tag_registry.track(self, "_roles")
+
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {}
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.queen_bot_requests_dict[request](kwargs)
+
+    def update(self) -> None:
+        """Called at the end of every `on_step` from `bot/main.py`"""
+        if not self._writer:
+            return
+
+        game_loop: int = self.ai.state.game_loop
+        self._log_role_changes(game_loop)
+
+        aggressive: bool = self.queen_bot_mediator.get_should_be_aggressive
+        if aggressive != self._aggressive:
+            self._aggressive = aggressive
+            self._writer.add(game_loop, DecisionType.AGGRESSION, value=int(aggressive))
+
+        canal_target: Point2 = self.queen_bot_mediator.get_current_canal_target
+        if canal_target != self._canal_target:
+            self._canal_target = canal_target
+            self._log_position(game_loop, DecisionType.NYDUS_CANAL_TARGET, canal_target)
+
+        attack_target: Point2 = self.queen_bot_mediator.get_current_nydus_target
+        if attack_target != self._attack_target:
+            self._attack_target = attack_target
+            self._log_position(
+                game_loop, DecisionType.NYDUS_ATTACK_TARGET, attack_target
+            )
+
+        self._writer.write_pending()
+
+    def on_building_construction_started(self, unit: Unit) -> None:
+        if not self._writer:
+            return
+
+        self._writer.add(
+            self.ai.state.game_loop,
+            DecisionType.STRUCTURE_PLACED,
+            key=unit.type_id.value,
+            x=unit.position.x,
+            y=unit.position.y,
+        )
+
+    def close(self) -> None:
+        """Called from `on_end`, writes anything left and closes the log."""
+        if not self._writer:
+            return
+
+        self._writer.close()
+        self._writer = None
+        logger.info(
+            f"{self.ai.time_formatted} - Saved decision log to {self.file_path}"
+        )
+
+    def _log_role_changes(self, game_loop: int) -> None:
+        roles: dict[int, UnitRole] = self._roles
+        for role, tags in self.ai.mediator.get_unit_role_dict.items():
+            for tag in tags:
+                if roles.get(tag) != role:
+                    roles[tag] = role
+                    self._writer.add(
+                        game_loop,
+                        DecisionType.ROLE_ASSIGNED,
+                        key=tag,
+                        value=ROLE_INDEX[role],
+                    )
+
+    def _log_position(
+        self, game_loop: int, decision: DecisionType, position: Optional[Point2]
+    ) -> None:
+        if position:
+            self._writer.add(game_loop, decision, x=position.x, y=position.y)
+        else:
+            self._writer.add(game_loop, decision, value=-1)
@@ -0,0 +1,176 @@
+"""Group enemies into clusters on a coarse grid, and share them out to squads.
+
+Enemies are bucketed into `cell_size` cells, then occupied cells touching
+each other (including diagonally) are merged into one cluster, so the cost
+grows with the number of enemies rather than the number of pairs. Each
+cluster gets a Lanchester strength like `engagement_estimate`: total health
+times total dps. `assign_squads` then sends queen squads to the clusters
+they are strong enough to fight.
+
+Plain NumPy so it can be benchmarked without the game, see
+`scripts/benchmarks/enemy_clustering_benchmark.py`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# grid cells are packed into one int64 key as x * KEY_STRIDE + y
+KEY_STRIDE: int = 4096
+# (dx, dy) neighbours looked up from each cell, the other four are covered
+# by looking up from the neighbour
+NEIGHBOUR_OFFSETS: tuple[int, ...] = (
+    KEY_STRIDE - 1,
+    KEY_STRIDE,
+    KEY_STRIDE + 1,
+    1,
+)
+
+
+@dataclass
+class EnemyClusters:
+    """Clusters found this frame.
+
+    Attributes
+    ----------
+    labels :
+        (n,) cluster index of each enemy that was clustered.
+    centers :
+        (c, 2) mean position of each cluster.
+    counts :
+        (c,) enemies in each cluster.
+    strengths :
+        (c,) total health times total dps of each cluster.
+    """
+
+    labels: np.ndarray
+    centers: np.ndarray
+    counts: np.ndarray
+    strengths: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @classmethod
+    def empty(cls) -> "EnemyClusters":
+        return cls(
+            np.empty(0, dtype=np.intp),
+            np.empty((0, 2), dtype=np.float32),
+            np.empty(0, dtype=np.intp),
+            np.empty(0, dtype=np.float64),
+        )
+
+
+def cluster_enemies(
+    positions: np.ndarray, hp: np.ndarray, dps: np.ndarray, cell_size: float
+) -> EnemyClusters:
+    """Cluster (n, 2) `positions`, with the (n,) `hp` and `dps` of each enemy."""
+    if len(positions) == 0:
+        return EnemyClusters.empty()
+
+    cells: np.ndarray = np.floor(positions / cell_size).astype(np.int64)
+    keys: np.ndarray = cells[:, 0] * KEY_STRIDE + cells[:, 1]
+    cell_keys, cell_of_enemy = np.unique(keys, return_inverse=True)
+    num_cells: int = len(cell_keys)
+
+    # union find over occupied cells
+    parent: list[int] = list(range(num_cells))
+
+    def find(cell: int) -> int:
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for offset in NEIGHBOUR_OFFSETS:
+        neighbour_keys: np.ndarray = cell_keys + offset
+        found: np.ndarray = np.searchsorted(cell_keys, neighbour_keys)
+        found[found == num_cells] = 0
+        touching: np.ndarray = np.flatnonzero(cell_keys[found] == neighbour_keys)
+        for cell, neighbour in zip(touching.tolist(), found[touching].tolist()):
+            root, other = find(cell), find(neighbour)
+            if root != other:
+                parent[other] = root
+
+    _, cell_labels = np.unique(
+        [find(cell) for cell in range(num_cells)], return_inverse=True
+    )
+    labels: np.ndarray = cell_labels.reshape(-1)[cell_of_enemy.reshape(-1)]
+    num_clusters: int = int(labels.max()) + 1
+
+    counts: np.ndarray = np.bincount(labels, minlength=num_clusters)
+    centers: np.ndarray = (
+        np.stack(
+            [
+                np.bincount(labels, weights=positions[:, 0], minlength=num_clusters),
+                np.bincount(labels, weights=positions[:, 1], minlength=num_clusters),
+            ],
+            axis=1,
+        )
+        / counts[:, None]
+    )
+    strengths: np.ndarray = np.bincount(
+        labels, weights=hp, minlength=num_clusters
+    ) * np.bincount(labels, weights=dps, minlength=num_clusters)
+    return EnemyClusters(labels, centers.astype(np.float32), counts, strengths)
+
+
+def assign_squads(
+    squad_positions: np.ndarray,
+    squad_hp: np.ndarray,
+    squad_dps: np.ndarray,
+    clusters: EnemyClusters,
+    min_share: float = 0.0,
+    squad_share: float = 1.0,
+) -> np.ndarray:
+    """The cluster each squad should fight, -1 for squads left without one.
+
+    The strongest cluster gets the closest squads until their combined
+    strength (total health times total dps, like the clusters) reaches
+    `squad_share` of the cluster's, then the next strongest
+    gets the closest squads left, and so on. A cluster the remaining squads
+    can't match gets none of them. Squads left over are -1, so they fall
+    back to the attack target or regroup with the main squad.
+
+    Parameters
+    ----------
+    squad_positions :
+        (s, 2) position of each squad.
+    squad_hp :
+        (s,) total health of each squad.
+    squad_dps :
+        (s,) total dps of each squad.
+    clusters :
+        This frame's clusters.
+    min_share :
+        Clusters weaker than this share of the strongest one are left
+        alone, so a lone scout doesn't pull a squad across the map.
+    squad_share :
+        Strength the squads sent to a cluster need, as a share of the
+        cluster's strength.
+
+    Returns
+    -------
+    np.ndarray :
+        (s,) cluster index per squad.
+    """
+    num_squads: int = len(squad_positions)
+    assigned: np.ndarray = np.full(num_squads, -1, dtype=np.intp)
+    if num_squads == 0 or len(clusters) == 0:
+        return assigned
+
+    offsets: np.ndarray = squad_positions[:, None, :] - clusters.centers[None, :, :]
+    distances: np.ndarray = np.einsum("scd,scd->sc", offsets, offsets)
+    strengths: np.ndarray = clusters.strengths
+    for cluster in np.argsort(-strengths, kind="stable").tolist():
+        if strengths[cluster] < strengths.max() * min_share:
+            break
+        free: np.ndarray = np.flatnonzero(assigned < 0)
+        if free.size == 0:
+            break
+        # closest first, up to the first squad that brings enough strength
+        closest: np.ndarray = free[np.argsort(distances[free, cluster], kind="stable")]
+        sent: np.ndarray = np.cumsum(squad_hp[closest]) * np.cumsum(squad_dps[closest])
+        enough: np.ndarray = np.flatnonzero(sent >= strengths[cluster] * squad_share)
+        if enough.size > 0:
+            assigned[closest[: enough[0] + 1]] = cluster
+    return assigned
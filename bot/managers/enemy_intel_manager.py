@@ -0,0 +1,112 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from ares.cache import property_cache_once_per_frame
+
+from bot.consts import (
+    ENEMY_MEMORY,
+    STRUCTURE_FORGET_AFTER,
+    UNIT_FORGET_AFTER,
+    RequestType,
+)
+from bot.managers.enemy_memory import EnemyMemory
+from bot.managers.enemy_spatial_index import HALLUCINATION, SNAPSHOT, EnemySpatialIndex
+from bot.managers.queen_bot_mediator import QueenBotMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class EnemyIntelManager:
+    """Shared knowledge about the enemy.
+
+    Builds one `EnemySpatialIndex` per frame (lazily, on first request) so
+    other managers can query enemies by radius and type instead of
+    filtering `enemy_units` / `enemy_structures` themselves.
+
+    Every step what is visible is also written to an `EnemyMemory`, for
+    targeting enemies that are out of vision.
+    """
+
+    queen_bot_mediator: QueenBotMediator
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+
+        # totals for the whole game, recorded by telemetry
+        self.index_requests: int = 0
+        self.index_builds: int = 0
+
+        self.enemy_memory: EnemyMemory = EnemyMemory()
+        self.ai.tag_registry.subscribe(self.enemy_memory.forget)
+
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {
+            RequestType.GET_ENEMY_MEMORY: lambda kwargs: self.enemy_memory,
+            RequestType.GET_ENEMY_SPATIAL_INDEX: lambda kwargs: self._get_enemy_spatial_index(),
+            RequestType.GET_ENEMY_SPATIAL_INDEX_STATS: lambda kwargs: (
+                self.index_requests,
+                self.index_builds,
+            ),
+        }
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.queen_bot_requests_dict[request](kwargs)
+
+    def update(self) -> None:
+        """Remember what is visible, and forget what is known to be gone."""
+        index: EnemySpatialIndex = self.enemy_spatial_index
+        visible: np.ndarray = np.flatnonzero(
+            (index.flags & (SNAPSHOT | HALLUCINATION)) == 0
+        )
+        units: list = [index.units[i] for i in visible.tolist()]
+        self.enemy_memory.observe(
+            [unit.tag for unit in units],
+            index.positions[visible],
+            index.type_ids[visible],
+            index.flags[visible],
+            np.array([u.health + u.shield for u in units], dtype=np.float32),
+            np.array([u.health_max + u.shield_max for u in units], dtype=np.float32),
+            self.ai.time,
+        )
+        self.enemy_memory.forget_unseen(
+            self.ai.state.visibility.data_numpy, self.ai.time
+        )
+        settings: dict = self.ai.config[ENEMY_MEMORY]
+        self.enemy_memory.expire(
+            self.ai.time, settings[UNIT_FORGET_AFTER], settings[STRUCTURE_FORGET_AFTER]
+        )
+
+    @property_cache_once_per_frame
+    def enemy_spatial_index(self) -> EnemySpatialIndex:
+        self.index_builds += 1
+        return EnemySpatialIndex.from_ai(self.ai)
+
+    def _get_enemy_spatial_index(self) -> EnemySpatialIndex:
+        self.index_requests += 1
+        return self.enemy_spatial_index
@@ -0,0 +1,223 @@
+"""Array backed memory of every enemy we have seen.
+
+Unlike `EnemySpatialIndex`, which is rebuilt from what is visible each
+frame, entries here persist out of vision: last seen position, type, flags
+(same bits as `enemy_spatial_index`), time and health. `EnemyIntelManager`
+updates it incrementally from each frame's observations. Entries are
+forgotten when the unit dies, when its last position is in vision but it
+wasn't seen there, or after a type dependent time. Confidence in an entry
+decays with its age.
+
+Plain NumPy so it can be benchmarked without the game, see
+`scripts/benchmarks/enemy_memory_benchmark.py`.
+"""
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sc2.ids.unit_typeid import UnitTypeId as UnitID
+
+# flag for structures, matches `enemy_spatial_index.STRUCTURE`
+STRUCTURE: int = 2
+
+
+class EnemyMemory:
+    """Last known state of enemies, in fixed slots that are reused.
+
+    Parameters
+    ----------
+    capacity :
+        Initial number of slots, doubles when full.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.tags: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self.positions: np.ndarray = np.zeros((capacity, 2), dtype=np.float32)
+        self.type_ids: np.ndarray = np.zeros(capacity, dtype=np.int32)
+        self.flags: np.ndarray = np.zeros(capacity, dtype=np.uint8)
+        self.health: np.ndarray = np.zeros(capacity, dtype=np.float32)
+        self.health_max: np.ndarray = np.zeros(capacity, dtype=np.float32)
+        self.last_seen: np.ndarray = np.zeros(capacity, dtype=np.float32)
+        self.used: np.ndarray = np.zeros(capacity, dtype=bool)
+
+        self._slot_of: dict[int, int] = {}
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+        # type id -> slots, so type queries only touch matching entries
+        self._slots_of_type: dict[int, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, tag: int) -> bool:
+        return tag in self._slot_of
+
+    def observe(
+        self,
+        tags: list[int],
+        positions: np.ndarray,
+        type_ids: np.ndarray,
+        flags: np.ndarray,
+        health: np.ndarray,
+        health_max: np.ndarray,
+        time: float,
+    ) -> None:
+        """Record what was seen this frame, (k,) arrays in the order of `tags`."""
+        if not tags:
+            return
+        slots: np.ndarray = np.fromiter(
+            (self._slot(tag, type_id) for tag, type_id in zip(tags, type_ids.tolist())),
+            dtype=np.intp,
+            count=len(tags),
+        )
+        self.positions[slots] = positions
+        self.flags[slots] = flags
+        self.health[slots] = health
+        self.health_max[slots] = health_max
+        self.last_seen[slots] = time
+
+    def forget(self, tag: int) -> None:
+        if (slot := self._slot_of.pop(tag, None)) is None:
+            return
+        self._slots_of_type[int(self.type_ids[slot])].discard(slot)
+        self.used[slot] = False
+        self._free.append(slot)
+
+    def forget_unseen(self, visibility: np.ndarray, time: float) -> None:
+        """Forget entries whose last position is in vision this frame.
+
+        Call after `observe`, anything still there was seen at `time`.
+        `visibility` is indexed [y, x], eg. `state.visibility.data_numpy`,
+        with 2 for visible.
+        """
+        slots: np.ndarray = np.flatnonzero(self.used & (self.last_seen < time))
+        if slots.size == 0:
+            return
+        cells: np.ndarray = self.positions[slots].astype(np.intp)
+        height, width = visibility.shape
+        np.clip(cells[:, 0], 0, width - 1, out=cells[:, 0])
+        np.clip(cells[:, 1], 0, height - 1, out=cells[:, 1])
+        for slot in slots[visibility[cells[:, 1], cells[:, 0]] == 2].tolist():
+            self.forget(int(self.tags[slot]))
+
+    def expire(self, time: float, unit_ttl: float, structure_ttl: float) -> None:
+        """Forget units not seen for `unit_ttl` seconds, structures `structure_ttl`."""
+        ttl: np.ndarray = np.where(
+            self.flags & STRUCTURE, structure_ttl, unit_ttl
+        ).astype(np.float32)
+        for slot in np.flatnonzero(self.used & (time - self.last_seen > ttl)).tolist():
+            self.forget(int(self.tags[slot]))
+
+    def query(
+        self,
+        position: Optional[tuple[float, float]] = None,
+        radius: float = 0.0,
+        type_ids: Optional[Iterable[Union["UnitID", int]]] = None,
+        exclude_type_ids: Optional[Iterable[Union["UnitID", int]]] = None,
+        include_flags: int = 0,
+        exclude_flags: int = 0,
+        time: float = 0.0,
+        max_age: Optional[float] = None,
+    ) -> np.ndarray:
+        """Slots of remembered enemies matching the filters.
+
+        Parameters
+        ----------
+        position :
+            Only within `radius` of here, anywhere on the map if None.
+        radius :
+            Query distance around `position`.
+        type_ids :
+            Only these types, looked up directly rather than scanning.
+        exclude_type_ids :
+            Never these types.
+        include_flags :
+            Every flag in this mask must be set, eg. `STRUCTURE`.
+        exclude_flags :
+            None of the flags in this mask may be set.
+        time :
+            Current game time, needed with `max_age`.
+        max_age :
+            Only entries seen within this many seconds.
+
+        Returns
+        -------
+        np.ndarray :
+            Slots into the packed arrays.
+        """
+        if type_ids is not None:
+            found: list[int] = []
+            for value in _type_values(type_ids):
+                found.extend(self._slots_of_type.get(value, ()))
+            slots: np.ndarray = np.array(found, dtype=np.intp)
+        else:
+            slots = np.flatnonzero(self.used)
+        if slots.size == 0:
+            return slots
+
+        mask: np.ndarray = np.ones(slots.size, dtype=bool)
+        if exclude_type_ids:
+            mask &= ~np.isin(self.type_ids[slots], _type_values(exclude_type_ids))
+        if include_flags:
+            mask &= (self.flags[slots] & include_flags) == include_flags
+        if exclude_flags:
+            mask &= (self.flags[slots] & exclude_flags) == 0
+        if max_age is not None:
+            mask &= time - self.last_seen[slots] <= max_age
+        if position is not None:
+            offsets: np.ndarray = self.positions[slots] - np.asarray(position)
+            mask &= np.einsum("ij,ij->i", offsets, offsets) < radius * radius
+        return slots[mask]
+
+    def closest(self, slots: np.ndarray, position: tuple[float, float]) -> int:
+        """The slot in `slots` closest to `position`, `slots` can't be empty."""
+        offsets: np.ndarray = self.positions[slots] - np.asarray(position)
+        return int(slots[np.argmin(np.einsum("ij,ij->i", offsets, offsets))])
+
+    def confidence(
+        self, slots: np.ndarray, time: float, half_life: float
+    ) -> np.ndarray:
+        """1 for entries seen at `time`, halving every `half_life` seconds."""
+        return np.exp2(-(time - self.last_seen[slots]) / half_life)
+
+    def _slot(self, tag: int, type_id: int) -> int:
+        slot: Optional[int] = self._slot_of.get(tag, None)
+        if slot is None:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self._slot_of[tag] = slot
+            self.tags[slot] = tag
+            self.used[slot] = True
+        elif self.type_ids[slot] == type_id:
+            return slot
+        else:
+            # morphed, eg. hatchery -> lair
+            self._slots_of_type[int(self.type_ids[slot])].discard(slot)
+        self.type_ids[slot] = type_id
+        self._slots_of_type.setdefault(type_id, set()).add(slot)
+        return slot
+
+    def _grow(self) -> None:
+        capacity: int = len(self.tags)
+        for name in (
+            "tags",
+            "positions",
+            "type_ids",
+            "flags",
+            "health",
+            "health_max",
+            "last_seen",
+            "used",
+        ):
+            array: np.ndarray = getattr(self, name)
+            grown: np.ndarray = np.zeros(
+                (capacity * 2,) + array.shape[1:], dtype=array.dtype
+            )
+            grown[:capacity] = array
+            setattr(self, name, grown)
+        self._free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+
+def _type_values(type_ids: Iterable[Union["UnitID", int]]) -> list[int]:
+    return [getattr(t, "value", t) for t in type_ids]
@@ -0,0 +1,237 @@
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import numpy as np
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+# bit flags packed per enemy
+FLYING: int = 1
+STRUCTURE: int = 2
+CLOAKED: int = 4
+HALLUCINATION: int = 8
+SNAPSHOT: int = 16
+
+# size of a grid hash cell in game units
+CELL_SIZE: float = 8.0
+
+
+class EnemySpatialIndex:
+    """Packed snapshot of every visible enemy unit and structure for one frame.
+
+    Positions, type ids and flags are held in NumPy arrays, and enemies are
+    bucketed into a coarse grid hash so radius queries only look at nearby
+    cells. Managers should query this rather than filtering
+    `enemy_units` / `enemy_structures` themselves.
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    enemies : list[Unit]
+        Every enemy unit and structure to index.
+    """
+
+    def __init__(self, ai: "AresBot", enemies: list[Unit]):
+        self.ai: AresBot = ai
+        self.units: list[Unit] = enemies
+
+        num_enemies: int = len(enemies)
+        self.positions: np.ndarray = np.empty((num_enemies, 2), dtype=np.float32)
+        self.type_ids: np.ndarray = np.empty(num_enemies, dtype=np.int32)
+        self.flags: np.ndarray = np.zeros(num_enemies, dtype=np.uint8)
+        for i, unit in enumerate(enemies):
+            self.positions[i] = unit.position
+            self.type_ids[i] = unit.type_id.value
+            self.flags[i] = (
+                (FLYING if unit.is_flying else 0)
+                | (STRUCTURE if unit.is_structure else 0)
+                | (CLOAKED if unit.is_cloaked else 0)
+                | (HALLUCINATION if unit.is_hallucination else 0)
+                | (SNAPSHOT if unit.is_snapshot else 0)
+            )
+
+        # grid hash: indices sorted by cell, plus cell -> (start, end) slices
+        self._cells: dict[tuple[int, int], tuple[int, int]] = {}
+        self._sorted_indices: np.ndarray = np.empty(0, dtype=np.intp)
+        if num_enemies:
+            cell_coords: np.ndarray = np.floor(self.positions / CELL_SIZE).astype(
+                np.int32
+            )
+            keys: np.ndarray = cell_coords[:, 0].astype(np.int64) * 4096 + (
+                cell_coords[:, 1]
+            )
+            self._sorted_indices = np.argsort(keys, kind="stable")
+            unique_keys, starts, counts = np.unique(
+                keys[self._sorted_indices], return_index=True, return_counts=True
+            )
+            for key, start, count in zip(
+                unique_keys.tolist(), starts.tolist(), counts.tolist()
+            ):
+                self._cells[divmod(key, 4096)] = (start, start + count)
+
+    @classmethod
+    def from_ai(cls, ai: "AresBot") -> "EnemySpatialIndex":
+        return cls(ai, list(ai.enemy_units) + list(ai.enemy_structures))
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def indices_in_range(
+        self,
+        position: Point2,
+        radius: float,
+        type_ids: Optional[set[UnitID]] = None,
+        exclude_type_ids: Optional[set[UnitID]] = None,
+        include_flags: int = 0,
+        exclude_flags: int = 0,
+    ) -> np.ndarray:
+        """Indices of enemies within `radius` of `position` matching the filters.
+
+        Parameters
+        ----------
+        position :
+            Centre of the query.
+        radius :
+            Query distance.
+        type_ids :
+            Only return these types.
+        exclude_type_ids :
+            Never return these types.
+        include_flags :
+            Every flag in this mask must be set, eg. `STRUCTURE`.
+        exclude_flags :
+            None of the flags in this mask may be set, eg. `FLYING | CLOAKED`.
+
+        Returns
+        -------
+        np.ndarray :
+            Indices into `units` / the packed arrays.
+        """
+        x, y = position
+        min_cx: int = int(np.floor((x - radius) / CELL_SIZE))
+        max_cx: int = int(np.floor((x + radius) / CELL_SIZE))
+        min_cy: int = int(np.floor((y - radius) / CELL_SIZE))
+        max_cy: int = int(np.floor((y + radius) / CELL_SIZE))
+
+        slices: list[np.ndarray] = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                if cell := self._cells.get((cx, cy), None):
+                    slices.append(self._sorted_indices[cell[0] : cell[1]])
+        if not slices:
+            return np.empty(0, dtype=np.intp)
+
+        candidates: np.ndarray = np.concatenate(slices)
+        offsets: np.ndarray = self.positions[candidates] - (x, y)
+        in_range: np.ndarray = np.einsum("ij,ij->i", offsets, offsets) < (
+            radius * radius
+        )
+        return self._filter(
+            candidates[in_range],
+            type_ids,
+            exclude_type_ids,
+            include_flags,
+            exclude_flags,
+        )
+
+    def indices_of_types(
+        self,
+        type_ids: Optional[set[UnitID]] = None,
+        exclude_type_ids: Optional[set[UnitID]] = None,
+        include_flags: int = 0,
+        exclude_flags: int = 0,
+    ) -> np.ndarray:
+        """Indices of all enemies matching the filters, anywhere on the map."""
+        return self._filter(
+            np.arange(len(self.units)),
+            type_ids,
+            exclude_type_ids,
+            include_flags,
+            exclude_flags,
+        )
+
+    def query(
+        self,
+        positions: Point2 | Iterable[Point2],
+        radius: float | Iterable[float],
+        type_ids: Optional[set[UnitID]] = None,
+        exclude_type_ids: Optional[set[UnitID]] = None,
+        include_flags: int = 0,
+        exclude_flags: int = 0,
+    ) -> Units:
+        """Enemies near one or more positions, see `indices_in_range`.
+
+        If several positions are passed, the union of the results is returned
+        (an enemy close to two positions only appears once). `radius` can be
+        a single value or one per position.
+        """
+        if isinstance(positions, Point2):
+            positions = [positions]
+        positions = list(positions)
+        radii: list[float] = (
+            [radius] * len(positions)
+            if isinstance(radius, (int, float))
+            else list(radius)
+        )
+
+        found: list[np.ndarray] = [
+            self.indices_in_range(
+                position,
+                _radius,
+                type_ids,
+                exclude_type_ids,
+                include_flags,
+                exclude_flags,
+            )
+            for position, _radius in zip(positions, radii)
+        ]
+        if len(found) == 1:
+            return self.to_units(found[0])
+        return self.to_units(np.unique(np.concatenate(found)))
+
+    def query_types(
+        self,
+        type_ids: Optional[set[UnitID]] = None,
+        exclude_type_ids: Optional[set[UnitID]] = None,
+        include_flags: int = 0,
+        exclude_flags: int = 0,
+    ) -> Units:
+        """Enemies of the given types anywhere on the map."""
+        return self.to_units(
+            self.indices_of_types(
+                type_ids, exclude_type_ids, include_flags, exclude_flags
+            )
+        )
+
+    def to_units(self, indices: np.ndarray) -> Units:
+        return Units([self.units[i] for i in indices.tolist()], self.ai)
+
+    def _filter(
+        self,
+        indices: np.ndarray,
+        type_ids: Optional[set[UnitID]],
+        exclude_type_ids: Optional[set[UnitID]],
+        include_flags: int,
+        exclude_flags: int,
+    ) -> np.ndarray:
+        if indices.size == 0:
+            return indices
+        mask: np.ndarray = np.ones(indices.size, dtype=bool)
+        if type_ids is not None:
+            mask &= np.isin(self.type_ids[indices], _type_values(type_ids))
+        if exclude_type_ids:
+            mask &= ~np.isin(self.type_ids[indices], _type_values(exclude_type_ids))
+        if include_flags:
+            mask &= (self.flags[indices] & include_flags) == include_flags
+        if exclude_flags:
+            mask &= (self.flags[indices] & exclude_flags) == 0
+        return indices[mask]
+
+
+def _type_values(type_ids: set[UnitID]) -> np.ndarray:
+    return np.fromiter((t.value for t in type_ids), dtype=np.int32, count=len(type_ids))
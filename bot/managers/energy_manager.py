@@ -0,0 +1,157 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from ares.consts import UnitRole
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
+from sc2.units import Units
+
+from bot.consts import (
+    ATTACK_TARGET_IGNORE,
+    EARLY_RESERVE,
+    ENERGY_PLANNER,
+    HORIZON,
+    LATE_GAME_TIME,
+    LATE_RESERVE,
+    MID_GAME_TIME,
+    MID_RESERVE,
+    THREAT_RADIUS,
+    THREAT_RESERVE,
+    THREAT_UNITS,
+    RequestType,
+)
+from bot.managers.enemy_spatial_index import HALLUCINATION, SNAPSHOT, STRUCTURE
+from bot.managers.energy_planning import EnergyPlan, plan_queen_energy
+from bot.managers.queen_bot_mediator import QueenBotMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+COMBAT_QUEEN_ROLES: set[UnitRole] = {
+    UnitRole.QUEEN_DEFENCE,
+    UnitRole.QUEEN_NYDUS,
+    UnitRole.QUEEN_OFFENSIVE,
+}
+# combat roles `QueenManager` controls as squads
+SQUAD_ROLES: tuple[UnitRole, ...] = (UnitRole.QUEEN_DEFENCE, UnitRole.QUEEN_NYDUS)
+
+
+class EnergyManager:
+    """Plan queen energy spend for all queens at once, every step.
+
+    Combat queens keep a transfuse reserve that grows with the game phase,
+    and every queen keeps more back while enemies are near our bases.
+    Tumors and injects only go ahead if the queen stays above her reserve.
+    `CombatManager` decides on aggression from the projected energy rather
+    than the current average.
+    """
+
+    queen_bot_mediator: QueenBotMediator
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+
+        self._plan: EnergyPlan = EnergyPlan(set(), set(), 0.0)
+
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {
+            RequestType.GET_ENERGY_PLAN: lambda kwargs: self._plan,
+        }
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.queen_bot_requests_dict[request](kwargs)
+
+    def update(self) -> None:
+        """Called every step before the queens are controlled."""
+        queens: Units = self.ai.mediator.get_own_army_dict[UnitID.QUEEN]
+        if not queens:
+            self._plan = EnergyPlan(set(), set(), 0.0)
+            return
+
+        settings: dict = self.ai.config[ENERGY_PLANNER]
+        combat_tags: set[int] = {
+            q.tag
+            for role in COMBAT_QUEEN_ROLES
+            for q in self.ai.mediator.get_units_from_role(role=role)
+        }
+        tags: list[int] = [q.tag for q in queens]
+        is_combat: np.ndarray = np.array([tag in combat_tags for tag in tags])
+        _, can_tumor, can_inject, projected = plan_queen_energy(
+            np.array([q.energy for q in queens]),
+            is_combat,
+            self._squad_ids(tags, combat_tags),
+            self._combat_reserve(settings),
+            min(
+                self._num_threats(settings[THREAT_RADIUS]) / settings[THREAT_UNITS], 1.0
+            ),
+            settings[THREAT_RESERVE],
+            settings[HORIZON],
+        )
+        self._plan = EnergyPlan(
+            {tag for tag, ok in zip(tags, can_tumor.tolist()) if ok},
+            {tag for tag, ok in zip(tags, can_inject.tolist()) if ok},
+            # energy the fighting queens take into the next fight
+            float(projected[is_combat].mean() if is_combat.any() else projected.mean()),
+        )
+
+    def _squad_ids(self, tags: list[int], combat_tags: set[int]) -> np.ndarray:
+        """Squad index of each combat queen, like `QueenManager` splits them."""
+        squad_of: dict[int, int] = {}
+        num_squads: int = 0
+        for role in SQUAD_ROLES:
+            for squad in self.ai.mediator.get_squads(role=role, squad_radius=9.0):
+                squad_of.update({unit.tag: num_squads for unit in squad.squad_units})
+                num_squads += 1
+        # offensive queens aren't split into squads, count them as one
+        return np.array(
+            [
+                squad_of.get(tag, num_squads) if tag in combat_tags else -1
+                for tag in tags
+            ]
+        )
+
+    def _combat_reserve(self, settings: dict) -> float:
+        if self.ai.time >= settings[LATE_GAME_TIME]:
+            return settings[LATE_RESERVE]
+        if self.ai.time >= settings[MID_GAME_TIME]:
+            return settings[MID_RESERVE]
+        return settings[EARLY_RESERVE]
+
+    def _num_threats(self, radius: float) -> int:
+        positions: list[Point2] = [th.position for th in self.ai.townhalls]
+        if not positions:
+            return 0
+
+        return len(
+            self.queen_bot_mediator.get_enemy_spatial_index.query(
+                positions,
+                radius,
+                exclude_type_ids=ATTACK_TARGET_IGNORE,
+                exclude_flags=STRUCTURE | HALLUCINATION | SNAPSHOT,
+            )
+        )
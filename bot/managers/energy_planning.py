@@ -0,0 +1,98 @@
+"""Split queen energy between creep tumors, injects and a transfuse reserve.
+
+Works on the energy of every queen as one array, see `EnergyManager`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+QUEEN_MAX_ENERGY: float = 200.0
+# energy per game second
+QUEEN_ENERGY_REGEN: float = 0.7875
+TUMOR_ENERGY: float = 25.0
+INJECT_ENERGY: float = 25.0
+
+
+@dataclass
+class EnergyPlan:
+    """What each queen may spend energy on this frame.
+
+    Parameters
+    ----------
+    tumor_tags : set[int]
+        Queens that can place a tumor and stay above their reserve.
+    inject_tags : set[int]
+        Queens that can inject and stay above their reserve.
+    projected_energy : float
+        Average energy the combat queens are expected to have after the
+        planning horizon, once the one tumor each squad may place this frame
+        is paid for.
+    """
+
+    tumor_tags: set[int]
+    inject_tags: set[int]
+    projected_energy: float
+
+
+def plan_queen_energy(
+    energy: np.ndarray,
+    is_combat: np.ndarray,
+    squad_ids: np.ndarray,
+    combat_reserve: float,
+    threat: float,
+    threat_reserve: float,
+    horizon: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Reserve energy per queen and work out what she can spend.
+
+    Parameters
+    ----------
+    energy :
+        (n,) current energy of each queen.
+    is_combat :
+        (n,) queens that fight (defence, offensive, nydus), they keep
+        `combat_reserve` for transfuse on top of the threat reserve.
+    squad_ids :
+        (n,) squad of each combat queen, -1 for queens that cast on their
+        own (creep, inject). A squad places at most one tumor a frame.
+    combat_reserve :
+        Transfuse energy combat queens keep for the current game phase.
+    threat :
+        0 (nothing near our bases) to 1 (a big fight).
+    threat_reserve :
+        Extra energy every queen keeps at `threat` 1.
+    horizon :
+        Game seconds to project energy over.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] :
+        (n,) reserve, can place a tumor, can inject, and projected energy
+        after `horizon`, less the spend planned this frame.
+    """
+    reserve: np.ndarray = np.minimum(
+        np.where(is_combat, combat_reserve, 0.0) + threat * threat_reserve,
+        QUEEN_MAX_ENERGY,
+    )
+    spendable: np.ndarray = energy - reserve
+    can_tumor: np.ndarray = spendable >= TUMOR_ENERGY
+    can_inject: np.ndarray = spendable >= INJECT_ENERGY
+
+    future: np.ndarray = np.minimum(
+        energy + QUEEN_ENERGY_REGEN * horizon, QUEEN_MAX_ENERGY
+    )
+    # creep and inject queens each cast one spell, a squad only places a
+    # tumor from the queen with the most energy
+    planned: np.ndarray = np.where(
+        (squad_ids < 0) & (can_tumor | can_inject),
+        np.maximum(TUMOR_ENERGY, INJECT_ENERGY),
+        0.0,
+    )
+    tumor_queens: np.ndarray = np.flatnonzero((squad_ids >= 0) & can_tumor)
+    if tumor_queens.size > 0:
+        order: np.ndarray = tumor_queens[
+            np.lexsort((-energy[tumor_queens], squad_ids[tumor_queens]))
+        ]
+        _, first = np.unique(squad_ids[order], return_index=True)
+        planned[order[first]] = TUMOR_ENERGY
+    return reserve, can_tumor, can_inject, future - planned
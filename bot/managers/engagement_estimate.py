@@ -0,0 +1,105 @@
+"""Lanchester square law estimate of a fight between two armies.
+
+A side's strength is its damage output against the other side's mix of
+ground and air health, times its own health. Cheap enough to run before
+every `can_win_fight`, see `EngagementEstimator`. `squad_log_ratios` does
+every queen squad against its own set of nearby enemies in one pass.
+"""
+import numpy as np
+
+
+def squad_log_ratios(
+    own_squad: np.ndarray,
+    own_ground_dps: np.ndarray,
+    own_air_dps: np.ndarray,
+    own_hp: np.ndarray,
+    own_flying: np.ndarray,
+    membership: np.ndarray,
+    enemy_ground_dps: np.ndarray,
+    enemy_air_dps: np.ndarray,
+    enemy_hp: np.ndarray,
+    enemy_flying: np.ndarray,
+) -> np.ndarray:
+    """log(own strength / enemy strength) per squad, above 0 favours us.
+
+    Parameters
+    ----------
+    own_squad :
+        (n,) squad index of each of our units.
+    own_ground_dps, own_air_dps :
+        (n,) damage per second of each of our units against ground / air.
+    own_hp :
+        (n,) health plus shields of each of our units.
+    own_flying :
+        (n,) our units that can only be hit by anti air.
+    membership :
+        (s, m) True where enemy j is near squad i. An enemy can be near
+        several squads, its features are only given once.
+    enemy_ground_dps, enemy_air_dps, enemy_hp, enemy_flying :
+        The same as ours for the (m,) enemy units.
+
+    Returns
+    -------
+    np.ndarray :
+        (s,) +inf where only we can do damage or there is nothing to fight,
+        -inf the other way round, nan where neither side can hurt the other.
+    """
+    num_squads: int = membership.shape[0]
+
+    def own_sum(values: np.ndarray) -> np.ndarray:
+        return np.bincount(own_squad, weights=values, minlength=num_squads)
+
+    near: np.ndarray = membership.astype(np.float64)
+    own_total_hp: np.ndarray = own_sum(own_hp)
+    enemy_total_hp: np.ndarray = near @ enemy_hp
+    with np.errstate(divide="ignore", invalid="ignore"):
+        own_air_share: np.ndarray = np.nan_to_num(
+            own_sum(own_hp * own_flying) / own_total_hp
+        )
+        enemy_air_share: np.ndarray = np.nan_to_num(
+            near @ (enemy_hp * enemy_flying) / enemy_total_hp
+        )
+        # dps of each side against the other side's ground / air split
+        own_strength: np.ndarray = own_total_hp * (
+            own_sum(own_ground_dps) * (1.0 - enemy_air_share)
+            + own_sum(own_air_dps) * enemy_air_share
+        )
+        enemy_strength: np.ndarray = enemy_total_hp * (
+            (near @ enemy_ground_dps) * (1.0 - own_air_share)
+            + (near @ enemy_air_dps) * own_air_share
+        )
+        log_ratios: np.ndarray = np.log(own_strength) - np.log(enemy_strength)
+
+    # nothing to fight on one side, or nobody can hurt the other
+    neither: np.ndarray = (own_strength <= 0.0) & (enemy_strength <= 0.0)
+    log_ratios[neither] = np.nan
+    log_ratios[neither & (enemy_total_hp <= 0.0) & (own_total_hp > 0.0)] = np.inf
+    log_ratios[neither & (own_total_hp <= 0.0) & (enemy_total_hp > 0.0)] = -np.inf
+    return log_ratios
+
+
+def lanchester_log_ratio(
+    own_ground_dps: np.ndarray,
+    own_air_dps: np.ndarray,
+    own_hp: np.ndarray,
+    own_flying: np.ndarray,
+    enemy_ground_dps: np.ndarray,
+    enemy_air_dps: np.ndarray,
+    enemy_hp: np.ndarray,
+    enemy_flying: np.ndarray,
+) -> float:
+    """`squad_log_ratios` for a single fight."""
+    return float(
+        squad_log_ratios(
+            np.zeros(len(own_hp), dtype=np.intp),
+            own_ground_dps,
+            own_air_dps,
+            own_hp,
+            own_flying,
+            np.ones((1, len(enemy_hp)), dtype=bool),
+            enemy_ground_dps,
+            enemy_air_dps,
+            enemy_hp,
+            enemy_flying,
+        )[0]
+    )
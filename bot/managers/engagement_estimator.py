@@ -0,0 +1,169 @@
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+from ares.consts import VICTORY_MARGINAL_OR_BETTER, EngagementResult
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import (
+    CONFIDENT_RATIO,
+    ENABLED,
+    ENGAGEMENT_ESTIMATE,
+    SAMPLE_INTERVAL,
+    SquadEngagement,
+)
+from bot.managers.engagement_estimate import lanchester_log_ratio, squad_log_ratios
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class EngagementEstimator:
+    """Only run the full combat sim for fights that are close.
+
+    Owned by `CombatManager`, other managers and the queen controllers get
+    it with `queen_bot_mediator.get_engagement_estimator`. Lopsided fights
+    (Lanchester strength ratio beyond `EngagementEstimate.ConfidentRatio`
+    either way) are answered straight away, the rest go to ares'
+    `can_win_fight`. Every `SampleInterval`th confident answer is checked
+    against the full sim, to keep track of how often the two agree.
+    """
+
+    ai: "AresBot"
+    # unit type -> (ground dps, air dps), filled in as types are seen
+    type_dps: dict[UnitID, tuple[float, float]] = field(default_factory=dict)
+    # running totals for telemetry
+    estimates: int = 0
+    simulations: int = 0
+    sampled: int = 0
+    agreed: int = 0
+
+    @property
+    def agreement(self) -> float:
+        """Share of sampled confident estimates the full sim agreed with."""
+        return self.agreed / self.sampled if self.sampled else 1.0
+
+    def can_win_fight(
+        self, own_units: Union[list[Unit], Units], enemy_units: Union[list[Unit], Units]
+    ) -> EngagementResult:
+        """Drop in for `mediator.can_win_fight`."""
+        settings: dict = self.ai.config[ENGAGEMENT_ESTIMATE]
+        if not settings[ENABLED]:
+            return self._simulate(own_units, enemy_units)
+
+        log_ratio: float = lanchester_log_ratio(
+            *self.army_arrays(own_units), *self.army_arrays(enemy_units)
+        )
+        confident: float = math.log(settings[CONFIDENT_RATIO])
+        if math.isnan(log_ratio) or abs(log_ratio) < confident:
+            return self._simulate(own_units, enemy_units)
+
+        self.estimates += 1
+        result: EngagementResult = (
+            EngagementResult.VICTORY_DECISIVE
+            if log_ratio > 0.0
+            else EngagementResult.LOSS_DECISIVE
+        )
+        if self.estimates % settings[SAMPLE_INTERVAL] == 0:
+            simulated: EngagementResult = self._simulate(own_units, enemy_units)
+            self.sampled += 1
+            if (simulated in VICTORY_MARGINAL_OR_BETTER) == (log_ratio > 0.0):
+                self.agreed += 1
+        return result
+
+    def evaluate_squads(
+        self,
+        squads: list[Union[list[Unit], Units]],
+        enemy_sets: list[Union[list[Unit], Units]],
+    ) -> list[SquadEngagement]:
+        """Engage, hold or retreat for every squad against its nearby enemies.
+
+        All squads are estimated together: enemies near several squads are
+        only looked at once. Squads in the ambiguous band `HOLD` instead of
+        running the full sim.
+        """
+        settings: dict = self.ai.config[ENGAGEMENT_ESTIMATE]
+        if not settings[ENABLED]:
+            return [
+                SquadEngagement.ENGAGE
+                if self._simulate(squad, enemies) in VICTORY_MARGINAL_OR_BETTER
+                else SquadEngagement.RETREAT
+                for squad, enemies in zip(squads, enemy_sets)
+            ]
+
+        enemy_index: dict[int, int] = {}
+        unique_enemies: list[Unit] = []
+        rows: list[int] = []
+        columns: list[int] = []
+        for row, enemies in enumerate(enemy_sets):
+            for enemy in enemies:
+                if enemy.tag not in enemy_index:
+                    enemy_index[enemy.tag] = len(unique_enemies)
+                    unique_enemies.append(enemy)
+                rows.append(row)
+                columns.append(enemy_index[enemy.tag])
+        membership: np.ndarray = np.zeros(
+            (len(squads), len(unique_enemies)), dtype=bool
+        )
+        membership[rows, columns] = True
+
+        own_units: list[Unit] = [unit for squad in squads for unit in squad]
+        own_squad: np.ndarray = np.repeat(
+            np.arange(len(squads)), [len(squad) for squad in squads]
+        )
+        log_ratios: np.ndarray = squad_log_ratios(
+            own_squad,
+            *self.army_arrays(own_units),
+            membership,
+            *self.army_arrays(unique_enemies),
+        )
+        confident: float = math.log(settings[CONFIDENT_RATIO])
+        # nan (nobody can hurt anybody) compares False, so holds
+        decisions: np.ndarray = np.where(
+            log_ratios >= confident,
+            SquadEngagement.ENGAGE,
+            np.where(
+                log_ratios <= -confident,
+                SquadEngagement.RETREAT,
+                SquadEngagement.HOLD,
+            ),
+        )
+        self.estimates += int((decisions != SquadEngagement.HOLD).sum())
+        return [SquadEngagement(decision) for decision in decisions.tolist()]
+
+    def _simulate(
+        self, own_units: Union[list[Unit], Units], enemy_units: Union[list[Unit], Units]
+    ) -> EngagementResult:
+        self.simulations += 1
+        return self.ai.mediator.can_win_fight(
+            own_units=own_units, enemy_units=enemy_units
+        )
+
+    def army_arrays(
+        self, units: Union[list[Unit], Units]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Ground dps, air dps, health plus shields and flying, per unit.
+
+        Units that can't attack (eg. pylons, overlords) get no health, they
+        don't change who wins the fight.
+        """
+        dps: list[tuple[float, float]] = []
+        for unit in units:
+            if unit.type_id not in self.type_dps:
+                self.type_dps[unit.type_id] = (unit.ground_dps, unit.air_dps)
+            dps.append(self.type_dps[unit.type_id])
+        dps_array: np.ndarray = np.array(dps, dtype=np.float32).reshape(-1, 2)
+        hp: np.ndarray = np.array(
+            [u.health + u.shield for u in units], dtype=np.float32
+        )
+        hp[dps_array.sum(axis=1) <= 0.0] = 0.0
+        return (
+            dps_array[:, 0],
+            dps_array[:, 1],
+            hp,
+            np.array([u.is_flying for u in units], dtype=bool),
+        )
@@ -0,0 +1,134 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+from ares.consts import DEBUG
+from loguru import logger
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
+
+from bot.consts import (
+    ATTACK_TARGET_IGNORE,
+    COMBAT_GAME_STEP,
+    COMBAT_HOLD_TIME,
+    ENABLED,
+    GAME_STEP_CONTROL,
+    HEADROOM_RATIO,
+    INTENSE_COMBAT_UNITS,
+    MAX_GAME_STEP,
+    MIN_GAME_STEP,
+    PERFORMANCE,
+    STEP_TIME_BUDGET,
+    THREAT_RADIUS,
+    DegradationLevel,
+    RequestType,
+)
+from bot.managers.enemy_spatial_index import HALLUCINATION, SNAPSHOT, STRUCTURE
+from bot.managers.queen_bot_mediator import QueenBotMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class GameStepManager:
+    """Change `client.game_step` at runtime depending on what's going on.
+
+    Quiet macro phases run at `MaxGameStep`, any enemy army near our queens or
+    townhalls (or an early rush) drops us to `CombatGameStep`, and big fights
+    go down to `MinGameStep` if the measured step time leaves enough headroom.
+    We only go back up once no threat has been seen for `CombatHoldTime`.
+    """
+
+    queen_bot_mediator: QueenBotMediator
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+
+        self.enabled: bool = (
+            self.ai.config[GAME_STEP_CONTROL][ENABLED] and not self.ai.config[DEBUG]
+        )
+        self.last_threat_time: float = -1000.0
+
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {}
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.queen_bot_requests_dict[request](kwargs)
+
+    def update(self) -> None:
+        """Called at the end of every step, after the step time is recorded."""
+        if not self.enabled:
+            return
+
+        game_step: int = self._target_game_step()
+        if game_step != self.ai.client.game_step:
+            logger.info(
+                f"{self.ai.time_formatted} - Game step "
+                f"{self.ai.client.game_step} -> {game_step}"
+            )
+            self.ai.client.game_step = game_step
+
+    def _target_game_step(self) -> int:
+        settings: dict = self.ai.config[GAME_STEP_CONTROL]
+        num_threats: int = self._num_threats(settings[THREAT_RADIUS])
+        if num_threats > 0 or (
+            self.ai.time < 300.0 and self.ai.mediator.get_did_enemy_rush
+        ):
+            self.last_threat_time = self.ai.time
+
+        if self.ai.time - self.last_threat_time > settings[COMBAT_HOLD_TIME]:
+            return settings[MAX_GAME_STEP]
+
+        if num_threats >= settings[INTENSE_COMBAT_UNITS] and self._has_headroom(
+            settings[HEADROOM_RATIO]
+        ):
+            return settings[MIN_GAME_STEP]
+
+        return settings[COMBAT_GAME_STEP]
+
+    def _has_headroom(self, ratio: float) -> bool:
+        """Stepping more often costs CPU, only do it if we can afford it."""
+        return (
+            self.queen_bot_mediator.get_degradation_level == DegradationLevel.NONE
+            and self.queen_bot_mediator.get_average_step_time
+            < self.ai.config[PERFORMANCE][STEP_TIME_BUDGET] * ratio
+        )
+
+    def _num_threats(self, radius: float) -> int:
+        positions: list[Point2] = [th.position for th in self.ai.townhalls] + [
+            q.position for q in self.ai.units(UnitID.QUEEN)
+        ]
+        if not positions:
+            return 0
+
+        return len(
+            self.queen_bot_mediator.get_enemy_spatial_index.query(
+                positions,
+                radius,
+                exclude_type_ids=ATTACK_TARGET_IGNORE,
+                exclude_flags=STRUCTURE | HALLUCINATION | SNAPSHOT,
+            )
+        )
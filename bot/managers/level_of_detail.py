@@ -0,0 +1,37 @@
+"""Split units into contested (full micro every step) and calm ones.
+
+Calm units are far from every threat and only need an order every few
+frames, see `LevelOfDetailScheduler`. Plain NumPy so it can be benchmarked
+without the game, see `scripts/benchmarks/level_of_detail_benchmark.py`.
+"""
+import numpy as np
+
+
+def contested_mask(
+    unit_positions: np.ndarray, threat_positions: np.ndarray, radius: float
+) -> np.ndarray:
+    """Units with a threat within `radius`.
+
+    Parameters
+    ----------
+    unit_positions :
+        (n, 2) positions of our units.
+    threat_positions :
+        (m, 2) positions of enemies.
+    radius :
+        Distance at which an enemy makes a unit contested.
+
+    Returns
+    -------
+    np.ndarray :
+        (n,) True for contested units.
+    """
+    if len(threat_positions) == 0:
+        return np.zeros(len(unit_positions), dtype=bool)
+    offsets: np.ndarray = unit_positions[:, None, :] - threat_positions[None, :, :]
+    return (np.einsum("ijk,ijk->ij", offsets, offsets) < radius * radius).any(axis=1)
+
+
+def due_mask(last_order_loops: np.ndarray, game_loop: int, interval: int) -> np.ndarray:
+    """Calm units whose last order is at least `interval` game loops old."""
+    return game_loop - last_order_loops >= interval
@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Union
+
+import numpy as np
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import CALM_INTERVAL, CONTESTED_RADIUS, LEVEL_OF_DETAIL
+from bot.managers.level_of_detail import contested_mask, due_mask
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class LevelOfDetailScheduler:
+    """Only micro the queens that are near a fight.
+
+    Owned by `QueenManager` and passed to the queen controllers. A queen with
+    an enemy within `LevelOfDetail.ContestedRadius`, standing in enemy
+    influence or about to transfuse gets the full maneuver every step. The
+    rest are calm and get one cheap order every `CalmInterval` game loops,
+    staggered by when each queen was last ordered.
+    """
+
+    ai: "AresBot"
+    # queen tag -> game loop of the last calm order
+    last_order_loop: dict[int, int] = field(default_factory=dict)
+    threat_positions: np.ndarray = field(
+        default_factory=lambda: np.empty((0, 2), dtype=np.float32)
+    )
+
+    def __post_init__(self) -> None:
+        self.ai.tag_registry.track(self, "last_order_loop")
+
+    def update(self, threat_positions: np.ndarray) -> None:
+        """Called once per step by `QueenManager` with every enemy position."""
+        self.threat_positions = threat_positions
+
+    def split(
+        self,
+        units: Union[list[Unit], Units],
+        ground_grid: np.ndarray,
+        contested_tags: Iterable[int] = (),
+    ) -> tuple[list[Unit], list[Unit]]:
+        """Contested units, and calm units due an order this step.
+
+        Calm units not due an order are left out and keep their last order.
+        `contested_tags` are always contested, eg. queens with a transfuse.
+        """
+        if not units:
+            return [], []
+
+        settings: dict = self.ai.config[LEVEL_OF_DETAIL]
+        units = list(units)
+        positions: np.ndarray = np.array([u.position for u in units])
+        contested: np.ndarray = contested_mask(
+            positions, self.threat_positions, settings[CONTESTED_RADIUS]
+        )
+        # standing in enemy influence, eg. in range of static defence
+        cells: np.ndarray = positions.astype(np.intp)
+        contested |= ground_grid[cells[:, 0], cells[:, 1]] > 1.0
+        contested_tags = set(contested_tags)
+        contested |= np.array([u.tag in contested_tags for u in units])
+
+        game_loop: int = self.ai.state.game_loop
+        due: np.ndarray = due_mask(
+            np.array([self.last_order_loop.get(u.tag, -1000000) for u in units]),
+            game_loop,
+            settings[CALM_INTERVAL],
+        )
+        contested_units: list[Unit] = []
+        calm_units: list[Unit] = []
+        for unit, is_contested, is_due in zip(units, contested.tolist(), due.tolist()):
+            if is_contested:
+                contested_units.append(unit)
+                # straight back to calm orders once it's quiet again
+                self.last_order_loop.pop(unit.tag, None)
+            elif is_due:
+                calm_units.append(unit)
+                self.last_order_loop[unit.tag] = game_loop
+        return contested_units, calm_units
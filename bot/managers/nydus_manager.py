@@ -1,7 +1,8 @@
-from typing import TYPE_CHECKING, Any, List
+from typing import TYPE_CHECKING, Any, Optional
 
-from ares.consts import DEBUG, TOWNHALL_TYPES_NO_PF, UnitTreeQueryType
-from cython_extensions.geometry import cy_distance_to_squared
+import numpy as np
+from ares.consts import TOWNHALL_TYPES_NO_PF, UnitTreeQueryType
+from cython_extensions.geometry import cy_distance_to, cy_distance_to_squared
 from cython_extensions.units_utils import cy_find_units_center_mass
 from sc2.ids.ability_id import AbilityId
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
@@ -9,8 +10,32 @@ from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
-from bot.consts import RequestType
+from bot.consts import (
+    ARMY_DISTANCE_WEIGHT,
+    CANAL_LOSS_DECAY,
+    CANAL_LOSS_WEIGHT,
+    DETECTION_RADIUS,
+    DETECTION_WEIGHT,
+    DETECTOR_TYPES,
+    ENEMY_MEMORY,
+    ENEMY_RADIUS,
+    HALF_LIFE,
+    NYDUS_SPACING,
+    NYDUS_TARGETING,
+    PATH_DISTANCE_WEIGHT,
+    PATH_REFRESH_INTERVAL,
+    PLACEMENT_CHECKS,
+    REINFORCEMENT_CANALS,
+    SAFETY_CHECK_INTERVAL,
+    SPOT_COST_WEIGHT,
+    SPOT_REFRESH_INTERVAL,
+    RequestType,
+)
+from bot.managers.base_distances import BaseDistances
+from bot.managers.enemy_memory import STRUCTURE, EnemyMemory
+from bot.managers.nydus_target_scoring import NydusTargetWeights, score_nydus_targets
 from bot.managers.queen_bot_mediator import QueenBotMediator
+from bot.managers.reinforcement_canal_siting import select_reinforcement_sites
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -36,6 +61,18 @@ class NydusManager:
         self._placed_canal_at_target_base: bool = True
         self._current_nydus_attack_target: Point2 = self.ai.enemy_start_locations[0]
         self._current_nydus_canal_target: Point2 = self.ai.enemy_start_locations[0]
+        self.ai.tag_registry.subscribe(self._on_unit_destroyed)
+
+        # base -> (nydus spot, game time it was found)
+        self._nydus_spots: dict[Point2, tuple[Optional[Point2], float]] = {}
+        # base -> game times we lost a canal there
+        self._canal_losses: dict[Point2, list[float]] = {}
+
+        # reinforcement canal path, see `_attack_path`
+        self._attack_path_points: np.ndarray = np.empty((0, 2))
+        self._attack_path_target: Optional[Point2] = None
+        self._attack_path_time: float = 0.0
+        self._last_safety_check: float = 0.0
 
         self.queen_bot_requests_dict: dict = {
             RequestType.GET_CURRENT_CANAL_TARGET: lambda kwargs: self._current_nydus_canal_target,
@@ -87,12 +124,12 @@ class NydusManager:
             self._find_new_nydus_location()
 
         await self._build_canal_at_target()
-        # keep track if a canal exists at the target base
+        # forget target bases that turned unsafe before we got a canal there
         self._update_nydus_tracker()
 
         await self._build_reinforcement_canals()
 
-        if self.ai.config[DEBUG]:
+        if self.queen_bot_mediator.get_debug_drawing_enabled:
             self.ai.draw_text_on_world(
                 self._current_nydus_canal_target, "NYDUS CANAL TARGET"
             )
@@ -150,40 +187,75 @@ class NydusManager:
             return
 
         if network := self._nydus_network_ready_to_place_worm():
-            if path := self.ai.mediator.find_raw_path(
-                start=self.queen_bot_mediator.get_attack_target,
-                target=self.ai.game_info.map_center,
-                grid=self.ai.mediator.get_ground_grid,
-                sensitivity=8,
-            ):
-                for point in path:
-                    if self.ai.mediator.get_any_enemies_in_range(
-                        positions=[point], radius=14.5
-                    ):
-                        continue
-                    own_structures_dict: dict = self.ai.mediator.get_own_structures_dict
-                    nyduses: list[Unit] = (
-                        own_structures_dict[UnitID.NYDUSCANAL]
-                        + own_structures_dict[UnitID.NYDUSNETWORK]
-                    )
-                    if (
-                        len(
-                            [
-                                n
-                                for n in nyduses
-                                if cy_distance_to_squared(n.position, point) < 144.0
-                            ]
-                        )
-                        > 0
-                    ):
-                        continue
-
-                    placement = await self.ai.find_placement(
-                        UnitID.NYDUSCANAL, point, 3, False, 1
-                    )
-                    if placement and self.ai.is_visible(placement):
-                        network(AbilityId.BUILD_NYDUSWORM, placement)
-                        break
+            path: np.ndarray = self._attack_path()
+            if len(path) == 0:
+                return
+
+            settings: dict = self.ai.config[REINFORCEMENT_CANALS]
+            own_structures_dict: dict = self.ai.mediator.get_own_structures_dict
+            nyduses: list[Unit] = (
+                own_structures_dict[UnitID.NYDUSCANAL]
+                + own_structures_dict[UnitID.NYDUSNETWORK]
+            )
+            sites: np.ndarray = select_reinforcement_sites(
+                path,
+                self.queen_bot_mediator.get_enemy_spatial_index.positions,
+                np.array([n.position for n in nyduses]).reshape(-1, 2),
+                settings[ENEMY_RADIUS],
+                settings[NYDUS_SPACING],
+                settings[PLACEMENT_CHECKS],
+            )
+            for i in sites.tolist():
+                placement = await self.ai.find_placement(
+                    UnitID.NYDUSCANAL, Point2(path[i]), 3, False, 1
+                )
+                if placement and self.ai.is_visible(placement):
+                    network(AbilityId.BUILD_NYDUSWORM, placement)
+                    break
+
+    def _attack_path(self) -> np.ndarray:
+        """Path from the attack target to the map centre, cached per target.
+
+        The path follows the ground grid, so it is refreshed every
+        `ReinforcementCanals.PathRefreshInterval` seconds as influence moves.
+        If influence blocks every path and the attack target is at a base, we
+        use the stored path from that base to our natural until the next
+        refresh.
+        """
+        attack_target: Point2 = self.queen_bot_mediator.get_attack_target
+        if (
+            attack_target == self._attack_path_target
+            and self.ai.time - self._attack_path_time
+            < self.ai.config[REINFORCEMENT_CANALS][PATH_REFRESH_INTERVAL]
+        ):
+            return self._attack_path_points
+
+        path: Optional[list[Point2]] = self.ai.mediator.find_raw_path(
+            start=attack_target,
+            target=self.ai.game_info.map_center,
+            grid=self.ai.mediator.get_ground_grid,
+            sensitivity=8,
+        )
+        if path:
+            self._attack_path_points = np.array(path, dtype=float).reshape(-1, 2)
+        elif (base_path := self._base_path(attack_target)) is not None:
+            # every 8th point, like `find_raw_path` with sensitivity 8 above
+            self._attack_path_points = base_path[::8]
+        else:
+            self._attack_path_points = np.empty((0, 2))
+        self._attack_path_target = attack_target
+        self._attack_path_time = self.ai.time
+        return self._attack_path_points
+
+    def _base_path(self, attack_target: Point2) -> Optional[np.ndarray]:
+        """Stored path to our natural from the base at `attack_target`."""
+        base_distances: BaseDistances = self.queen_bot_mediator.get_base_distances
+        base: Point2 = Point2(
+            base_distances.points[base_distances.nearest_index(attack_target)].tolist()
+        )
+        if cy_distance_to_squared(base, attack_target) >= 100.0:
+            return None
+        return base_distances.path(base, self.ai.mediator.get_own_nat)
 
     def _find_new_nydus_location(self):
         if not self.ai.mediator.get_cached_enemy_army:
@@ -201,15 +273,13 @@ class NydusManager:
             if n.is_ready and AbilityId.BUILD_NYDUSWORM in n.abilities
         ]:
             # Build candidate bases: enemy main first, then known enemy expansions
-            candidates: List[Point2] = [self.ai.enemy_start_locations[0]]
-            enemy_townhalls: Units = self.ai.enemy_structures(TOWNHALL_TYPES_NO_PF)
-            for base in enemy_townhalls:
-                p: Point2 = base.position
-                if p not in candidates and p not in self._base_to_nydus_tracker:
-                    candidates.append(p)
-
-            if not candidates:
-                return
+            candidates: dict[Point2, None] = {self.ai.enemy_start_locations[0]: None}
+            # remembered, so bases out of vision stay candidates
+            memory: EnemyMemory = self.queen_bot_mediator.get_enemy_memory
+            for slot in memory.query(type_ids=TOWNHALL_TYPES_NO_PF).tolist():
+                p: Point2 = Point2(memory.positions[slot].tolist())
+                if p not in self._base_to_nydus_tracker:
+                    candidates[p] = None
 
             # Determine enemy mass center
             pos, _ = cy_find_units_center_mass(
@@ -217,76 +287,178 @@ class NydusManager:
             )
             enemy_pos: Point2 = Point2(pos)
 
-            target_base: Point2 = max(
-                candidates,
-                key=lambda candidate: cy_distance_to_squared(candidate, enemy_pos),
-            )
-
-            # we already are aware of this target base
-            if (
-                target_base == self._current_nydus_attack_target
-                and target_base in self._base_to_nydus_tracker
+            # best first, fall back to the next base if a spot doesn't check out
+            for target_base, spot in self._rank_nydus_targets(
+                list(candidates), enemy_pos
             ):
-                return
+                # we already are aware of this target base
+                if (
+                    target_base == self._current_nydus_attack_target
+                    and target_base in self._base_to_nydus_tracker
+                ):
+                    return
 
-            # Ask mediator for a good Nydus spot near the target base
-            spot: Point2 | None = self.ai.mediator.find_nydus_at_location(
-                base_location=target_base,
-                min_base_distance=15.0,
-                max_nydus_distance=25.0,
-                max_cost=20,
-            )
-            # check spot and that it's far enough away
-            if (
-                spot
-                and cy_distance_to_squared(spot, enemy_pos) > 500.0
-                and self.ai.mediator.is_position_safe(
+                # check spot and that it's far enough away
+                if cy_distance_to_squared(
+                    spot, enemy_pos
+                ) > 500.0 and self.ai.mediator.is_position_safe(
                     grid=self.ai.mediator.get_ground_grid, position=spot
+                ):
+                    self._base_to_nydus_tracker[target_base] = {
+                        "nydus_location": spot,
+                        "nydus_exists": False,
+                        "canal_tag": 0,
+                    }
+                    self._current_nydus_attack_target = target_base
+                    self._current_nydus_canal_target = spot
+                    return
+
+    def _rank_nydus_targets(
+        self, candidates: list[Point2], enemy_pos: Point2
+    ) -> list[tuple[Point2, Point2]]:
+        """Score every candidate base at once, see `score_nydus_targets`.
+
+        Returns
+        -------
+        list[tuple[Point2, Point2]] :
+            (base, nydus spot) pairs, best first. Bases without a nydus spot
+            are left out.
+        """
+        settings: dict = self.ai.config[NYDUS_TARGETING]
+        spots: list[Optional[Point2]] = [self._nydus_spot(base) for base in candidates]
+        grid: np.ndarray = self.ai.mediator.get_ground_grid
+        memory: EnemyMemory = self.queen_bot_mediator.get_enemy_memory
+        half_life: float = self.ai.config[ENEMY_MEMORY][HALF_LIFE]
+        base_distances: BaseDistances = self.queen_bot_mediator.get_base_distances
+
+        spot_costs: np.ndarray = np.full(len(candidates), np.inf)
+        detectors: np.ndarray = np.zeros(len(candidates))
+        canal_losses: np.ndarray = np.zeros(len(candidates))
+        for i, (base, spot) in enumerate(zip(candidates, spots)):
+            if spot:
+                # ground influence at the spot, 1.0 is no enemy influence
+                spot_costs[i] = max(grid[int(spot.x), int(spot.y)] - 1.0, 0.0)
+                # structures stay put, detector units count less the longer
+                # ago they were seen
+                slots: np.ndarray = memory.query(
+                    spot, settings[DETECTION_RADIUS], type_ids=DETECTOR_TYPES
                 )
-            ):
-                # enemy: Units = self.ai.mediator.get_units_in_range(
-                #     start_points=[spot],
-                #     distances=9.5,
-                #     query_tree=UnitTreeQueryType.AllEnemy,
-                # )[0]
-                # if not enemy:
-                self._base_to_nydus_tracker[target_base] = {
-                    "nydus_location": spot,
-                    "nydus_exists": False,
-                }
-                self._current_nydus_attack_target = target_base
-                self._current_nydus_canal_target = spot
+                detectors[i] = np.where(
+                    memory.flags[slots] & STRUCTURE,
+                    1.0,
+                    memory.confidence(slots, self.ai.time, half_life),
+                ).sum()
+            canal_losses[i] = sum(
+                np.exp(-(self.ai.time - t) / settings[CANAL_LOSS_DECAY])
+                for t in self._canal_losses.get(base, [])
+            )
+
+        ranked, _ = score_nydus_targets(
+            np.array(candidates),
+            np.array(enemy_pos),
+            np.array(
+                [self._path_distance(base_distances, base) for base in candidates]
+            ),
+            spot_costs,
+            canal_losses,
+            detectors,
+            NydusTargetWeights(
+                army_distance=settings[ARMY_DISTANCE_WEIGHT],
+                path_distance=settings[PATH_DISTANCE_WEIGHT],
+                spot_cost=settings[SPOT_COST_WEIGHT],
+                canal_losses=settings[CANAL_LOSS_WEIGHT],
+                detection=settings[DETECTION_WEIGHT],
+            ),
+        )
+        return [(candidates[i], spots[i]) for i in ranked.tolist()]
+
+    def _nydus_spot(self, base: Point2) -> Optional[Point2]:
+        """Nydus spot near `base`, cached and refreshed now and then."""
+        cached: Optional[tuple[Optional[Point2], float]] = self._nydus_spots.get(base)
+        if (
+            cached
+            and self.ai.time - cached[1]
+            < self.ai.config[NYDUS_TARGETING][SPOT_REFRESH_INTERVAL]
+        ):
+            return cached[0]
+
+        # Ask mediator for a good Nydus spot near the target base
+        spot: Optional[Point2] = self.ai.mediator.find_nydus_at_location(
+            base_location=base,
+            min_base_distance=15.0,
+            max_nydus_distance=25.0,
+            max_cost=20,
+        )
+        self._nydus_spots[base] = (spot, self.ai.time)
+        return spot
+
+    def _path_distance(self, base_distances: BaseDistances, base: Point2) -> float:
+        """Ground path distance from our main (where our networks are)."""
+        distance: Optional[float] = base_distances.distance(
+            self.ai.start_location, base
+        )
+        if distance is None or distance == np.inf:
+            return cy_distance_to(base, self.ai.start_location)
+        return distance
+
+    def on_building_construction_started(self, unit: Unit) -> None:
+        """Mark the tracked base a new canal belongs to as having one."""
+        if unit.type_id != UnitID.NYDUSCANAL:
+            return
 
-    def _update_nydus_tracker(self):
-        keys_to_remove: list[Point2] = []
         for base_location, canal_info in self._base_to_nydus_tracker.items():
-            location: Point2 = canal_info["nydus_location"]
-            close_canals: Units = self.ai.mediator.get_units_in_range(
-                start_points=[location],
-                distances=8.5,
-                query_tree=UnitTreeQueryType.AllOwn,
-            )[0].filter(lambda u: u.type_id == UnitID.NYDUSCANAL)
-            if canal_info["nydus_exists"]:
-                # no canal close by, remove from tracker if not the target base
-                if not close_canals:
-                    if location == self._current_nydus_attack_target:
-                        self._base_to_nydus_tracker[base_location][
-                            "nydus_exists"
-                        ] = False
-                        self._placed_canal_at_target_base = False
-                    else:
-                        keys_to_remove.append(base_location)
-            elif close_canals:
+            if not canal_info["nydus_exists"] and (
+                cy_distance_to_squared(unit.position, canal_info["nydus_location"])
+                < 72.25
+            ):
                 if base_location == self._current_nydus_attack_target:
                     self._placed_canal_at_target_base = True
-                self._base_to_nydus_tracker[base_location]["nydus_exists"] = True
+                canal_info["nydus_exists"] = True
+                canal_info["canal_tag"] = unit.tag
+                return
 
-            # no longer safe, remove
-            elif not self.ai.mediator.is_position_safe(
-                grid=self.ai.mediator.get_ground_grid, position=location
-            ):
-                self._placed_canal_at_target_base = True
-                keys_to_remove.append(base_location)
+    def _update_nydus_tracker(self):
+        """Drop bases still waiting on a canal whose spot is no longer safe.
 
+        Canals appearing and dying are handled by
+        `on_building_construction_started` and `_on_unit_destroyed`, so this
+        only runs every `NydusTargeting.SafetyCheckInterval` seconds.
+        """
+        if (
+            self.ai.time - self._last_safety_check
+            < self.ai.config[NYDUS_TARGETING][SAFETY_CHECK_INTERVAL]
+        ):
+            return
+        self._last_safety_check = self.ai.time
+
+        grid: np.ndarray = self.ai.mediator.get_ground_grid
+        keys_to_remove: list[Point2] = [
+            base_location
+            for base_location, canal_info in self._base_to_nydus_tracker.items()
+            if not canal_info["nydus_exists"]
+            and not self.ai.mediator.is_position_safe(
+                grid=grid, position=canal_info["nydus_location"]
+            )
+        ]
+        if keys_to_remove:
+            self._placed_canal_at_target_base = True
         for key in keys_to_remove:
             del self._base_to_nydus_tracker[key]
+
+    def _keep_after_canal_lost(self, base_location: Point2, canal_info: dict) -> bool:
+        """Reset the target base entry so we place another canal there."""
+        self._canal_losses.setdefault(base_location, []).append(self.ai.time)
+        if base_location == self._current_nydus_attack_target:
+            canal_info["nydus_exists"] = False
+            canal_info["canal_tag"] = 0
+            self._placed_canal_at_target_base = False
+            return True
+        return False
+
+    def _on_unit_destroyed(self, tag: int) -> None:
+        """Called by the tag registry, drop entries for canals that died."""
+        for base_location, canal_info in list(self._base_to_nydus_tracker.items()):
+            if canal_info["canal_tag"] == tag and not self._keep_after_canal_lost(
+                base_location, canal_info
+            ):
+                del self._base_to_nydus_tracker[base_location]
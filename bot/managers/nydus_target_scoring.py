@@ -0,0 +1,90 @@
+"""Rank enemy bases as nydus targets, scoring every candidate at once.
+
+Each criterion is scaled to 0..1 (distances and costs across the
+candidates, counts saturate at `SATURATING_COUNT`) so the weights in
+`config.yml` (`NydusTargeting`) are comparable, then combined into one
+score. Higher is better.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# loss / detector counts stop mattering more past this many
+SATURATING_COUNT: float = 3.0
+
+
+@dataclass
+class NydusTargetWeights:
+    army_distance: float = 1.0
+    path_distance: float = 0.3
+    spot_cost: float = 0.5
+    canal_losses: float = 1.0
+    detection: float = 0.5
+
+
+def _normalise(values: np.ndarray) -> np.ndarray:
+    spread: float = float(values.max() - values.min()) if len(values) else 0.0
+    if spread == 0.0:
+        return np.zeros_like(values, dtype=float)
+    return (values - values.min()) / spread
+
+
+def _saturate(counts: np.ndarray) -> np.ndarray:
+    return np.minimum(counts, SATURATING_COUNT) / SATURATING_COUNT
+
+
+def score_nydus_targets(
+    base_positions: np.ndarray,
+    enemy_army_center: np.ndarray,
+    path_distances: np.ndarray,
+    spot_costs: np.ndarray,
+    canal_losses: np.ndarray,
+    detectors: np.ndarray,
+    weights: NydusTargetWeights,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score candidate bases, best first.
+
+    Parameters
+    ----------
+    base_positions :
+        (k, 2) candidate enemy base locations.
+    enemy_army_center :
+        (2,) centre of mass of the enemy army, further away is better.
+    path_distances :
+        (k,) ground path distance from our nydus networks, closer is better.
+    spot_costs :
+        (k,) cost of the best nydus spot near each base, `np.inf` if there
+        is none. Lower is better.
+    canal_losses :
+        (k,) recent canal losses at each base (decayed count).
+    detectors :
+        (k,) enemy detectors remembered near each base, units weighted by
+        how recently they were seen.
+    weights :
+        How much each criterion counts.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray] :
+        Candidate indices ordered best first, and the score of each candidate
+        (`-np.inf` for bases with no nydus spot, which are left out).
+    """
+    if len(base_positions) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+
+    offsets: np.ndarray = base_positions - enemy_army_center
+    army_distance: np.ndarray = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+    has_spot: np.ndarray = np.isfinite(spot_costs)
+    finite_costs: np.ndarray = np.where(has_spot, spot_costs, 0.0)
+
+    scores: np.ndarray = (
+        weights.army_distance * _normalise(army_distance)
+        - weights.path_distance * _normalise(path_distances)
+        - weights.spot_cost * _normalise(finite_costs)
+        - weights.canal_losses * _saturate(canal_losses)
+        - weights.detection * _saturate(detectors)
+    )
+    scores[~has_spot] = -np.inf
+
+    ranked: np.ndarray = np.argsort(-scores, kind="stable")
+    return ranked[has_spot[ranked]], scores
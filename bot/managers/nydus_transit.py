@@ -0,0 +1,128 @@
+"""Spread a squad of queens over the nydus entrances we own.
+
+Each entrance loads one unit at a time (`load_time` seconds per unit) and the
+exit canal unloads one at a time (`unload_time`). Works on plain NumPy
+arrays so it can be benchmarked without the game, see
+`scripts/benchmarks/nydus_transit_benchmark.py`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class NydusTransitPlan:
+    """Output of `plan_nydus_transit`.
+
+    Parameters
+    ----------
+    entrances : np.ndarray
+        Entrance index for each queen.
+    arrival_times : np.ndarray
+        Seconds until each queen is out of the exit canal.
+    """
+
+    entrances: np.ndarray
+    arrival_times: np.ndarray
+
+    @property
+    def total_transit_time(self) -> float:
+        return float(self.arrival_times.sum())
+
+    @property
+    def squad_transit_time(self) -> float:
+        """Seconds until the last queen is out."""
+        return float(self.arrival_times.max()) if len(self.arrival_times) else 0.0
+
+
+def plan_nydus_transit(
+    queen_positions: np.ndarray,
+    queen_speeds: np.ndarray,
+    entrance_positions: np.ndarray,
+    entrance_backlog: np.ndarray,
+    load_time: float,
+    unload_time: float,
+    exit_backlog: float = 0.0,
+) -> NydusTransitPlan:
+    """Pick an entrance for each queen, minimising total transit time.
+
+    Greedy earliest finish first: out of all queens still to place, the one
+    that can be loaded soonest (at whichever entrance gives that) goes next,
+    and that entrance is busy for another `load_time`. Queens arriving at a
+    busy entrance wait in line, so a far away idle entrance wins once the
+    queue at the close one gets long enough.
+
+    Parameters
+    ----------
+    queen_positions :
+        (n, 2) positions of the queens.
+    queen_speeds :
+        (n,) movement speed of each queen.
+    entrance_positions :
+        (m, 2) positions of the nydus networks / canals we can enter by.
+    entrance_backlog :
+        (m,) seconds until each entrance is free, from queens already queued.
+    load_time :
+        Seconds for one unit to load into an entrance.
+    unload_time :
+        Seconds for one unit to unload from the exit.
+    exit_backlog :
+        Seconds until the exit has unloaded units already inside.
+
+    Returns
+    -------
+    NydusTransitPlan :
+        Entrance index and arrival time per queen.
+    """
+    num_queens: int = len(queen_positions)
+    entrances: np.ndarray = np.zeros(num_queens, dtype=np.int32)
+    arrival_times: np.ndarray = np.zeros(num_queens)
+    if num_queens == 0 or len(entrance_positions) == 0:
+        return NydusTransitPlan(entrances, arrival_times)
+
+    offsets: np.ndarray = queen_positions[:, None, :] - entrance_positions[None, :, :]
+    walk_times: np.ndarray = (
+        np.sqrt(np.einsum("ijk,ijk->ij", offsets, offsets))
+        / np.maximum(queen_speeds, 0.1)[:, None]
+    )
+    # the best queen for an entrance is always its closest unplaced one, so
+    # each entrance only needs a pointer into its queens sorted by walk time
+    by_walk_time: list[list[int]] = np.argsort(walk_times, axis=0).T.tolist()
+    walk: list[list[float]] = walk_times.tolist()
+    next_queen: list[int] = [0] * len(entrance_positions)
+    entrance_free: list[float] = entrance_backlog.astype(float).tolist()
+    placed: list[bool] = [False] * num_queens
+
+    load_order: list[tuple[int, float]] = []
+    for _ in range(num_queens):
+        best_loaded: float = np.inf
+        best_queen: int = 0
+        best_entrance: int = 0
+        for entrance_idx, order in enumerate(by_walk_time):
+            i: int = next_queen[entrance_idx]
+            while placed[order[i]]:
+                i += 1
+            next_queen[entrance_idx] = i
+            queen_idx: int = order[i]
+            loaded: float = (
+                max(walk[queen_idx][entrance_idx], entrance_free[entrance_idx])
+                + load_time
+            )
+            if loaded < best_loaded:
+                best_loaded, best_queen, best_entrance = (
+                    loaded,
+                    queen_idx,
+                    entrance_idx,
+                )
+        entrances[best_queen] = best_entrance
+        entrance_free[best_entrance] = best_loaded
+        placed[best_queen] = True
+        load_order.append((best_queen, best_loaded))
+
+    # everyone leaves through the same exit, in the order they got in
+    exit_free: float = exit_backlog
+    for queen_idx, loaded_at in load_order:
+        exit_free = max(exit_free, loaded_at) + unload_time
+        arrival_times[queen_idx] = exit_free
+
+    return NydusTransitPlan(entrances, arrival_times)
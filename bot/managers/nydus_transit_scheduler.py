@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import LOAD_TIME, NYDUS_TRANSIT, REPLAN_INTERVAL, UNLOAD_TIME
+from bot.managers.nydus_transit import NydusTransitPlan, plan_nydus_transit
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class NydusTransitScheduler:
+    """Queue queens at nydus entrances so one doesn't jam while others idle.
+
+    Owned by `QueenManager` and passed to the queen controllers, which ask
+    for an entrance per queen instead of all using the entrance ares'
+    pathing picked for the squad. A squad is replanned when it has queens
+    without an entrance, the exit changed, or every
+    `NydusTransit.ReplanInterval` seconds.
+    """
+
+    ai: "AresBot"
+    # queen tag -> entrance tag
+    entrances: dict[int, int] = field(default_factory=dict)
+    # queen tag -> exit tag the entrance was planned for
+    exits: dict[int, int] = field(default_factory=dict)
+    last_plan_time: dict[int, float] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # dead queens leave the queue, a dead entrance frees its queens
+        self.ai.tag_registry.track(self, "entrances", by_value=True)
+        self.ai.tag_registry.track(self, "exits", by_value=True)
+        self.ai.tag_registry.track(self, "last_plan_time")
+
+    def plan_squad(self, squad: Union[list[Unit], Units], exit_tag: int) -> None:
+        """Make sure every queen in `squad` has an entrance to `exit_tag`."""
+        settings: dict = self.ai.config[NYDUS_TRANSIT]
+        if all(
+            self.exits.get(q.tag) == exit_tag
+            and self.ai.time - self.last_plan_time.get(q.tag, -1000.0)
+            < settings[REPLAN_INTERVAL]
+            for q in squad
+        ):
+            return
+
+        available: list[Unit] = [
+            n
+            for n in self.ai.structures({UnitID.NYDUSNETWORK, UnitID.NYDUSCANAL})
+            if n.is_ready and n.tag != exit_tag
+        ]
+        if not available:
+            return
+
+        squad_tags: set[int] = {q.tag for q in squad}
+        entrance_index: dict[int, int] = {n.tag: i for i, n in enumerate(available)}
+        # other squads still walking to these entrances, queens that are
+        # already inside or haven't been replanned in a while don't count
+        queued: np.ndarray = np.zeros(len(available))
+        for queen_tag, entrance_tag in self.entrances.items():
+            if (
+                queen_tag not in squad_tags
+                and entrance_tag in entrance_index
+                and queen_tag in self.ai.unit_tag_dict
+                and self.ai.time - self.last_plan_time[queen_tag]
+                < settings[REPLAN_INTERVAL]
+            ):
+                queued[entrance_index[entrance_tag]] += 1
+
+        plan: NydusTransitPlan = plan_nydus_transit(
+            np.array([q.position for q in squad]),
+            np.array([q.real_speed for q in squad]),
+            np.array([n.position for n in available]),
+            queued * settings[LOAD_TIME],
+            settings[LOAD_TIME],
+            settings[UNLOAD_TIME],
+        )
+        for queen, entrance_idx in zip(squad, plan.entrances.tolist()):
+            self.entrances[queen.tag] = available[entrance_idx].tag
+            self.exits[queen.tag] = exit_tag
+            self.last_plan_time[queen.tag] = self.ai.time
+
+    def entrance_for(self, queen: Unit, default_tag: int) -> int:
+        """The entrance `queen` should use, `default_tag` if it has none."""
+        entrance_tag: int = self.entrances.get(queen.tag, default_tag)
+        return entrance_tag if entrance_tag in self.ai.unit_tag_dict else default_tag
@@ -0,0 +1,135 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+from ares.consts import DEBUG
+from loguru import logger
+
+from bot.consts import (
+    ESCALATE_AFTER_STEPS,
+    PERFORMANCE,
+    RECOVER_AFTER_STEPS,
+    RECOVER_RATIO,
+    REDUCED_TICK_INTERVAL,
+    STEP_TIME_BUDGET,
+    STEP_TIME_SMOOTHING,
+    DegradationLevel,
+    RequestType,
+)
+from bot.managers.queen_bot_mediator import QueenBotMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class PerformanceManager:
+    """Gracefully degrade the bot when steps run over the time budget.
+
+    `bot/main.py` reports how long each `on_step` took. If the moving average
+    stays over `Performance.StepTimeBudget` the bot moves one level down the
+    `DegradationLevel` ladder, and climbs back up one level at a time once the
+    average stays comfortably under budget again.
+    """
+
+    queen_bot_mediator: QueenBotMediator
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+
+        self.level: DegradationLevel = DegradationLevel.NONE
+        self.average_step_time: float = 0.0
+        self._steps_over_budget: int = 0
+        self._steps_under_budget: int = 0
+
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {
+            RequestType.GET_AVERAGE_STEP_TIME: lambda kwargs: self.average_step_time,
+            RequestType.GET_DEBUG_DRAWING_ENABLED: lambda kwargs: self.debug_drawing_enabled,
+            RequestType.GET_DEGRADATION_LEVEL: lambda kwargs: self.level,
+        }
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.queen_bot_requests_dict[request](kwargs)
+
+    @property
+    def debug_drawing_enabled(self) -> bool:
+        return self.ai.config[DEBUG] and self.level < DegradationLevel.NO_DEBUG_DRAWING
+
+    def is_degraded(self, level: DegradationLevel) -> bool:
+        return self.level >= level
+
+    def should_skip_tick(self, iteration: int) -> bool:
+        """Low priority systems only run every few steps at reduced tick rate."""
+        return (
+            self.level >= DegradationLevel.REDUCED_TICK_RATE
+            and iteration % self.ai.config[PERFORMANCE][REDUCED_TICK_INTERVAL] != 0
+        )
+
+    def record_step_time(self, step_time: float) -> None:
+        """Called at the end of every `on_step` from `bot/main.py`
+
+        Parameters
+        ----------
+        step_time :
+            How long the step took in milliseconds.
+        """
+        settings: dict = self.ai.config[PERFORMANCE]
+        if self.average_step_time == 0.0:
+            self.average_step_time = step_time
+        else:
+            self.average_step_time += settings[STEP_TIME_SMOOTHING] * (
+                step_time - self.average_step_time
+            )
+
+        budget: float = settings[STEP_TIME_BUDGET]
+        if self.average_step_time > budget:
+            self._steps_over_budget += 1
+            self._steps_under_budget = 0
+            if (
+                self._steps_over_budget >= settings[ESCALATE_AFTER_STEPS]
+                and self.level < DegradationLevel.SQUAD_ORDERS
+            ):
+                self._set_level(DegradationLevel(self.level + 1))
+        elif self.average_step_time < budget * settings[RECOVER_RATIO]:
+            self._steps_under_budget += 1
+            self._steps_over_budget = 0
+            if (
+                self._steps_under_budget >= settings[RECOVER_AFTER_STEPS]
+                and self.level > DegradationLevel.NONE
+            ):
+                self._set_level(DegradationLevel(self.level - 1))
+        else:
+            self._steps_over_budget = 0
+            self._steps_under_budget = 0
+
+    def _set_level(self, level: DegradationLevel) -> None:
+        logger.info(
+            f"{self.ai.time_formatted} - Degradation level {self.level.name} -> "
+            f"{level.name} (average step time {self.average_step_time:.1f}ms)"
+        )
+        self.level = level
+        self._steps_over_budget = 0
+        self._steps_under_budget = 0
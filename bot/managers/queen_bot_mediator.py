@@ -1,9 +1,17 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 from sc2.position import Point2
 
-from bot.consts import RequestType
+from bot.consts import DegradationLevel, RequestType
+
+if TYPE_CHECKING:
+    from bot.managers.base_distances import BaseDistances
+    from bot.managers.enemy_clustering import EnemyClusters
+    from bot.managers.enemy_memory import EnemyMemory
+    from bot.managers.enemy_spatial_index import EnemySpatialIndex
+    from bot.managers.energy_planning import EnergyPlan
+    from bot.managers.engagement_estimator import EngagementEstimator
 
 
 class IQueenBotMediator(metaclass=ABCMeta):
@@ -88,6 +96,18 @@ class QueenBotMediator(IQueenBotMediator):
     def get_attack_target(self) -> Point2:
         return self.manager_request("CombatManager", RequestType.GET_ATTACK_TARGET)
 
+    @property
+    def get_average_step_time(self) -> float:
+        return self.manager_request(
+            "PerformanceManager", RequestType.GET_AVERAGE_STEP_TIME
+        )
+
+    @property
+    def get_base_distances(self) -> "BaseDistances":
+        return self.manager_request(
+            "BaseDistanceManager", RequestType.GET_BASE_DISTANCES
+        )
+
     @property
     def get_current_canal_target(self) -> Point2:
         return self.manager_request(
@@ -100,8 +120,56 @@ class QueenBotMediator(IQueenBotMediator):
             "NydusManager", RequestType.GET_CURRENT_NYDUS_TARGET
         )
 
+    @property
+    def get_debug_drawing_enabled(self) -> bool:
+        return self.manager_request(
+            "PerformanceManager", RequestType.GET_DEBUG_DRAWING_ENABLED
+        )
+
+    @property
+    def get_degradation_level(self) -> DegradationLevel:
+        return self.manager_request(
+            "PerformanceManager", RequestType.GET_DEGRADATION_LEVEL
+        )
+
+    @property
+    def get_engagement_estimator(self) -> "EngagementEstimator":
+        return self.manager_request(
+            "CombatManager", RequestType.GET_ENGAGEMENT_ESTIMATOR
+        )
+
+    @property
+    def get_energy_plan(self) -> "EnergyPlan":
+        return self.manager_request("EnergyManager", RequestType.GET_ENERGY_PLAN)
+
+    @property
+    def get_enemy_clusters(self) -> "EnemyClusters":
+        return self.manager_request("CombatManager", RequestType.GET_ENEMY_CLUSTERS)
+
+    @property
+    def get_enemy_memory(self) -> "EnemyMemory":
+        return self.manager_request("EnemyIntelManager", RequestType.GET_ENEMY_MEMORY)
+
+    @property
+    def get_enemy_spatial_index(self) -> "EnemySpatialIndex":
+        return self.manager_request(
+            "EnemyIntelManager", RequestType.GET_ENEMY_SPATIAL_INDEX
+        )
+
+    @property
+    def get_enemy_spatial_index_stats(self) -> tuple[int, int]:
+        """Total index requests and index builds so far this game."""
+        return self.manager_request(
+            "EnemyIntelManager", RequestType.GET_ENEMY_SPATIAL_INDEX_STATS
+        )
+
     @property
     def get_should_be_aggressive(self) -> bool:
         return self.manager_request(
             "CombatManager", RequestType.GET_SHOULD_BE_AGGRESSIVE
         )
+
+    @property
+    def get_transfuse_stats(self) -> tuple[int, float]:
+        """Transfuses cast so far this game, and the share that wasn't overheal."""
+        return self.manager_request("QueenManager", RequestType.GET_TRANSFUSE_STATS)
@@ -1,7 +1,8 @@
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
+import numpy as np
 from ares import AresBot, UnitTreeQueryType
-from ares.consts import VICTORY_MARGINAL_OR_BETTER, UnitRole
+from ares.consts import ALL_STRUCTURES, VICTORY_MARGINAL_OR_BETTER, UnitRole
 from ares.managers.squad_manager import UnitSquad
 from cython_extensions.geometry import cy_towards
 from cython_extensions.units_utils import cy_center
@@ -9,9 +10,26 @@ from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
-from bot.consts import RequestType
+from bot.consts import (
+    COMMON_UNIT_IGNORE_TYPES,
+    ENABLED,
+    ENEMY_CLUSTERS,
+    LEVEL_OF_DETAIL,
+    MIN_SHARE,
+    SQUAD_SHARE,
+    DegradationLevel,
+    RequestType,
+    SquadEngagement,
+)
+from bot.managers.enemy_clustering import EnemyClusters, assign_squads
+from bot.managers.enemy_spatial_index import HALLUCINATION, SNAPSHOT, EnemySpatialIndex
+from bot.managers.energy_planning import EnergyPlan
+from bot.managers.engagement_estimator import EngagementEstimator
+from bot.managers.level_of_detail_scheduler import LevelOfDetailScheduler
+from bot.managers.nydus_transit_scheduler import NydusTransitScheduler
 from bot.managers.queen_bot_mediator import QueenBotMediator
 from bot.managers.queen_role_controller import QueenRoleController
+from bot.managers.transfuse_allocator import TransfuseAllocator
 from bot.unit_control.base_control import BaseControl
 from bot.unit_control.combat_queens import CombatQueens
 from bot.unit_control.creep_queens import CreepQueens
@@ -28,6 +46,14 @@ class QueenManager:
         self.ai: AresBot = ai
         # controller to manage the queen roles
         self._queen_role_controller = QueenRoleController(ai)
+        # spreads queens over our nydus entrances
+        self._nydus_transit_scheduler = NydusTransitScheduler(ai)
+        # one transfuse per injured unit across a squad
+        self._transfuse_allocator = TransfuseAllocator(ai)
+        # full micro only for queens near a fight
+        self._lod_scheduler: Optional[LevelOfDetailScheduler] = (
+            LevelOfDetailScheduler(ai) if ai.config[LEVEL_OF_DETAIL][ENABLED] else None
+        )
 
         # combat classes
         self._creep_queens_control: BaseControl = CreepQueens(
@@ -43,7 +69,12 @@ class QueenManager:
             ai, ai.config, ai.mediator
         )
 
-        self.queen_bot_requests_dict: dict[RequestType, Callable] = {}
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {
+            RequestType.GET_TRANSFUSE_STATS: lambda kwargs: (
+                self._transfuse_allocator.casts,
+                self._transfuse_allocator.efficiency,
+            ),
+        }
 
     def manager_request(
         self,
@@ -76,6 +107,10 @@ class QueenManager:
 
     def update(self) -> None:
         aggressive: bool = self.queen_bot_mediator.get_should_be_aggressive
+        squad_orders: bool = (
+            self.queen_bot_mediator.get_degradation_level
+            >= DegradationLevel.SQUAD_ORDERS
+        )
 
         # get queens based on roles
         creep_queens: Units = self.ai.mediator.get_units_from_role(
@@ -101,13 +136,27 @@ class QueenManager:
             inject_queens,
             offensive_queens,
             aggressive=aggressive,
+            base_distances=self.queen_bot_mediator.get_base_distances,
+            draw_debug=self.queen_bot_mediator.get_debug_drawing_enabled,
         )
 
+        if self._lod_scheduler:
+            enemy_index: EnemySpatialIndex = (
+                self.queen_bot_mediator.get_enemy_spatial_index
+            )
+            self._lod_scheduler.update(
+                enemy_index.positions[
+                    enemy_index.indices_of_types(exclude_flags=HALLUCINATION | SNAPSHOT)
+                ]
+            )
+
         # control queens
-        self._creep_queens_control.execute(creep_queens)
+        energy_plan: EnergyPlan = self.queen_bot_mediator.get_energy_plan
+        self._creep_queens_control.execute(creep_queens, energy_plan=energy_plan)
         self._inject_queens_control.execute(
             inject_queens,
             inject_q_to_th_tags=self._queen_role_controller.inject_queen_to_th,
+            energy_plan=energy_plan,
         )
         main_ground_threats: Units = (
             self.ai.mediator.get_main_ground_threats_near_townhall
@@ -119,6 +168,15 @@ class QueenManager:
             or main_air_threats
         )
 
+        defence_squads: list[UnitSquad] = (
+            self.ai.mediator.get_squads(role=UnitRole.QUEEN_DEFENCE, squad_radius=9.0)
+            if defensive_queens
+            else []
+        )
+        close_enemies, engagements, can_engage_at_nydus = self._evaluate_squads(
+            defence_squads, nydus_queens, aggressive
+        )
+
         if defensive_queens:
             attack_target: Point2
             if self.queen_bot_mediator.get_should_be_aggressive:
@@ -134,23 +192,33 @@ class QueenManager:
                 elif main_air_threats:
                     attack_target = Point2(cy_center(main_air_threats))
 
-            squads: list[UnitSquad] = self.ai.mediator.get_squads(
-                role=UnitRole.QUEEN_DEFENCE, squad_radius=9.0
-            )
-            if len(squads) > 0:
+            if len(defence_squads) > 0:
                 pos_of_main_squad: Point2 = self.ai.mediator.get_position_of_main_squad(
                     role=UnitRole.QUEEN_DEFENCE
                 )
-                for squad in squads:
-                    _target: Point2 = (
+                squad_targets: list[Optional[Point2]] = (
+                    self._squad_targets(defence_squads)
+                    if aggressive
+                    else [None] * len(defence_squads)
+                )
+                for squad, close_enemy, engagement, squad_target in zip(
+                    defence_squads, close_enemies, engagements, squad_targets
+                ):
+                    _target: Point2 = squad_target or (
                         attack_target if squad.main_squad else pos_of_main_squad
                     )
                     self._combat_queens_control.execute(
                         squad.squad_units,
                         target=_target,
                         can_engage=can_engage,
-                        check_close_combat_result=aggressive,
+                        close_enemy=close_enemy,
+                        engagement=engagement,
                         spread_creep=self.ai.mediator.get_creep_coverage < 85.0,
+                        squad_orders=squad_orders,
+                        nydus_scheduler=self._nydus_transit_scheduler,
+                        transfuse_allocator=self._transfuse_allocator,
+                        energy_plan=energy_plan,
+                        lod_scheduler=self._lod_scheduler,
                     )
 
         if nydus_queens:
@@ -158,13 +226,17 @@ class QueenManager:
                 role=UnitRole.QUEEN_NYDUS, squad_radius=9.0
             )
             nydus_target: Point2 = self.queen_bot_mediator.get_current_nydus_target
-            can_engage_at_nydus: bool = self._check_nydus_engagement(nydus_queens)
             for squad in squads:
                 self._nydus_queens_control.execute(
                     squad.squad_units,
                     nydus_target=nydus_target,
                     squad_pos=squad.squad_position,
                     can_engage_at_nydus=can_engage_at_nydus,
+                    squad_orders=squad_orders,
+                    nydus_scheduler=self._nydus_transit_scheduler,
+                    transfuse_allocator=self._transfuse_allocator,
+                    energy_plan=energy_plan,
+                    lod_scheduler=self._lod_scheduler,
                 )
 
     def assign_new_queen(self, queen: Unit) -> None:
@@ -174,19 +246,112 @@ class QueenManager:
         """
         self._queen_role_controller.assign_new_queen(queen)
 
-    def _check_nydus_engagement(self, nydus_queens: Units) -> bool:
-        enemy_near_nydus_target: Units = self.ai.mediator.get_units_in_range(
-            start_points=[self.queen_bot_mediator.get_current_nydus_target],
-            distances=[15.5],
+    def _squad_targets(self, defence_squads: list[UnitSquad]) -> list[Optional[Point2]]:
+        """The enemy cluster each defence squad is strong enough to attack.
+
+        Uses this frame's `CombatManager.enemy_clusters`, see `assign_squads`.
+        None where there is nothing worth attacking, the squad then falls
+        back to the attack target or the main squad.
+        """
+        settings: dict = self.ai.config[ENEMY_CLUSTERS]
+        clusters: EnemyClusters = self.queen_bot_mediator.get_enemy_clusters
+        if not settings[ENABLED] or len(clusters) == 0:
+            return [None] * len(defence_squads)
+
+        estimator: EngagementEstimator = (
+            self.queen_bot_mediator.get_engagement_estimator
+        )
+        squad_hp: list[float] = []
+        squad_dps: list[float] = []
+        for squad in defence_squads:
+            ground_dps, _, hp, _ = estimator.army_arrays(squad.squad_units)
+            squad_hp.append(float(hp.sum()))
+            squad_dps.append(float(ground_dps.sum()))
+        assigned: np.ndarray = assign_squads(
+            np.array([squad.squad_position for squad in defence_squads]),
+            np.array(squad_hp),
+            np.array(squad_dps),
+            clusters,
+            settings[MIN_SHARE],
+            settings[SQUAD_SHARE],
+        )
+        return [
+            Point2(clusters.centers[cluster].tolist()) if cluster >= 0 else None
+            for cluster in assigned.tolist()
+        ]
+
+    def _evaluate_squads(
+        self, defence_squads: list[UnitSquad], nydus_queens: Units, aggressive: bool
+    ) -> tuple[list[Units], list[Optional[SquadEngagement]], bool]:
+        """Close enemies and what to do about them, for every squad at once.
+
+        One enemy query for all defence squads and the nydus target, then one
+        batch estimate for the squads that need it, see
+        `EngagementEstimator.evaluate_squads`. Defence squads only check the
+        fight when aggressive, squads too close to call run the full sim.
+
+        Returns
+        -------
+        tuple[list[Units], list[Optional[SquadEngagement]], bool] :
+            Enemies near each defence squad, each squad's engagement (None
+            if not checked) and whether nydus queens can engage at the target.
+        """
+        start_points: list[Point2] = [
+            Point2(cy_center(squad.squad_units)) for squad in defence_squads
+        ]
+        distances: list[float] = [13.5] * len(start_points)
+        if nydus_queens:
+            start_points.append(self.queen_bot_mediator.get_current_nydus_target)
+            distances.append(15.5)
+        if not start_points:
+            return [], [], False
+
+        in_range: list[Units] = self.ai.mediator.get_units_in_range(
+            start_points=start_points,
+            distances=distances,
             query_tree=UnitTreeQueryType.AllEnemy,
-        )[0]
+            return_as_dict=False,
+        )
+        close_enemies: list[Units] = [
+            enemies.filter(lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES)
+            for enemies in in_range[: len(defence_squads)]
+        ]
 
-        if (
-            self.ai.mediator.can_win_fight(
-                own_units=nydus_queens, enemy_units=enemy_near_nydus_target
-            )
-            in VICTORY_MARGINAL_OR_BETTER
-        ):
-            return True
+        own_squads: list[Units] = []
+        enemy_sets: list[list[Unit]] = []
+        if aggressive:
+            own_squads = [squad.squad_units for squad in defence_squads]
+            enemy_sets = [
+                [u for u in enemies if u.type_id not in ALL_STRUCTURES]
+                for enemies in close_enemies
+            ]
+        if nydus_queens:
+            own_squads.append(nydus_queens)
+            enemy_sets.append(in_range[-1])
 
-        return False
+        estimator: EngagementEstimator = (
+            self.queen_bot_mediator.get_engagement_estimator
+        )
+        decisions: list[SquadEngagement] = (
+            estimator.evaluate_squads(own_squads, enemy_sets) if own_squads else []
+        )
+        # too close to call, the full sim decides
+        for i, decision in enumerate(decisions):
+            if decision == SquadEngagement.HOLD:
+                decisions[i] = (
+                    SquadEngagement.ENGAGE
+                    if estimator.can_win_fight(
+                        own_units=own_squads[i], enemy_units=enemy_sets[i]
+                    )
+                    in VICTORY_MARGINAL_OR_BETTER
+                    else SquadEngagement.RETREAT
+                )
+        engagements: list[Optional[SquadEngagement]] = (
+            decisions[: len(defence_squads)]
+            if aggressive
+            else [None] * len(defence_squads)
+        )
+        can_engage_at_nydus: bool = (
+            bool(nydus_queens) and decisions[-1] == SquadEngagement.ENGAGE
+        )
+        return close_enemies, engagements, can_engage_at_nydus
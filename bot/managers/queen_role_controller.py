@@ -1,18 +1,21 @@
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from ares.cache import property_cache_once_per_frame
-from ares.consts import DEBUG, UnitRole
-from cython_extensions.units_utils import cy_closest_to
+from ares.consts import UnitRole
+from cython_extensions.geometry import cy_distance_to
 from loguru import logger
 from sc2.data import Race
 from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.managers.base_distances import BaseDistances
+
 STEAL_FROM_ROLES: set[UnitRole] = {UnitRole.QUEEN_DEFENCE}
 
 
@@ -23,6 +26,10 @@ class QueenRoleController:
     aggressive: bool = False
     detected_rush: bool = False
 
+    def __post_init__(self) -> None:
+        # dead queens and dead townhalls both free up an inject pairing
+        self.ai.tag_registry.track(self, "inject_queen_to_th", by_value=True)
+
     @property_cache_once_per_frame
     def required_creep_spreaders(self) -> int:
         if (
@@ -121,6 +128,8 @@ class QueenRoleController:
         inject_queens: Units,
         offensive_queens: Units,
         aggressive: bool,
+        base_distances: "BaseDistances",
+        draw_debug: bool = False,
     ) -> None:
         """
         General rule here:
@@ -141,6 +150,9 @@ class QueenRoleController:
         inject_queens
         offensive_queens
         aggressive
+        base_distances
+            Ground distances between bases, for picking inject townhalls
+        draw_debug
 
         Returns
         -------
@@ -160,10 +172,10 @@ class QueenRoleController:
         #     return
 
         self._manage_creep_role(defensive_queens, creep_queens)
-        self._manage_inject_role(defensive_queens, inject_queens)
+        self._manage_inject_role(defensive_queens, inject_queens, base_distances)
         self._manage_nydus_role(defensive_queens)
 
-        if self.ai.config[DEBUG]:
+        if draw_debug:
             self._draw_debug_info()
 
     def assign_new_queen(self, queen: Unit) -> None:
@@ -194,7 +206,10 @@ class QueenRoleController:
                 self.ai.mediator.assign_role(tag=tag, role=UnitRole.QUEEN_DEFENCE)
 
     def _manage_inject_role(
-        self, defensive_queens: Units, inject_queens: Units
+        self,
+        defensive_queens: Units,
+        inject_queens: Units,
+        base_distances: "BaseDistances",
     ) -> None:
         # assign injectors
         num_required_injectors: int = self.required_injectors
@@ -209,8 +224,8 @@ class QueenRoleController:
                 if th.build_progress > 0.95 and th.tag not in self.inject_queen_to_th
             ]:
                 queen_target: Unit = defensive_queens[0]
-                th_target: Unit = cy_closest_to(
-                    queen_target.position, townhalls_without_queen
+                th_target: Unit = self._closest_by_ground(
+                    queen_target.position, townhalls_without_queen, base_distances
                 )
                 self.ai.mediator.assign_role(
                     tag=queen_target.tag, role=UnitRole.QUEEN_INJECT
@@ -226,6 +241,25 @@ class QueenRoleController:
                 if tag in self.inject_queen_to_th:
                     del self.inject_queen_to_th[tag]
 
+    @staticmethod
+    def _closest_by_ground(
+        position: Point2, townhalls: list[Unit], base_distances: "BaseDistances"
+    ) -> Unit:
+        """Townhall with the shortest ground path from the base near `position`."""
+        start: Point2 = Point2(
+            base_distances.points[base_distances.nearest_index(position)].tolist()
+        )
+
+        def ground_distance(townhall: Unit) -> float:
+            distance: Optional[float] = base_distances.distance(
+                start, townhall.position
+            )
+            if distance is None or distance == float("inf"):
+                return cy_distance_to(position, townhall.position)
+            return distance
+
+        return min(townhalls, key=ground_distance)
+
     def _manage_nydus_role(self, defensive_queens: Units) -> None:
         num_required_nydus_queens: int = self.required_nydus_queens
         if (
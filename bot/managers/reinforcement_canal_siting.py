@@ -0,0 +1,55 @@
+"""Pick reinforcement canal sites along the attack path in one pass.
+
+Path points are checked against every enemy and every nydus we own as
+NumPy arrays, instead of one range query and distance check per point.
+"""
+import numpy as np
+
+
+def _min_squared_distances(points: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Squared distance from each of `points` to its closest of `others`."""
+    if len(others) == 0:
+        return np.full(len(points), np.inf)
+    offsets: np.ndarray = points[:, None, :] - others[None, :, :]
+    return np.einsum("ijk,ijk->ij", offsets, offsets).min(axis=1)
+
+
+def select_reinforcement_sites(
+    path: np.ndarray,
+    enemy_positions: np.ndarray,
+    nydus_positions: np.ndarray,
+    enemy_radius: float,
+    nydus_spacing: float,
+    max_sites: int,
+) -> np.ndarray:
+    """Path points worth a placement check, in path order.
+
+    Parameters
+    ----------
+    path :
+        (n, 2) path points, starting at the attack target.
+    enemy_positions :
+        (e, 2) enemy positions, points with an enemy within `enemy_radius`
+        are skipped.
+    nydus_positions :
+        (k, 2) our nydus networks and canals, points within `nydus_spacing`
+        of one are skipped.
+    enemy_radius :
+        How far from enemies a site has to be.
+    nydus_spacing :
+        How far from our other nyduses a site has to be.
+    max_sites :
+        Return at most this many.
+
+    Returns
+    -------
+    np.ndarray :
+        Indices into `path`, closest to the attack target first.
+    """
+    if len(path) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    clear: np.ndarray = (
+        _min_squared_distances(path, enemy_positions) >= enemy_radius**2
+    ) & (_min_squared_distances(path, nydus_positions) >= nydus_spacing**2)
+    return np.flatnonzero(clear)[:max_sites]
@@ -4,7 +4,7 @@ import numpy as np
 from ares.behaviors.combat import CombatManeuver
 from ares.behaviors.combat.individual import KeepUnitSafe, PathUnitToTarget
 from ares.consts import UnitRole
-from cython_extensions import cy_closest_to, cy_distance_to, cy_towards
+from cython_extensions import cy_closest_to, cy_towards
 from cython_extensions.general_utils import cy_unit_pending
 from cython_extensions.units_utils import cy_find_units_center_mass
 from sc2.data import Race
@@ -15,12 +15,22 @@ from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
+from bot.managers.enemy_spatial_index import STRUCTURE
 from bot.managers.queen_bot_mediator import QueenBotMediator
 
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.managers.base_distances import BaseDistances
+    from bot.unit_control.maneuver_pool import ManeuverPool
+
 MELEE_TYPES: set[UnitID] = {UnitID.DRONE, UnitID.PROBE, UnitID.SCV, UnitID.ZERGLING}
+SCOUT_ATTACK_STRUCTURES: set[UnitID] = {
+    UnitID.BARRACKS,
+    UnitID.FACTORY,
+    UnitID.BUNKER,
+    UnitID.PYLON,
+}
 
 
 class ScoutManager:
@@ -43,6 +53,8 @@ class ScoutManager:
         self._sack_drone_scout: bool = False
         self._first_iteration: bool = True
 
+        self.ai.tag_registry.track(self, "creep_queen_dropperlord_tags")
+
     def update(self) -> None:
         if self._first_iteration:
             self.initial_ol_spot = self._calculate_first_ol_spot()
@@ -77,12 +89,19 @@ class ScoutManager:
                 )
             )
         ):
+            pool: ManeuverPool = self.ai.maneuver_pool
             for ol in overlords:
-                maneuver: CombatManeuver = CombatManeuver()
-                maneuver.add(KeepUnitSafe(ol, self.ai.mediator.get_air_grid))
+                maneuver: CombatManeuver = pool.maneuver(ol.tag)
+                maneuver.add(
+                    pool.get(ol.tag, KeepUnitSafe, ol, self.ai.mediator.get_air_grid)
+                )
                 maneuver.add(
-                    PathUnitToTarget(
-                        ol, self.ai.mediator.get_air_grid, self.initial_ol_spot
+                    pool.get(
+                        ol.tag,
+                        PathUnitToTarget,
+                        ol,
+                        self.ai.mediator.get_air_grid,
+                        self.initial_ol_spot,
                     )
                 )
                 self.ai.register_behavior(maneuver)
@@ -102,10 +121,13 @@ class ScoutManager:
                 self.ai.game_info.map_center, 35
             )
             if scout := self.ai.unit_tag_dict.get(self.worker_scout_tag, None):
-                enemy_structures: Units = self.ai.enemy_structures.filter(
-                    lambda s: s.type_id
-                    in {UnitID.BARRACKS, UnitID.FACTORY, UnitID.BUNKER, UnitID.PYLON}
-                    and cy_distance_to(scout.position, s.position) < 40
+                enemy_structures: Units = (
+                    self.queen_bot_mediator.get_enemy_spatial_index.query(
+                        scout.position,
+                        40.0,
+                        type_ids=SCOUT_ATTACK_STRUCTURES,
+                        include_flags=STRUCTURE,
+                    )
                 )
                 enemy_workers: Units = self.ai.enemy_units(UnitID.SCV)
                 if not self.issued_scout_command:
@@ -142,12 +164,16 @@ class ScoutManager:
         else:
             air_grid: np.ndarray = self.ai.mediator.get_air_grid
             avoid_grid: np.ndarray = self.ai.mediator.get_air_avoidance_grid
+            pool: ManeuverPool = self.ai.maneuver_pool
             for overseer in nydus_overseers:
-                spotter_maneuver: CombatManeuver = CombatManeuver()
-                spotter_maneuver.add(KeepUnitSafe(overseer, avoid_grid))
-                spotter_maneuver.add(KeepUnitSafe(overseer, air_grid))
+                tag: int = overseer.tag
+                spotter_maneuver: CombatManeuver = pool.maneuver(tag)
+                spotter_maneuver.add(pool.get(tag, KeepUnitSafe, overseer, avoid_grid))
+                spotter_maneuver.add(pool.get(tag, KeepUnitSafe, overseer, air_grid))
                 spotter_maneuver.add(
-                    PathUnitToTarget(
+                    pool.get(
+                        tag,
+                        PathUnitToTarget,
                         overseer,
                         air_grid,
                         self.queen_bot_mediator.get_current_canal_target,
@@ -176,10 +202,14 @@ class ScoutManager:
                 center, _ = cy_find_units_center_mass(force, 12.5)
                 position: Point2 = Point2(center)
                 grid: np.ndarray = self.ai.mediator.get_air_grid
+                pool: ManeuverPool = self.ai.maneuver_pool
                 for overseer in overseers:
-                    overseer_maneuver: CombatManeuver = CombatManeuver()
-                    overseer_maneuver.add(KeepUnitSafe(overseer, grid))
-                    overseer_maneuver.add(PathUnitToTarget(overseer, grid, position))
+                    tag: int = overseer.tag
+                    overseer_maneuver: CombatManeuver = pool.maneuver(tag)
+                    overseer_maneuver.add(pool.get(tag, KeepUnitSafe, overseer, grid))
+                    overseer_maneuver.add(
+                        pool.get(tag, PathUnitToTarget, overseer, grid, position)
+                    )
                     self.ai.register_behavior(overseer_maneuver)
 
     def _morph_dropperlord(self, overlords: Units) -> None:
@@ -228,14 +258,13 @@ class ScoutManager:
 
     def _calculate_first_ol_spot(self):
         if self.ai.enemy_race == Race.Zerg:
-            if path := self.ai.mediator.find_raw_path(
-                start=self.ai.mediator.get_enemy_nat,
-                target=self.ai.game_info.map_center,
-                grid=self.ai.mediator.get_ground_grid,
-                sensitivity=8,
-            ):
-                if len(path) >= 3:
-                    return path[2]
+            # on the way out of their natural towards ours
+            base_distances: BaseDistances = self.queen_bot_mediator.get_base_distances
+            path: Optional[np.ndarray] = base_distances.path(
+                self.ai.mediator.get_enemy_nat, self.ai.mediator.get_own_nat
+            )
+            if path is not None and len(path) > 16:
+                return Point2(path[16].tolist())
 
         return self.ai.mediator.get_closest_overlord_spot(
             from_pos=Point2(
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class _TrackedAttribute:
+    owner: Any
+    attribute: str
+    evict_on_type_change: bool
+    by_value: bool
+
+
+class TagRegistry:
+    """Evict tags from manager state when units die or change type.
+
+    Managers hand over the attributes holding tags (sets, lists, or dicts
+    keyed by tag) when they are created, `bot/main.py` forwards
+    `on_unit_destroyed` / `on_unit_type_changed` here. Attributes are looked
+    up by name on every eviction, so managers are free to reassign them.
+
+    Type changes only evict from state that opted in: a drone becoming an
+    extractor is no longer a worker, but a hatchery becoming a lair is still
+    the same townhall.
+    """
+
+    def __init__(self) -> None:
+        self._attributes: list[_TrackedAttribute] = []
+        self._callbacks: list[tuple[Callable[[int], None], bool]] = []
+
+    def track(
+        self,
+        owner: Any,
+        attribute: str,
+        evict_on_type_change: bool = False,
+        by_value: bool = False,
+    ) -> None:
+        """Evict tags from `owner.<attribute>` automatically.
+
+        Parameters
+        ----------
+        owner :
+            Object holding the state.
+        attribute :
+            Name of a set or list of tags, or a dict keyed by tag.
+        evict_on_type_change :
+            Also evict when the unit morphs into another type.
+        by_value :
+            For dicts, also remove entries whose value is the tag.
+        """
+        self._attributes.append(
+            _TrackedAttribute(owner, attribute, evict_on_type_change, by_value)
+        )
+
+    def subscribe(
+        self, evict: Callable[[int], None], evict_on_type_change: bool = False
+    ) -> None:
+        """For state that needs more than removing the tag, eg. a lookup."""
+        self._callbacks.append((evict, evict_on_type_change))
+
+    def on_unit_destroyed(self, tag: int) -> None:
+        self._evict(tag, type_changed=False)
+
+    def on_unit_type_changed(self, tag: int) -> None:
+        self._evict(tag, type_changed=True)
+
+    def tracked_sizes(self) -> dict[str, int]:
+        """Number of entries in each tracked attribute, for monitoring."""
+        return {
+            f"{type(tracked.owner).__name__}.{tracked.attribute}": len(
+                getattr(tracked.owner, tracked.attribute)
+            )
+            for tracked in self._attributes
+        }
+
+    def _evict(self, tag: int, type_changed: bool) -> None:
+        for tracked in self._attributes:
+            if type_changed and not tracked.evict_on_type_change:
+                continue
+            _remove_tag(
+                getattr(tracked.owner, tracked.attribute), tag, tracked.by_value
+            )
+
+        for evict, evict_on_type_change in self._callbacks:
+            if type_changed and not evict_on_type_change:
+                continue
+            evict(tag)
+
+
+def _remove_tag(state: Any, tag: int, by_value: bool) -> None:
+    if isinstance(state, set):
+        state.discard(tag)
+    elif isinstance(state, list):
+        while tag in state:
+            state.remove(tag)
+    elif isinstance(state, dict):
+        state.pop(tag, None)
+        if by_value:
+            for key in [k for k, v in state.items() if v == tag]:
+                del state[key]
@@ -0,0 +1,198 @@
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import numpy as np
+from ares.consts import UnitRole
+from loguru import logger
+from sc2.data import Result
+
+from bot.consts import CAPACITY, DIRECTORY, ENABLED, TELEMETRY, RequestType
+from bot.managers.queen_bot_mediator import QueenBotMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+    from bot.managers.engagement_estimator import EngagementEstimator
+
+# one row per step, every column is saved separately at the end of the game
+TELEMETRY_DTYPE: np.dtype = np.dtype(
+    [
+        ("game_loop", np.uint32),
+        ("game_step", np.uint8),
+        # milliseconds
+        ("step_time", np.float32),
+        ("average_step_time", np.float32),
+        ("degradation_level", np.uint8),
+        ("queens_creep", np.uint16),
+        ("queens_defence", np.uint16),
+        ("queens_inject", np.uint16),
+        ("queens_nydus", np.uint16),
+        ("queens_offensive", np.uint16),
+        ("creep_coverage", np.float32),
+        ("should_be_aggressive", np.bool_),
+        ("enemy_rushed", np.bool_),
+        ("actions", np.uint16),
+        # running totals, hit rate is 1 - builds / requests
+        ("spatial_index_requests", np.uint32),
+        ("spatial_index_builds", np.uint32),
+        ("spotter_updates", np.uint32),
+        # entries in manager state tracked by `TagRegistry`
+        ("tracked_tags", np.uint32),
+        # running total, and the share of transfuse healing that wasn't overheal
+        ("transfuses", np.uint32),
+        ("transfuse_efficiency", np.float32),
+        # running totals of fights answered by the Lanchester estimate and by
+        # the combat sim, and how often sampled estimates matched the sim
+        ("engagement_estimates", np.uint32),
+        ("engagement_simulations", np.uint32),
+        ("engagement_agreement", np.float32),
+    ]
+)
+QUEEN_ROLE_COLUMNS: tuple[tuple[str, UnitRole], ...] = (
+    ("queens_creep", UnitRole.QUEEN_CREEP),
+    ("queens_defence", UnitRole.QUEEN_DEFENCE),
+    ("queens_inject", UnitRole.QUEEN_INJECT),
+    ("queens_nydus", UnitRole.QUEEN_NYDUS),
+    ("queens_offensive", UnitRole.QUEEN_OFFENSIVE),
+)
+
+
+class TelemetryManager:
+    """Record per step metrics so many ladder games can be analysed offline.
+
+    Rows are written into a preallocated NumPy structured array. When it
+    fills up it is copied out in one go and writing starts from the top
+    again, so nothing is allocated per step. `flush` saves every column as
+    a compressed array in an `.npz` file when the game ends.
+    """
+
+    queen_bot_mediator: QueenBotMediator
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+
+        settings: dict = self.ai.config[TELEMETRY]
+        self.enabled: bool = settings[ENABLED]
+        self._buffer: np.ndarray = np.zeros(
+            settings[CAPACITY] if self.enabled else 0, dtype=TELEMETRY_DTYPE
+        )
+        # views into `_buffer`, so writing a value doesn't create a new array
+        self._columns: dict[str, np.ndarray] = {
+            name: self._buffer[name] for name in TELEMETRY_DTYPE.names
+        }
+        self._index: int = 0
+        self._full_buffers: list[np.ndarray] = []
+
+        self.queen_bot_requests_dict: dict[RequestType, Callable] = {}
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.queen_bot_requests_dict[request](kwargs)
+
+    def record(self, step_time: float, spotter_updates: int) -> None:
+        """Called at the end of every `on_step` from `bot/main.py`
+
+        Parameters
+        ----------
+        step_time :
+            How long the step took in milliseconds.
+        spotter_updates :
+            Times overlord creep spotter positions were recalculated so far.
+        """
+        if not self.enabled:
+            return
+
+        i: int = self._index
+        columns: dict[str, np.ndarray] = self._columns
+        mediator: QueenBotMediator = self.queen_bot_mediator
+        columns["game_loop"][i] = self.ai.state.game_loop
+        columns["game_step"][i] = self.ai.client.game_step
+        columns["step_time"][i] = step_time
+        columns["average_step_time"][i] = mediator.get_average_step_time
+        columns["degradation_level"][i] = mediator.get_degradation_level
+        for column, role in QUEEN_ROLE_COLUMNS:
+            columns[column][i] = len(self.ai.mediator.get_units_from_role(role=role))
+        columns["creep_coverage"][i] = self.ai.mediator.get_creep_coverage
+        columns["should_be_aggressive"][i] = mediator.get_should_be_aggressive
+        columns["enemy_rushed"][i] = self.ai.mediator.get_did_enemy_rush
+        columns["actions"][i] = len(self.ai.actions)
+        (
+            columns["spatial_index_requests"][i],
+            columns["spatial_index_builds"][i],
+        ) = mediator.get_enemy_spatial_index_stats
+        columns["spotter_updates"][i] = spotter_updates
+        columns["tracked_tags"][i] = sum(self.ai.tag_registry.tracked_sizes().values())
+        (
+            columns["transfuses"][i],
+            columns["transfuse_efficiency"][i],
+        ) = mediator.get_transfuse_stats
+        estimator: "EngagementEstimator" = mediator.get_engagement_estimator
+        columns["engagement_estimates"][i] = estimator.estimates
+        columns["engagement_simulations"][i] = estimator.simulations
+        columns["engagement_agreement"][i] = estimator.agreement
+
+        self._index += 1
+        if self._index == len(self._buffer):
+            self._full_buffers.append(self._buffer.copy())
+            self._index = 0
+
+    def flush(self, game_result: Result) -> Optional[str]:
+        """Save everything recorded this game, called from `on_end`.
+
+        Parameters
+        ----------
+        game_result :
+            Stored alongside the metrics so games can be grouped by result.
+
+        Returns
+        -------
+        Optional[str] :
+            Path of the saved file, None if telemetry is disabled.
+        """
+        if not self.enabled:
+            return None
+
+        rows: np.ndarray = np.concatenate(
+            self._full_buffers + [self._buffer[: self._index]]
+        )
+        directory: str = self.ai.config[TELEMETRY][DIRECTORY]
+        os.makedirs(directory, exist_ok=True)
+        opponent_id: str = getattr(self.ai, "opponent_id", None) or "unknown"
+        file_path: str = os.path.join(
+            directory, f"{opponent_id}_{int(time.time())}.npz"
+        )
+        np.savez_compressed(
+            file_path,
+            map_name=np.array(self.ai.game_info.map_name),
+            enemy_race=np.array(self.ai.enemy_race.name),
+            result=np.array(getattr(game_result, "name", str(game_result))),
+            **{name: rows[name] for name in TELEMETRY_DTYPE.names},
+        )
+        logger.info(f"{self.ai.time_formatted} - Saved telemetry to {file_path}")
+        return file_path
@@ -0,0 +1,80 @@
+"""Decide which queen transfuses which unit, for a whole squad at once.
+
+Every queen used to scan the squad for a transfuse target on its own, so
+two queens often healed the same unit in the same frame. Here health
+deficits and queen to target distances are computed once as arrays and
+each target gets at most one queen.
+"""
+import numpy as np
+
+TRANSFUSE_ENERGY: float = 50.0
+TRANSFUSE_RANGE: float = 7.0
+# 75 instantly and 50 over the next 7 seconds
+TRANSFUSE_HEAL: float = 125.0
+
+
+def allocate_transfusions(
+    queen_positions: np.ndarray,
+    queen_radii: np.ndarray,
+    queen_can_cast: np.ndarray,
+    queen_target_index: np.ndarray,
+    target_positions: np.ndarray,
+    target_radii: np.ndarray,
+    target_deficit: np.ndarray,
+    target_eligible: np.ndarray,
+) -> np.ndarray:
+    """Assign transfuse targets, most damaged target first.
+
+    Each target goes to the closest queen in range that can still cast, and
+    that queen's energy is then reserved for it, so she isn't given another.
+
+    Parameters
+    ----------
+    queen_positions :
+        (n, 2) positions of the queens.
+    queen_radii :
+        (n,) queen radii, cast range is measured edge to edge.
+    queen_can_cast :
+        (n,) queens with the energy and no cooldown to transfuse now.
+    queen_target_index :
+        (n,) index of each queen in the targets, -1 if she isn't one, so a
+        queen never picks herself.
+    target_positions :
+        (m, 2) positions of the units that could be transfused.
+    target_radii :
+        (m,) target radii.
+    target_deficit :
+        (m,) missing health of each target.
+    target_eligible :
+        (m,) targets worth a transfuse (damaged enough, not already healing).
+
+    Returns
+    -------
+    np.ndarray :
+        (n,) target index for each queen, -1 for queens that shouldn't cast.
+    """
+    assigned: np.ndarray = np.full(len(queen_positions), -1, dtype=np.intp)
+    if not queen_can_cast.any() or not target_eligible.any():
+        return assigned
+
+    offsets: np.ndarray = queen_positions[:, None, :] - target_positions[None, :, :]
+    distances: np.ndarray = np.einsum("ijk,ijk->ij", offsets, offsets)
+    cast_range: np.ndarray = (
+        TRANSFUSE_RANGE + queen_radii[:, None] + target_radii[None, :]
+    ) ** 2
+    # (n, m) queen can reach target, no self casts
+    candidates: np.ndarray = (distances < cast_range) & queen_can_cast[:, None]
+    is_self: np.ndarray = queen_target_index >= 0
+    candidates[np.flatnonzero(is_self), queen_target_index[is_self]] = False
+    distances = np.where(candidates, distances, np.inf)
+
+    for target_idx in np.argsort(-target_deficit, kind="stable").tolist():
+        if not target_eligible[target_idx]:
+            continue
+        queen_idx: int = int(np.argmin(distances[:, target_idx]))
+        if not np.isfinite(distances[queen_idx, target_idx]):
+            continue
+        assigned[queen_idx] = target_idx
+        # energy reserved, this queen is done for the frame
+        distances[queen_idx, :] = np.inf
+    return assigned
@@ -0,0 +1,129 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.buff_id import BuffId
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import HEALTH_THRESHOLD, MIN_DEFICIT, TRANSFUSE
+from bot.managers.transfuse_allocation import (
+    TRANSFUSE_ENERGY,
+    TRANSFUSE_HEAL,
+    allocate_transfusions,
+)
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class TransfuseAllocator:
+    """Give each injured unit in a queen squad at most one transfuse.
+
+    Owned by `QueenManager` and passed to the queen controllers, which ask
+    for the squad's transfuse targets once per frame instead of every queen
+    using `UseTransfuse` on the whole squad. Units claimed by one squad this
+    frame are left out for the next.
+    """
+
+    ai: "AresBot"
+    # running totals for telemetry, a cast counts once its energy is spent
+    # or its target has the buff, an order alone may never land
+    casts: int = 0
+    heal_used: float = 0.0
+    _game_loop: int = -1
+    _claimed: set[int] = field(default_factory=set)
+    # queen tag -> (target tag, queen energy, target health deficit) when
+    # the queen was last given a target
+    _pending: dict[int, tuple[int, float, float]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.ai.tag_registry.track(self, "_pending")
+
+    @property
+    def efficiency(self) -> float:
+        """Share of the healing from our transfuses that wasn't overheal."""
+        return self.heal_used / (self.casts * TRANSFUSE_HEAL) if self.casts else 1.0
+
+    def assign(self, squad: Union[list[Unit], Units]) -> dict[int, Unit]:
+        """Transfuse target for each queen in `squad` that should cast.
+
+        Queens already casting keep their target, so the controller doesn't
+        cancel the cast with another order.
+        """
+        if self.ai.state.game_loop != self._game_loop:
+            self._game_loop = self.ai.state.game_loop
+            self._claimed.clear()
+
+        self._count_casts(squad)
+        assignments: dict[int, Unit] = {}
+        for queen in squad:
+            if queen.is_using_ability(AbilityId.TRANSFUSION_TRANSFUSION) and (
+                target := self.ai.unit_tag_dict.get(queen.order_target, None)
+            ):
+                assignments[queen.tag] = target
+                self._claimed.add(target.tag)
+
+        queens: list[Unit] = [q for q in squad if q.tag not in assignments]
+        if not queens:
+            return assignments
+
+        settings: dict = self.ai.config[TRANSFUSE]
+        targets: list[Unit] = list(squad)
+        target_index: dict[int, int] = {t.tag: i for i, t in enumerate(targets)}
+        deficit: np.ndarray = np.array([t.health_max - t.health for t in targets])
+        eligible: np.ndarray = np.array(
+            [
+                t.health_percentage < settings[HEALTH_THRESHOLD]
+                and t.tag not in self._claimed
+                and not t.has_buff(BuffId.TRANSFUSION)
+                for t in targets
+            ]
+        ) & (deficit >= settings[MIN_DEFICIT])
+
+        allocated: np.ndarray = allocate_transfusions(
+            np.array([q.position for q in queens]),
+            np.array([q.radius for q in queens]),
+            np.array(
+                [AbilityId.TRANSFUSION_TRANSFUSION in q.abilities for q in queens]
+            ),
+            np.array([target_index.get(q.tag, -1) for q in queens]),
+            np.array([t.position for t in targets]),
+            np.array([t.radius for t in targets]),
+            deficit,
+            eligible,
+        )
+        for queen, target_idx in zip(queens, allocated.tolist()):
+            if target_idx < 0:
+                continue
+            target: Unit = targets[target_idx]
+            assignments[queen.tag] = target
+            self._claimed.add(target.tag)
+        for queen in squad:
+            if target := assignments.get(queen.tag, None):
+                self._pending[queen.tag] = (
+                    target.tag,
+                    queen.energy,
+                    target.health_max - target.health,
+                )
+        return assignments
+
+    def _count_casts(self, squad: Union[list[Unit], Units]) -> None:
+        """Count transfuses that landed since the squad's last assignment.
+
+        A cast in range can finish between two steps without the queen ever
+        being seen with the order, so look at what it leaves behind instead.
+        """
+        for queen in squad:
+            if not (pending := self._pending.pop(queen.tag, None)):
+                continue
+            target_tag, energy, deficit = pending
+            target: Optional[Unit] = self.ai.unit_tag_dict.get(target_tag, None)
+            # less the little energy regenerated since
+            if energy - queen.energy >= TRANSFUSE_ENERGY - 1.0 or (
+                target and target.has_buff(BuffId.TRANSFUSION)
+            ):
+                self.casts += 1
+                self.heal_used += min(deficit, TRANSFUSE_HEAL)
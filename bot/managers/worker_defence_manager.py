@@ -1,30 +1,54 @@
-from typing import TYPE_CHECKING, List, Optional, Set
+from typing import TYPE_CHECKING, List, Set
 
+import numpy as np
 from ares.consts import UnitRole
-from cython_extensions import (
-    cy_attack_ready,
-    cy_closest_to,
-    cy_distance_to,
-    cy_distance_to_squared,
-    cy_in_attack_range,
-    cy_pick_enemy_target,
-)
+from cython_extensions import cy_closest_to
 from sc2.data import Race
 from sc2.ids.ability_id import AbilityId
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.unit import Unit
 from sc2.units import Units
 
-from bot.consts import PROXY_STATIC_DEFENCE
+from bot.consts import (
+    ACTIVE_DURATION,
+    CLOSE_WAKE_RADIUS,
+    EARLY_GAME_WINDOW,
+    PROXY_STATIC_DEFENCE,
+    WAKE_RADIUS,
+    WORKER_DEFENCE,
+)
+from bot.managers.enemy_spatial_index import STRUCTURE, EnemySpatialIndex
 from bot.managers.queen_bot_mediator import QueenBotMediator
+from bot.managers.worker_rush_micro import (
+    GAME_LOOPS_PER_SECOND,
+    NO_TARGET,
+    WorkerRushMicroResult,
+    solve_worker_rush_micro,
+)
 
 if TYPE_CHECKING:
     from ares import AresBot
 
 MELEE_TYPES: set[UnitID] = {UnitID.DRONE, UnitID.PROBE, UnitID.SCV, UnitID.ZERGLING}
+PROXY_TYPES: set[UnitID] = PROXY_STATIC_DEFENCE | {UnitID.MARINE}
+# enemy types that can wake this manager up
+THREAT_TYPES: set[UnitID] = MELEE_TYPES | PROXY_TYPES
+# proxy static defence and marines this close to the main are always handled
+PROXY_RADIUS: float = 60.0
 
 
 class WorkerDefenceManager:
+    """Pull drones against worker rushes and proxies.
+
+    Every step one spatial index query looks for threat types near our bases
+    (see `_threats_near_bases`), the rest of the manager sleeps until one is
+    found and stays awake for `WorkerDefence.ActiveDuration` seconds after
+    the last one was seen. During the first `WorkerDefence.EarlyGameWindow` seconds anything within
+    `WakeRadius` of our main wakes it, afterwards only threats within
+    `CloseWakeRadius` of the main or natural do. Proxy static defence and
+    marines within `PROXY_RADIUS` of the main always wake it.
+    """
+
     queen_bot_mediator: QueenBotMediator
 
     def __init__(
@@ -38,26 +62,86 @@ class WorkerDefenceManager:
         self.enemy_committed_worker_rush: bool = False
 
         self.cancelled_structures: bool = False
+        self._active_until: float = 0.0
+
+        # the registry evicts dead drones, drones morphing into a structure
+        # leave `self.ai.workers` without a type change event, see `update`
+        self.ai.tag_registry.track(self, "bunker_drone_tags")
+        self.ai.tag_registry.track(self, "worker_defence_tags")
+
+    @property
+    def is_active(self) -> bool:
+        return (
+            self.ai.time < self._active_until
+            or len(self.worker_defence_tags) > 0
+            or len(self.bunker_drone_tags) > 0
+        )
 
     def update(self) -> None:
+        if self.bunker_drone_tags or self.worker_defence_tags:
+            worker_tags: set[int] = self.ai.workers.tags
+            self.bunker_drone_tags &= worker_tags
+            self.worker_defence_tags = [
+                tag for tag in self.worker_defence_tags if tag in worker_tags
+            ]
+
+        # threats can be spotted far away and walk in while still in vision,
+        # so look every step rather than when they enter vision
+        if self._threats_near_bases():
+            self._wake()
+        if not self.is_active:
+            return
+
         self._handle_worker_rush()
         self._handle_proxy_rush()
 
+    def _wake(self) -> None:
+        self._active_until = (
+            self.ai.time + self.ai.config[WORKER_DEFENCE][ACTIVE_DURATION]
+        )
+
+    def _threats_near_bases(self) -> bool:
+        settings: dict = self.ai.config[WORKER_DEFENCE]
+        main_radius: float = (
+            settings[WAKE_RADIUS]
+            if self.ai.time < settings[EARLY_GAME_WINDOW]
+            else settings[CLOSE_WAKE_RADIUS]
+        )
+        enemy_index: EnemySpatialIndex = self.queen_bot_mediator.get_enemy_spatial_index
+        return bool(
+            enemy_index.query(
+                [self.ai.start_location, self.ai.mediator.get_own_nat],
+                [main_radius, settings[CLOSE_WAKE_RADIUS]],
+                type_ids=THREAT_TYPES,
+            )
+        ) or bool(
+            enemy_index.query(
+                self.ai.start_location, PROXY_RADIUS, type_ids=PROXY_TYPES
+            )
+        )
+
     def assign_drone_back_to_gathering(self, drone_tag: int) -> None:
         self.ai.mediator.assign_role(tag=drone_tag, role=UnitRole.GATHERING)
 
     def _handle_proxy_rush(self) -> None:
-        bunkers: Units = self.ai.enemy_structures.filter(
-            lambda s: s.type_id in PROXY_STATIC_DEFENCE
-            and cy_distance_to(s.position, self.ai.start_location) < 60.0
+        enemy_index: EnemySpatialIndex = self.queen_bot_mediator.get_enemy_spatial_index
+        bunkers: Units = enemy_index.query(
+            self.ai.start_location,
+            PROXY_RADIUS,
+            type_ids=PROXY_STATIC_DEFENCE,
+            include_flags=STRUCTURE,
         )
-        marines: Units = self.ai.enemy_units.filter(
-            lambda s: s.type_id == UnitID.MARINE
-            and cy_distance_to(s.position, self.ai.start_location) < 60.0
+        marines: Units = enemy_index.query(
+            self.ai.start_location,
+            PROXY_RADIUS,
+            type_ids={UnitID.MARINE},
+            exclude_flags=STRUCTURE,
         )
-        scvs: Units = self.ai.enemy_units.filter(
-            lambda s: s.type_id == UnitID.SCV
-            and cy_distance_to(s.position, self.ai.start_location) < 60.0
+        scvs: Units = enemy_index.query(
+            self.ai.start_location,
+            PROXY_RADIUS,
+            type_ids={UnitID.SCV},
+            exclude_flags=STRUCTURE,
         )
 
         if bunkers and len(self.bunker_drone_tags) < 9:
@@ -94,26 +178,17 @@ class WorkerDefenceManager:
 
     def _handle_worker_rush(self) -> None:
         """zerglings too !"""
-
-        def stack_detected(_enemy_workers: Units) -> bool:
-            if (
-                not _enemy_workers
-                or _enemy_workers.amount <= 5
-                or cy_distance_to_squared(_enemy_workers.center, self.ai.start_location)
-                > 122
-            ):
-                return False
-            return _enemy_workers.closer_than(0.5, _enemy_workers.center).amount > 5
-
-        enemy_workers: Units = self.ai.enemy_units.filter(
-            lambda u: u.type_id in MELEE_TYPES
-            and (
-                cy_distance_to(u.position, self.ai.start_location) < 25.0
-                or cy_distance_to(u.position, self.ai.mediator.get_own_nat) < 4.0
-            )
+        enemy_index: EnemySpatialIndex = self.queen_bot_mediator.get_enemy_spatial_index
+        enemy_workers: Units = enemy_index.query(
+            [self.ai.start_location, self.ai.mediator.get_own_nat],
+            [25.0, 4.0],
+            type_ids=MELEE_TYPES,
+            exclude_flags=STRUCTURE,
         )
 
-        all_enemy_workers: Units = self.ai.enemy_units(MELEE_TYPES)
+        all_enemy_workers: Units = enemy_index.query_types(
+            type_ids=MELEE_TYPES, exclude_flags=STRUCTURE
+        )
         enemy_lings: Units = enemy_workers(UnitID.ZERGLING)
 
         # this makes sure we go all in after defending
@@ -180,47 +255,17 @@ class WorkerDefenceManager:
                 self.ai.start_location
             )
             if defence_workers and all_enemy_workers:
+                fighting_workers: list[Unit] = []
                 for worker in defence_workers:
                     if worker.health_percentage < 0.3:
-                        worker.gather(
-                            cy_closest_to(self.ai.start_location, self.ai.mineral_field)
-                        )
-                        self.assign_drone_back_to_gathering(worker.tag)
-                        continue
-
-                    in_attack_range: list[Unit] = cy_in_attack_range(
-                        worker, all_enemy_workers
-                    )
-                    in_range_target: Optional[Unit] = None
-                    if in_attack_range:
-                        in_range_target = cy_pick_enemy_target(in_attack_range)
-                    closest_enemy: Unit = cy_closest_to(
-                        worker.position, all_enemy_workers
-                    )
-                    enemy_near_mineral = cy_closest_to(
-                        close_mineral_patch.position, all_enemy_workers
-                    )
-                    if (
-                        all_enemy_workers
-                        and enemy_near_mineral
-                        and cy_distance_to(
-                            enemy_near_mineral.position,
-                            close_mineral_patch.position,
-                        )
-                        < 2
-                        and stack_detected(all_enemy_workers)
-                    ):
                         worker.gather(close_mineral_patch)
-                    # in attack range of enemy, prioritise attacking
-                    elif in_range_target and cy_attack_ready(
-                        self.ai, worker, in_range_target
-                    ):
-                        worker.attack(in_range_target)
-                    # attack the workers
-                    elif cy_attack_ready(self.ai, worker, closest_enemy):
-                        worker.attack(closest_enemy)
+                        self.assign_drone_back_to_gathering(worker.tag)
                     else:
-                        worker.gather(close_mineral_patch)
+                        fighting_workers.append(worker)
+                if fighting_workers:
+                    self._micro_defence_workers(
+                        fighting_workers, all_enemy_workers, close_mineral_patch
+                    )
             # enemy worker rushed but they have no workers now, go for the kill
             elif (
                 self.enemy_committed_worker_rush
@@ -241,3 +286,31 @@ class WorkerDefenceManager:
             for tag in self.worker_defence_tags:
                 self.assign_drone_back_to_gathering(tag)
             self.worker_defence_tags = []
+
+    def _micro_defence_workers(
+        self,
+        workers: list[Unit],
+        enemy_workers: Units,
+        close_mineral_patch: Unit,
+    ) -> None:
+        """Solve every defending drone in one batch, see `worker_rush_micro.py`"""
+        enemies: list[Unit] = list(enemy_workers)
+        result: WorkerRushMicroResult = solve_worker_rush_micro(
+            drone_positions=np.array([w.position for w in workers], dtype=float),
+            drone_cooldowns=np.array([w.weapon_cooldown for w in workers], dtype=float),
+            drone_reach=np.array(
+                [w.ground_range + w.radius for w in workers], dtype=float
+            ),
+            enemy_positions=np.array([e.position for e in enemies], dtype=float),
+            enemy_radii=np.array([e.radius for e in enemies], dtype=float),
+            enemy_health=np.array([e.health + e.shield for e in enemies], dtype=float),
+            enemy_armor=np.array([e.armor for e in enemies], dtype=float),
+            mineral_position=np.array(close_mineral_patch.position, dtype=float),
+            start_location=np.array(self.ai.start_location, dtype=float),
+            step_time=self.ai.client.game_step / GAME_LOOPS_PER_SECOND,
+        )
+        for worker, target_idx in zip(workers, result.targets.tolist()):
+            if target_idx == NO_TARGET:
+                worker.gather(close_mineral_patch)
+            else:
+                worker.attack(enemies[target_idx])
@@ -0,0 +1,161 @@
+"""Batch micro for drones defending a worker rush.
+
+Works on plain NumPy arrays so all defending drones are solved in one pass:
+the drone / enemy distance matrix is computed once, targets are allocated to
+avoid overkill (lowest effective health first, closest drones first), and
+mineral walk stacking is detected once rather than per drone.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# `weapon_cooldown` is reported in game loops
+GAME_LOOPS_PER_SECOND: float = 22.4
+# marks a drone that should mineral walk instead of attacking
+NO_TARGET: int = -1
+
+
+@dataclass
+class WorkerRushMicroResult:
+    """Output of `solve_worker_rush_micro`.
+
+    Parameters
+    ----------
+    targets : np.ndarray
+        Enemy index each drone should attack, `NO_TARGET` to mineral walk.
+    stack_detected : bool
+        Enemy workers are stacked on our mineral line, everyone mineral walks.
+    """
+
+    targets: np.ndarray
+    stack_detected: bool
+
+
+def detect_mineral_stack(
+    enemy_positions: np.ndarray,
+    mineral_position: np.ndarray,
+    start_location: np.ndarray,
+) -> bool:
+    """Enemy workers bunched up on our close mineral patch.
+
+    More than 5 enemies, centred within ~11 of our main, with more than 5 of
+    them within 0.5 of that centre and one of them within 2 of the patch.
+    """
+    if len(enemy_positions) <= 5:
+        return False
+
+    center: np.ndarray = enemy_positions.mean(axis=0)
+    if np.sum((center - start_location) ** 2) > 122.0:
+        return False
+
+    to_mineral: np.ndarray = enemy_positions - mineral_position
+    if np.min(np.einsum("ij,ij->i", to_mineral, to_mineral)) >= 4.0:
+        return False
+
+    to_center: np.ndarray = enemy_positions - center
+    return int(np.sum(np.einsum("ij,ij->i", to_center, to_center) < 0.25)) > 5
+
+
+def solve_worker_rush_micro(
+    drone_positions: np.ndarray,
+    drone_cooldowns: np.ndarray,
+    drone_reach: np.ndarray,
+    enemy_positions: np.ndarray,
+    enemy_radii: np.ndarray,
+    enemy_health: np.ndarray,
+    enemy_armor: np.ndarray,
+    mineral_position: np.ndarray,
+    start_location: np.ndarray,
+    drone_damage: float = 5.0,
+    drone_speed: float = 3.94,
+    step_time: float = 2 / GAME_LOOPS_PER_SECOND,
+) -> WorkerRushMicroResult:
+    """Pick a target (or mineral walk) for every defending drone.
+
+    Parameters
+    ----------
+    drone_positions :
+        (n, 2) positions of our defending drones.
+    drone_cooldowns :
+        (n,) `weapon_cooldown` of each drone, in game loops.
+    drone_reach :
+        (n,) ground range plus radius of each drone.
+    enemy_positions :
+        (m, 2) positions of the enemy workers / zerglings.
+    enemy_radii :
+        (m,) radius of each enemy.
+    enemy_health :
+        (m,) health plus shield of each enemy.
+    enemy_armor :
+        (m,) armor of each enemy.
+    mineral_position :
+        Mineral patch closest to our main, used for mineral walking.
+    start_location :
+        Our main base location.
+    drone_damage :
+        Damage per drone attack before armor.
+    drone_speed :
+        Drone movement speed, used to see if a drone's weapon will be ready by
+        the time it reaches its target.
+    step_time :
+        Seconds between our steps.
+
+    Returns
+    -------
+    WorkerRushMicroResult :
+        Target index per drone and whether enemy workers are stacked.
+    """
+    num_drones: int = len(drone_positions)
+    num_enemies: int = len(enemy_positions)
+    targets: np.ndarray = np.full(num_drones, NO_TARGET, dtype=np.int32)
+    if num_drones == 0 or num_enemies == 0:
+        return WorkerRushMicroResult(targets, False)
+
+    if detect_mineral_stack(enemy_positions, mineral_position, start_location):
+        return WorkerRushMicroResult(targets, True)
+
+    offsets: np.ndarray = drone_positions[:, None, :] - enemy_positions[None, :, :]
+    distances: np.ndarray = np.sqrt(np.einsum("ijk,ijk->ij", offsets, offsets))
+    gap: np.ndarray = np.maximum(
+        distances - drone_reach[:, None] - enemy_radii[None, :], 0.0
+    )
+    in_range: np.ndarray = gap <= 0.0
+    # weapon will be off cooldown by the time we are in range
+    ready: np.ndarray = (drone_cooldowns / GAME_LOOPS_PER_SECOND)[:, None] <= (
+        step_time + gap / drone_speed
+    )
+
+    damage: np.ndarray = np.maximum(drone_damage - enemy_armor, 0.5)
+    hits_to_kill: np.ndarray = np.ceil(enemy_health / damage).astype(np.int32)
+    assigned_hits: np.ndarray = np.zeros(num_enemies, dtype=np.int32)
+    free: np.ndarray = np.ones(num_drones, dtype=bool)
+
+    # focus fire: weakest enemies first, closest ready drones in range first
+    attackable: np.ndarray = in_range & ready
+    contested: np.ndarray = np.flatnonzero(attackable.any(axis=0))
+    for enemy_idx in contested[
+        np.argsort(enemy_health[contested], kind="stable")
+    ].tolist():
+        candidates: np.ndarray = np.flatnonzero(free & attackable[:, enemy_idx])
+        if candidates.size == 0:
+            continue
+        needed: int = int(hits_to_kill[enemy_idx])
+        chosen: np.ndarray = candidates[
+            np.argsort(distances[candidates, enemy_idx], kind="stable")[:needed]
+        ]
+        targets[chosen] = enemy_idx
+        assigned_hits[enemy_idx] += chosen.size
+        free[chosen] = False
+
+    # everyone else chases the closest enemy that isn't already covered
+    if free.any():
+        covered: np.ndarray = assigned_hits >= hits_to_kill
+        cost: np.ndarray = distances[free] + np.where(
+            covered & ~covered.all(), 1000.0, 0.0
+        )
+        closest: np.ndarray = np.argmin(cost, axis=1)
+        free_idx: np.ndarray = np.flatnonzero(free)
+        can_attack: np.ndarray = ready[free_idx, closest]
+        targets[free_idx[can_attack]] = closest[can_attack]
+
+    return WorkerRushMicroResult(targets, False)
@@ -0,0 +1,173 @@
+"""
+Pipelined version of `sc2.main._play_game` used by `ladder.py --Pipelined`.
+
+The stock loop runs strictly in sequence: send actions, wait for the reply,
+request the next observation, wait, request game info, wait, then run
+`on_step`. Here the action / observation / game info round trips run as one
+task, and while we wait on it the bot's queued background jobs (work that
+does not need the new game state, see `MyBot.queue_background_job`) run in
+between the I/O.
+"""
+import asyncio
+from contextlib import suppress
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from loguru import logger
+from s2clientprotocol import sc2api_pb2 as sc_pb
+from sc2.bot_ai import BotAI
+from sc2.client import Client
+from sc2.data import Result
+from sc2.game_state import GameState
+from sc2.player import AbstractPlayer
+from sc2.protocol import ProtocolError
+
+T = TypeVar("T")
+
+
+async def overlap_with_background_work(
+    io: Awaitable[T], next_job: Callable[[], Optional[Callable[[], None]]]
+) -> T:
+    """Await `io` while running background jobs one at a time.
+
+    Control is handed back to the event loop between jobs so the I/O task
+    can send its next request as soon as the previous reply lands.
+
+    Parameters
+    ----------
+    io :
+        The request(s) to wait on.
+    next_job :
+        Returns the next background job to run, or None when there is none.
+
+    Returns
+    -------
+    T :
+        Whatever `io` returns.
+    """
+    task: asyncio.Future = asyncio.ensure_future(io)
+    # let the request go out before we start on CPU work
+    await asyncio.sleep(0)
+    while not task.done() and (job := next_job()):
+        job()
+        await asyncio.sleep(0)
+    return await task
+
+
+async def play_game_pipelined(
+    player: AbstractPlayer,
+    client: Client,
+    realtime: bool,
+    portconfig,
+    game_time_limit: Optional[int] = None,
+) -> Result:
+    player_id: int = await client.join_game(
+        player.name, player.race, portconfig=portconfig
+    )
+    logger.info(f"Player {player_id} - {player.name if player.name else str(player)}")
+    result: Result = await _play_game_ai_pipelined(
+        client, player_id, player.ai, realtime, game_time_limit
+    )
+    logger.info(
+        f"Result for player {player_id} - {player.name if player.name else str(player)}: "
+        f"{result._name_ if isinstance(result, Result) else result}"
+    )
+    return result
+
+
+async def _play_game_ai_pipelined(
+    client: Client,
+    player_id: int,
+    ai: BotAI,
+    realtime: bool,
+    game_time_limit: Optional[int],
+) -> Result:
+    next_job: Callable[[], Optional[Callable[[], None]]] = getattr(
+        ai, "next_background_job", lambda: None
+    )
+
+    ai._initialize_variables()
+    game_data = await client.get_game_data()
+    game_info = await client.get_game_info()
+    ping_response = await client.ping()
+    ai._prepare_start(
+        client,
+        player_id,
+        game_info,
+        game_data,
+        realtime=realtime,
+        base_build=ping_response.ping.base_build,
+    )
+
+    state = await client.observation()
+    if client._game_result:
+        await ai.on_end(client._game_result[player_id])
+        return client._game_result[player_id]
+    gs: GameState = GameState(state.observation)
+    proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+    try:
+        ai._prepare_step(gs, proto_game_info)
+        await ai.on_before_start()
+        ai._prepare_first_step()
+        await ai.on_start()
+    except Exception as e:
+        logger.exception(f"Caught unknown exception in AI on_start: {e}")
+        logger.error("Resigning due to previous error")
+        await ai.on_end(Result.Defeat)
+        return Result.Defeat
+
+    async def finish_step_and_observe(_gs: GameState) -> tuple:
+        """Send this step's actions, then fetch the next state."""
+        await ai._after_step()
+        previous_observation = None
+        if realtime:
+            requested_step: int = _gs.game_loop + client.game_step
+            _state = await client.observation(requested_step)
+            # took too long, request another observation one frame after
+            if _state.observation.observation.game_loop > requested_step:
+                logger.debug("Skipped a step in realtime=True")
+                previous_observation = _state.observation
+                _state = await client.observation(
+                    _state.observation.observation.game_loop + 1
+                )
+        else:
+            if not client.in_game:
+                return None, None, None
+            await client.step()
+            _state = await client.observation()
+
+        if client._game_result:
+            return _state, previous_observation, None
+        _proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+        return _state, previous_observation, _proto_game_info
+
+    for iteration in range(10**10):
+        await ai.issue_events()
+        try:
+            await ai.on_step(iteration)
+        except Exception as e:
+            logger.exception(f"Caught unknown exception: {e}")
+            raise
+
+        # on a realtime protocol error carry on with the last observation
+        previous_state_observation = None
+        with suppress(ProtocolError):
+            (
+                state,
+                previous_state_observation,
+                proto_game_info,
+            ) = await overlap_with_background_work(
+                finish_step_and_observe(gs), next_job
+            )
+
+        # client left (resigned) or the game ended
+        if client._game_result or state is None:
+            await ai.on_end(client._game_result[player_id])
+            return client._game_result[player_id]
+
+        gs = GameState(state.observation, previous_state_observation)
+        if game_time_limit and gs.game_loop / 22.4 > game_time_limit:
+            await ai.on_end(Result.Tie)
+            return Result.Tie
+        ai._prepare_step(gs, proto_game_info)
+
+    return Result.Undecided
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import numpy as np
 from ares.behaviors.combat import CombatManeuver
@@ -11,7 +11,7 @@ from ares.behaviors.combat.individual import (
     UseAbility,
     UseTransfuse,
 )
-from ares.consts import ALL_STRUCTURES, VICTORY_MARGINAL_OR_BETTER, UnitTreeQueryType
+from ares.consts import ALL_STRUCTURES, UnitTreeQueryType
 from ares.managers.manager_mediator import ManagerMediator
 from cython_extensions import cy_closest_to
 from cython_extensions.geometry import cy_distance_to_squared
@@ -22,12 +22,18 @@ from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
-from bot.consts import COMMON_UNIT_IGNORE_TYPES
+from bot.consts import COMMON_UNIT_IGNORE_TYPES, SquadEngagement
 from bot.unit_control.base_control import BaseControl
 
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.managers.energy_planning import EnergyPlan
+    from bot.managers.level_of_detail_scheduler import LevelOfDetailScheduler
+    from bot.managers.nydus_transit_scheduler import NydusTransitScheduler
+    from bot.managers.transfuse_allocator import TransfuseAllocator
+    from bot.unit_control.maneuver_pool import ManeuverPool
+
 STATIC_DEFENCE: set[UnitID] = {
     UnitID.BUNKER,
     UnitID.PLANETARYFORTRESS,
@@ -60,18 +66,32 @@ class CombatQueens(BaseControl):
             return
         can_engage: bool = kwargs.get("can_engage", True)
         target: Point2 = kwargs.get("target", self.ai.enemy_start_locations[0])
-        check_close_combat_result = kwargs.get("check_close_combat_result", False)
         exit_nydus_max_influence = kwargs.get("exit_nydus_max_influence", 10.0)
         spread_creep: bool = kwargs.get("spread_creep", True)
+        squad_orders: bool = kwargs.get("squad_orders", False)
+        nydus_scheduler: Optional["NydusTransitScheduler"] = kwargs.get(
+            "nydus_scheduler", None
+        )
+        transfuse_allocator: Optional["TransfuseAllocator"] = kwargs.get(
+            "transfuse_allocator", None
+        )
+        energy_plan: Optional["EnergyPlan"] = kwargs.get("energy_plan", None)
+        lod_scheduler: Optional["LevelOfDetailScheduler"] = kwargs.get(
+            "lod_scheduler", None
+        )
+        # from `QueenManager._evaluate_squads`, None to fight whatever is close
+        engagement: Optional[SquadEngagement] = kwargs.get("engagement", None)
 
         ground_grid: np.ndarray = self.mediator.get_ground_grid
         avoid_grid: np.ndarray = self.mediator.get_ground_avoidance_grid
-        all_close_enemy: Units = self.mediator.get_units_in_range(
-            start_points=[Point2(cy_center(units))],
-            distances=[13.5],
-            query_tree=UnitTreeQueryType.AllEnemy,
-            return_as_dict=False,
-        )[0].filter(lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES)
+        all_close_enemy: Optional[Units] = kwargs.get("close_enemy", None)
+        if all_close_enemy is None:
+            all_close_enemy = self.mediator.get_units_in_range(
+                start_points=[Point2(cy_center(units))],
+                distances=[13.5],
+                query_tree=UnitTreeQueryType.AllEnemy,
+                return_as_dict=False,
+            )[0].filter(lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES)
         only_enemy_units: list[Unit] = [
             u for u in all_close_enemy if u.type_id not in ALL_STRUCTURES
         ]
@@ -83,15 +103,7 @@ class CombatQueens(BaseControl):
         ]
 
         # optional extra check
-        can_fight: bool = True
-        if check_close_combat_result:
-            can_fight = (
-                self.mediator.can_win_fight(
-                    own_units=units,
-                    enemy_units=only_enemy_units,
-                )
-                in VICTORY_MARGINAL_OR_BETTER
-            )
+        can_fight: bool = engagement != SquadEngagement.RETREAT
         point, exit_towards, nydus_tags = self.mediator.find_nydus_path_next_point(
             start=Point2(cy_center(units)),
             target=target,
@@ -105,36 +117,87 @@ class CombatQueens(BaseControl):
             weight_safety_limit=exit_nydus_max_influence,
         ):
             safe_nydus_exit = False
+        if nydus_tags and safe_nydus_exit and nydus_scheduler:
+            nydus_scheduler.plan_squad(units, nydus_tags[1])
 
+        if squad_orders:
+            self._issue_squad_orders(
+                units,
+                all_close_enemy,
+                can_engage and can_fight,
+                point,
+                exit_towards,
+                nydus_tags,
+                target,
+                safe_nydus_exit,
+                nydus_scheduler,
+            )
+            return
+
+        # one transfuse per injured unit across the squad
+        transfusions: Optional[dict[int, Unit]] = (
+            transfuse_allocator.assign(units) if transfuse_allocator else None
+        )
+        queens: list[Unit] = units
         placed_tumor: bool = False
-        for queen in units:
+        if lod_scheduler:
+            # queens away from the fight only get an order every few frames
+            queens, calm_queens = lod_scheduler.split(
+                units, ground_grid, transfusions or ()
+            )
+            placed_tumor = self._issue_calm_orders(
+                calm_queens,
+                spread_creep,
+                energy_plan,
+                ground_grid,
+                tumors,
+                point,
+                exit_towards,
+                nydus_tags,
+                target,
+                safe_nydus_exit,
+                nydus_scheduler,
+            )
+
+        pool: ManeuverPool = self.ai.maneuver_pool
+        for queen in queens:
             queen_pos: Point2 = queen.position
-            maneuver: CombatManeuver = CombatManeuver()
+            maneuver: CombatManeuver = pool.maneuver(queen.tag)
 
             if (
                 not placed_tumor
                 and spread_creep
-                and self.mediator.is_position_safe(grid=ground_grid, position=queen_pos)
-                and self.ai.has_creep(queen_pos)
-                and (
-                    len(tumors) == 0
-                    or not [
-                        t
-                        for t in tumors
-                        if cy_distance_to_squared(t.position, queen_pos) < 144.0
-                    ]
-                )
-                and not self.mediator.get_position_blocks_expansion(position=queen_pos)
+                and (not energy_plan or queen.tag in energy_plan.tumor_tags)
+                and self._can_place_tumor(queen_pos, ground_grid, tumors)
             ):
                 placed_tumor = True
                 maneuver.add(
-                    UseAbility(AbilityId.BUILD_CREEPTUMOR_QUEEN, queen, queen_pos)
+                    pool.get(
+                        queen.tag,
+                        UseAbility,
+                        AbilityId.BUILD_CREEPTUMOR_QUEEN,
+                        queen,
+                        queen_pos,
+                    )
+                )
+            maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, avoid_grid))
+            if transfusions is None:
+                maneuver.add(pool.get(queen.tag, UseTransfuse, queen, units))
+            elif transfuse_target := transfusions.get(queen.tag, None):
+                maneuver.add(
+                    pool.get(
+                        queen.tag,
+                        UseAbility,
+                        AbilityId.TRANSFUSION_TRANSFUSION,
+                        queen,
+                        transfuse_target,
+                    )
                 )
-            maneuver.add(KeepUnitSafe(queen, avoid_grid))
-            maneuver.add(UseTransfuse(queen, units))
-            maneuver.add(ShootTargetInRange(queen, flying))
-            maneuver.add(ShootTargetInRange(queen, ground))
-            maneuver.add(ShootTargetInRange(queen, all_close_enemy))
+            maneuver.add(pool.get(queen.tag, ShootTargetInRange, queen, flying))
+            maneuver.add(pool.get(queen.tag, ShootTargetInRange, queen, ground))
+            maneuver.add(
+                pool.get(queen.tag, ShootTargetInRange, queen, all_close_enemy)
+            )
 
             if all_close_enemy:
                 if can_engage and can_fight:
@@ -146,11 +209,17 @@ class CombatQueens(BaseControl):
                         closest_enemy.can_attack_ground
                         and closest_enemy.ground_range < 4
                     ):
-                        maneuver.add(StutterUnitBack(queen, closest_enemy))
+                        maneuver.add(
+                            pool.get(queen.tag, StutterUnitBack, queen, closest_enemy)
+                        )
                     else:
-                        maneuver.add(StutterUnitForward(queen, closest_enemy))
+                        maneuver.add(
+                            pool.get(
+                                queen.tag, StutterUnitForward, queen, closest_enemy
+                            )
+                        )
                 else:
-                    maneuver.add(KeepUnitSafe(queen, ground_grid))
+                    maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, ground_grid))
                     maneuver.add(
                         self._nydus_movement(
                             queen,
@@ -159,10 +228,11 @@ class CombatQueens(BaseControl):
                             nydus_tags,
                             target,
                             safe_nydus_exit,
+                            nydus_scheduler,
                         )
                     )
             else:
-                maneuver.add(KeepUnitSafe(queen, ground_grid))
+                maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, ground_grid))
                 if cy_distance_to_squared(queen_pos, target) > 36.0:
                     maneuver.add(
                         self._nydus_movement(
@@ -172,11 +242,110 @@ class CombatQueens(BaseControl):
                             nydus_tags,
                             target,
                             safe_nydus_exit,
+                            nydus_scheduler,
                         )
                     )
 
             self.ai.register_behavior(maneuver)
 
+    def _can_place_tumor(
+        self, queen_pos: Point2, ground_grid: np.ndarray, tumors: list[Unit]
+    ) -> bool:
+        return (
+            self.mediator.is_position_safe(grid=ground_grid, position=queen_pos)
+            and self.ai.has_creep(queen_pos)
+            and (
+                len(tumors) == 0
+                or not [
+                    t
+                    for t in tumors
+                    if cy_distance_to_squared(t.position, queen_pos) < 144.0
+                ]
+            )
+            and not self.mediator.get_position_blocks_expansion(position=queen_pos)
+        )
+
+    def _issue_calm_orders(
+        self,
+        queens: list[Unit],
+        spread_creep: bool,
+        energy_plan: Optional["EnergyPlan"],
+        ground_grid: np.ndarray,
+        tumors: list[Unit],
+        point: Point2,
+        exit_towards: Point2,
+        nydus_tags: list[int],
+        target: Point2,
+        safe_nydus_exit: bool,
+        nydus_scheduler: Optional["NydusTransitScheduler"],
+    ) -> bool:
+        """A tumor or a move for queens away from any fight.
+
+        See `LevelOfDetailScheduler`, returns True if a tumor was placed.
+        """
+        placed_tumor: bool = False
+        for queen in queens:
+            queen_pos: Point2 = queen.position
+            if (
+                not placed_tumor
+                and spread_creep
+                and (not energy_plan or queen.tag in energy_plan.tumor_tags)
+                and self._can_place_tumor(queen_pos, ground_grid, tumors)
+            ):
+                placed_tumor = True
+                queen(AbilityId.BUILD_CREEPTUMOR_QUEEN, queen_pos)
+            elif cy_distance_to_squared(queen_pos, target) > 36.0:
+                self.ai.register_behavior(
+                    self._nydus_movement(
+                        queen,
+                        point,
+                        exit_towards,
+                        nydus_tags,
+                        target,
+                        safe_nydus_exit,
+                        nydus_scheduler,
+                    )
+                )
+        return placed_tumor
+
+    def _issue_squad_orders(
+        self,
+        units: Union[list[Unit], Units],
+        close_enemy: Units,
+        engage: bool,
+        point: Point2,
+        exit_towards: Point2,
+        nydus_tags: list[int],
+        target: Point2,
+        safe_nydus_exit: bool,
+        nydus_scheduler: Optional["NydusTransitScheduler"],
+    ) -> None:
+        """One order for the whole squad instead of per unit micro.
+
+        Used when the bot is over its step time budget, see `PerformanceManager`.
+        """
+        if close_enemy and engage:
+            enemy_center: Point2 = Point2(cy_center(close_enemy))
+            for queen in units:
+                queen.attack(enemy_center)
+        elif nydus_tags and safe_nydus_exit:
+            for queen in units:
+                self.ai.register_behavior(
+                    self._nydus_movement(
+                        queen,
+                        point,
+                        exit_towards,
+                        nydus_tags,
+                        target,
+                        safe_nydus_exit,
+                        nydus_scheduler,
+                    )
+                )
+        else:
+            move_to: Point2 = point if point else target
+            for queen in units:
+                queen.move(move_to)
+
     def _nydus_movement(
         self,
         unit: Unit,
@@ -185,37 +354,46 @@ class CombatQueens(BaseControl):
         nydus_tags: list[int],
         target: Point2,
         safe_nydus_exit: bool,
+        nydus_scheduler: Optional["NydusTransitScheduler"] = None,
     ) -> CombatManeuver:
-        maneuver: CombatManeuver = CombatManeuver()
+        pool: ManeuverPool = self.ai.maneuver_pool
+        maneuver: CombatManeuver = pool.maneuver(unit.tag)
         if (
             nydus_tags
             and safe_nydus_exit
             and unit.tag not in self.mediator.get_banned_nydus_travellers
         ):
+            entry_tag: int = nydus_tags[0]
+            if nydus_scheduler:
+                entry_tag = nydus_scheduler.entrance_for(unit, entry_tag)
+            entrance: Unit = self.ai.unit_tag_dict[entry_tag]
             self.mediator.add_to_nydus_travellers(
                 unit=unit,
-                entry_nydus_tag=nydus_tags[0],
+                entry_nydus_tag=entry_tag,
                 exit_nydus_tag=nydus_tags[1],
                 exit_towards=exit_towards,
             )
+            # `point` is on the path to the entrance ares picked for the squad
             if (
-                cy_distance_to_squared(
-                    Point2(point), self.ai.unit_tag_dict[nydus_tags[0]].position
-                )
-                < 36.0
+                entry_tag != nydus_tags[0]
+                or cy_distance_to_squared(Point2(point), entrance.position) < 36.0
             ):
                 maneuver.add(
-                    UseAbility(
-                        AbilityId.SMART, unit, self.ai.unit_tag_dict[nydus_tags[0]]
-                    )
+                    pool.get(unit.tag, UseAbility, AbilityId.SMART, unit, entrance)
                 )
             else:
-                maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, point))
+                maneuver.add(
+                    pool.get(unit.tag, UseAbility, AbilityId.MOVE_MOVE, unit, point)
+                )
 
         else:
             if point:
-                maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, point))
+                maneuver.add(
+                    pool.get(unit.tag, UseAbility, AbilityId.MOVE_MOVE, unit, point)
+                )
             else:
-                maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, target))
+                maneuver.add(
+                    pool.get(unit.tag, UseAbility, AbilityId.MOVE_MOVE, unit, target)
+                )
 
         return maneuver
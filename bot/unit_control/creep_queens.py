@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import numpy as np
 from ares.behaviors.combat import CombatManeuver
@@ -14,6 +14,9 @@ from bot.unit_control.base_control import BaseControl
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.managers.energy_planning import EnergyPlan
+    from bot.unit_control.maneuver_pool import ManeuverPool
+
 
 @dataclass
 class CreepQueens(BaseControl):
@@ -39,11 +42,17 @@ class CreepQueens(BaseControl):
         """Execute the behavior."""
         avoid_grid: np.ndarray = self.mediator.get_ground_avoidance_grid
         ground_grid: np.ndarray = self.mediator.get_ground_grid
+        energy_plan: Optional["EnergyPlan"] = kwargs.get("energy_plan", None)
 
+        pool: ManeuverPool = self.ai.maneuver_pool
         for queen in units:
-            maneuver: CombatManeuver = CombatManeuver()
-            maneuver.add(KeepUnitSafe(queen, avoid_grid))
-            maneuver.add(ShootTargetInRange(queen, self.ai.enemy_units))
-            maneuver.add(KeepUnitSafe(queen, ground_grid))
-            maneuver.add(QueenSpreadCreep(queen))
+            maneuver: CombatManeuver = pool.maneuver(queen.tag)
+            maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, avoid_grid))
+            maneuver.add(
+                pool.get(queen.tag, ShootTargetInRange, queen, self.ai.enemy_units)
+            )
+            maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, ground_grid))
+            # energy above the queen's transfuse reserve
+            if not energy_plan or queen.tag in energy_plan.tumor_tags:
+                maneuver.add(pool.get(queen.tag, QueenSpreadCreep, queen))
             self.ai.register_behavior(maneuver)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import numpy as np
 from ares.behaviors.combat import CombatManeuver
@@ -19,6 +19,9 @@ from bot.unit_control.base_control import BaseControl
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.managers.energy_planning import EnergyPlan
+    from bot.unit_control.maneuver_pool import ManeuverPool
+
 
 @dataclass
 class InjectQueens(BaseControl):
@@ -43,27 +46,39 @@ class InjectQueens(BaseControl):
     def execute(self, units: Union[list[Unit], Units], **kwargs) -> None:
         """Execute the behavior."""
         inject_q_to_th_tags: dict[int, int] = kwargs.get("inject_q_to_th_tags", {})
+        energy_plan: Optional["EnergyPlan"] = kwargs.get("energy_plan", None)
         ground_grid: np.ndarray = self.mediator.get_ground_grid
         avoid_grid: np.ndarray = self.mediator.get_ground_avoidance_grid
+        pool: ManeuverPool = self.ai.maneuver_pool
         for queen in units:
             target_th_tag: int = inject_q_to_th_tags.get(queen.tag, None)
-            maneuver: CombatManeuver = CombatManeuver()
-            maneuver.add(KeepUnitSafe(queen, avoid_grid))
-            maneuver.add(ShootTargetInRange(queen, self.ai.enemy_units))
-            maneuver.add(KeepUnitSafe(queen, ground_grid))
+            maneuver: CombatManeuver = pool.maneuver(queen.tag)
+            maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, avoid_grid))
+            maneuver.add(
+                pool.get(queen.tag, ShootTargetInRange, queen, self.ai.enemy_units)
+            )
+            maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, ground_grid))
             if target_th_tag and target_th_tag in self.ai.unit_tag_dict:
                 target_th: Unit = self.ai.unit_tag_dict[target_th_tag]
                 if target_th.is_ready:
-                    maneuver.add(
-                        UseAbility(
-                            AbilityId.EFFECT_INJECTLARVA,
-                            queen,
-                            target_th,
+                    if not energy_plan or queen.tag in energy_plan.inject_tags:
+                        maneuver.add(
+                            pool.get(
+                                queen.tag,
+                                UseAbility,
+                                AbilityId.EFFECT_INJECTLARVA,
+                                queen,
+                                target_th,
+                            )
                         )
-                    )
                     maneuver.add(
-                        PathUnitToTarget(
-                            queen, ground_grid, target_th.position, success_at_distance=4
+                        pool.get(
+                            queen.tag,
+                            PathUnitToTarget,
+                            queen,
+                            ground_grid,
+                            target_th.position,
+                            success_at_distance=4,
                         )
                     )
 
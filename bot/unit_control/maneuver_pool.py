@@ -0,0 +1,89 @@
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from ares import AresBot
+    from ares.behaviors.combat import CombatManeuver
+
+T = TypeVar("T")
+
+
+class ManeuverPool:
+    """Reuse behavior objects per unit instead of allocating them every step.
+
+    ares executes a behavior as soon as it is registered, so the objects
+    for a unit can be handed out again the next step. Each unit gets a list
+    of templates, filled in the order behaviors are requested for it during
+    a step; a template is only replaced if that slot asks for a different
+    behavior type. Reused behaviors are re-initialised in place, so fields
+    not passed go back to their defaults.
+
+    Usage, in place of `KeepUnitSafe(queen, grid)`:
+        `pool.get(queen.tag, KeepUnitSafe, queen, grid)`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    """
+
+    def __init__(self, ai: "AresBot"):
+        self.ai: AresBot = ai
+        # unit tag -> behaviors in the order they were requested
+        self.templates: dict[int, list[Any]] = {}
+        self.slots: dict[int, int] = {}
+        self._game_loop: int = -1
+
+        self.ai.tag_registry.track(self, "templates", evict_on_type_change=True)
+        self.ai.tag_registry.track(self, "slots", evict_on_type_change=True)
+
+    def maneuver(self, tag: int) -> "CombatManeuver":
+        """An empty `CombatManeuver` for this unit, keeping its micros list."""
+        from ares.behaviors.combat import CombatManeuver
+
+        maneuver: Optional[CombatManeuver] = self._next_template(tag, CombatManeuver)
+        if maneuver is None:
+            return self._store(tag, CombatManeuver())
+        maneuver.micros.clear()
+        return maneuver
+
+    def get(self, tag: int, behavior_type: Callable[..., T], *args, **kwargs) -> T:
+        """`behavior_type(*args, **kwargs)`, reusing this unit's template."""
+        # inlined `_next_template`, this runs for every behavior of every unit
+        if self.ai.state.game_loop != self._game_loop:
+            self._game_loop = self.ai.state.game_loop
+            self.slots.clear()
+        slots: dict[int, int] = self.slots
+        slot: int = slots.get(tag, 0)
+        slots[tag] = slot + 1
+        templates: Optional[list[Any]] = self.templates.get(tag, None)
+        if templates and slot < len(templates):
+            behavior: Any = templates[slot]
+            if type(behavior) is behavior_type:
+                # dataclass `__init__` sets every field again, without a new object
+                behavior.__init__(*args, **kwargs)
+                return behavior
+        return self._store(tag, behavior_type(*args, **kwargs))
+
+    def _next_template(self, tag: int, behavior_type: Callable) -> Optional[Any]:
+        """Move this unit on a slot, the template there if it can be reused."""
+        if self.ai.state.game_loop != self._game_loop:
+            self._game_loop = self.ai.state.game_loop
+            self.slots.clear()
+
+        slot: int = self.slots.get(tag, 0)
+        self.slots[tag] = slot + 1
+        templates: Optional[list[Any]] = self.templates.get(tag, None)
+        if templates and slot < len(templates):
+            template: Any = templates[slot]
+            if type(template) is behavior_type:
+                return template
+        return None
+
+    def _store(self, tag: int, behavior: T) -> T:
+        templates: list[Any] = self.templates.setdefault(tag, [])
+        slot: int = self.slots[tag] - 1
+        if slot < len(templates):
+            templates[slot] = behavior
+        else:
+            templates.append(behavior)
+        return behavior
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from ares.managers.manager_mediator import ManagerMediator
 from cython_extensions.geometry import cy_distance_to_squared
@@ -16,6 +16,11 @@ from bot.unit_control.queens_movement import QueensMovement
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.managers.energy_planning import EnergyPlan
+    from bot.managers.level_of_detail_scheduler import LevelOfDetailScheduler
+    from bot.managers.nydus_transit_scheduler import NydusTransitScheduler
+    from bot.managers.transfuse_allocator import TransfuseAllocator
+
 
 @dataclass
 class NydusQueens(BaseControl):
@@ -45,6 +50,17 @@ class NydusQueens(BaseControl):
         nydus_target: Point2 = kwargs.get("nydus_target", self.mediator.get_own_nat)
         squad_pos: Point2 = kwargs.get("squad_pos", units[0].position)
         can_engage_at_nydus: bool = kwargs.get("can_engage_at_nydus", False)
+        squad_orders: bool = kwargs.get("squad_orders", False)
+        nydus_scheduler: Optional["NydusTransitScheduler"] = kwargs.get(
+            "nydus_scheduler", None
+        )
+        transfuse_allocator: Optional["TransfuseAllocator"] = kwargs.get(
+            "transfuse_allocator", None
+        )
+        energy_plan: Optional["EnergyPlan"] = kwargs.get("energy_plan", None)
+        lod_scheduler: Optional["LevelOfDetailScheduler"] = kwargs.get(
+            "lod_scheduler", None
+        )
 
         close_to_target: bool = cy_distance_to_squared(squad_pos, nydus_target) < 450.0
 
@@ -54,10 +70,20 @@ class NydusQueens(BaseControl):
                     units,
                     target=nydus_target,
                     can_engage=True,
+                    squad_orders=squad_orders,
+                    nydus_scheduler=nydus_scheduler,
+                    transfuse_allocator=transfuse_allocator,
+                    lod_scheduler=lod_scheduler,
+                    energy_plan=energy_plan,
                 )
             else:
                 QueensMovement(self.ai, self.config, self.mediator).execute(
-                    units, target=self.mediator.get_own_nat
+                    units,
+                    target=self.mediator.get_own_nat,
+                    squad_orders=squad_orders,
+                    nydus_scheduler=nydus_scheduler,
+                    transfuse_allocator=transfuse_allocator,
+                    lod_scheduler=lod_scheduler,
                 )
         else:
             canals: list[Unit] = [
@@ -75,9 +101,20 @@ class NydusQueens(BaseControl):
                 if networks and len(canals) == 0:
                     target = cy_closest_to(squad_pos, networks).position
                 QueensMovement(self.ai, self.config, self.mediator).execute(
-                    units, target=target, exit_nydus_max_influence=22.0
+                    units,
+                    target=target,
+                    exit_nydus_max_influence=22.0,
+                    squad_orders=squad_orders,
+                    nydus_scheduler=nydus_scheduler,
+                    transfuse_allocator=transfuse_allocator,
+                    lod_scheduler=lod_scheduler,
                 )
             else:
                 QueensMovement(self.ai, self.config, self.mediator).execute(
-                    units, target=self.mediator.get_own_nat
+                    units,
+                    target=self.mediator.get_own_nat,
+                    squad_orders=squad_orders,
+                    nydus_scheduler=nydus_scheduler,
+                    transfuse_allocator=transfuse_allocator,
+                    lod_scheduler=lod_scheduler,
                 )
@@ -1,20 +1,31 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from typing import TYPE_CHECKING, Union
 
 import numpy as np
 from ares.behaviors.combat import CombatManeuver
 from ares.behaviors.combat.individual import KeepUnitSafe, UseAbility
 from ares.managers.manager_mediator import ManagerMediator
+from cython_extensions.geometry import cy_distance_to_squared
 from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
+from bot.consts import COVERAGE_CHANGE_THRESHOLD, CREEP_SPOTTERS, UPDATE_INTERVAL
 from bot.unit_control.base_control import BaseControl
 
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.unit_control.maneuver_pool import ManeuverPool
+
+# overlords closer than this (squared) to their spot count as in place
+IN_PLACE_DISTANCE_SQUARED: float = 2.25
+# update interval is stretched by this much when the bot is over budget
+THROTTLED_INTERVAL_MULTIPLIER: float = 3.0
+
 
 @dataclass
 class OverlordCreepSpotters(BaseControl):
@@ -22,6 +33,13 @@ class OverlordCreepSpotters(BaseControl):
 
     Called from `bot/main.py`
 
+    Spotter positions are cached and only recalculated every
+    `CreepSpotters.UpdateInterval` seconds, or earlier if the creep
+    frontier changes (coverage moved or tumor count changed).
+    Pass `throttle=True` when over the step time budget, positions then only
+    update on a stretched interval. Position updates are queued as a
+    background job so they can run while waiting on the next observation.
+
     Parameters
     ----------
     ai : AresBot
@@ -35,27 +53,116 @@ class OverlordCreepSpotters(BaseControl):
     ai: "AresBot"
     config: dict
     mediator: ManagerMediator
+    spotter_positions: dict[int, Point2] = field(default_factory=dict)
+    last_update_time: float = -1.0
+    last_creep_coverage: float = 0.0
+    last_num_tumors: int = 0
+    last_overlord_tags: set[int] = field(default_factory=set)
+    update_queued: bool = False
+    # how many times positions were recalculated, for telemetry
+    num_updates: int = 0
+
+    def __post_init__(self) -> None:
+        # overlords morphing to overseers / dropperlords stop spotting
+        self.ai.tag_registry.track(self, "spotter_positions", evict_on_type_change=True)
+        self.ai.tag_registry.track(
+            self, "last_overlord_tags", evict_on_type_change=True
+        )
 
     def execute(self, units: Union[list[Unit], Units], **kwargs) -> None:
         """Execute the behavior."""
+        throttle: bool = kwargs.get("throttle", False)
         if self.mediator.get_creep_coverage < 55.0:
-            spotter_positions: dict[
-                int, Point2
-            ] = self.mediator.get_overlord_creep_spotter_positions(
-                overlords=units, target_pos=self.ai.enemy_start_locations[0]
-            )
-        else:
-            spotter_positions = dict()
+            if not self.update_queued and self._should_update_spotter_positions(
+                units, throttle
+            ):
+                self.update_queued = True
+                self.ai.queue_background_job(
+                    partial(self._update_spotter_positions, list(units))
+                )
+        elif self.spotter_positions:
+            self.spotter_positions = dict()
 
         grid: np.ndarray = self.mediator.get_air_grid
+        pool: ManeuverPool = self.ai.maneuver_pool
         for ol in units:
-            creep_spotter_maneuver: CombatManeuver = CombatManeuver()
-            creep_spotter_maneuver.add(KeepUnitSafe(ol, grid))
+            spot: Point2 | None = self.spotter_positions.get(ol.tag, None)
+            if self._in_place_and_safe(ol, spot, grid):
+                continue
+
+            creep_spotter_maneuver: CombatManeuver = pool.maneuver(ol.tag)
+            creep_spotter_maneuver.add(pool.get(ol.tag, KeepUnitSafe, ol, grid))
             creep_spotter_maneuver.add(
-                UseAbility(AbilityId.BEHAVIOR_GENERATECREEPON, ol)
+                pool.get(ol.tag, UseAbility, AbilityId.BEHAVIOR_GENERATECREEPON, ol)
             )
-            if ol.tag in spotter_positions:
+            if spot:
                 creep_spotter_maneuver.add(
-                    UseAbility(AbilityId.MOVE_MOVE, ol, spotter_positions[ol.tag])
+                    pool.get(ol.tag, UseAbility, AbilityId.MOVE_MOVE, ol, spot)
                 )
             self.ai.register_behavior(creep_spotter_maneuver)
+
+    def _in_place_and_safe(
+        self, ol: Unit, spot: Point2 | None, grid: np.ndarray
+    ) -> bool:
+        """Nothing to do for this overlord this frame.
+
+        Already generating creep, sat on (or heading to) its assigned spot,
+        and not in danger.
+        """
+        if AbilityId.BEHAVIOR_GENERATECREEPON in ol.abilities:
+            return False
+
+        if (
+            spot
+            and cy_distance_to_squared(ol.position, spot) > IN_PLACE_DISTANCE_SQUARED
+        ):
+            order_target = ol.order_target
+            if (
+                not isinstance(order_target, Point2)
+                or cy_distance_to_squared(order_target, spot)
+                > IN_PLACE_DISTANCE_SQUARED
+            ):
+                return False
+
+        return self.mediator.is_position_safe(grid=grid, position=ol.position)
+
+    def _should_update_spotter_positions(
+        self, overlords: Union[list[Unit], Units], throttle: bool
+    ) -> bool:
+        settings: dict = self.config[CREEP_SPOTTERS]
+        interval: float = settings[UPDATE_INTERVAL]
+        if throttle:
+            interval *= THROTTLED_INTERVAL_MULTIPLIER
+        if (
+            self.last_update_time < 0.0
+            or self.ai.time - self.last_update_time >= interval
+        ):
+            return True
+        if throttle:
+            return False
+
+        # creep frontier moved
+        if (
+            abs(self.mediator.get_creep_coverage - self.last_creep_coverage)
+            >= settings[COVERAGE_CHANGE_THRESHOLD]
+            or self._num_tumors != self.last_num_tumors
+        ):
+            return True
+
+        # a new overlord has not been considered yet
+        return any(ol.tag not in self.last_overlord_tags for ol in overlords)
+
+    def _update_spotter_positions(self, overlords: Union[list[Unit], Units]) -> None:
+        self.spotter_positions = self.mediator.get_overlord_creep_spotter_positions(
+            overlords=overlords, target_pos=self.ai.enemy_start_locations[0]
+        )
+        self.last_update_time = self.ai.time
+        self.last_creep_coverage = self.mediator.get_creep_coverage
+        self.last_num_tumors = self._num_tumors
+        self.last_overlord_tags = {ol.tag for ol in overlords}
+        self.update_queued = False
+        self.num_updates += 1
+
+    @property
+    def _num_tumors(self) -> int:
+        return len(self.mediator.get_own_structures_dict[UnitID.CREEPTUMORBURROWED])
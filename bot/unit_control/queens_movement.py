@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import numpy as np
 from cython_extensions import cy_center, cy_distance_to_squared
@@ -22,6 +22,11 @@ from bot.unit_control.base_control import BaseControl
 if TYPE_CHECKING:
     from ares import AresBot
 
+    from bot.managers.level_of_detail_scheduler import LevelOfDetailScheduler
+    from bot.managers.nydus_transit_scheduler import NydusTransitScheduler
+    from bot.managers.transfuse_allocator import TransfuseAllocator
+    from bot.unit_control.maneuver_pool import ManeuverPool
+
 
 @dataclass
 class QueensMovement(BaseControl):
@@ -49,6 +54,16 @@ class QueensMovement(BaseControl):
             return
         target: Point2 = kwargs.get("target", self.mediator.get_own_nat)
         exit_nydus_max_influence: float = kwargs.get("exit_nydus_max_influence", 10.0)
+        squad_orders: bool = kwargs.get("squad_orders", False)
+        nydus_scheduler: Optional["NydusTransitScheduler"] = kwargs.get(
+            "nydus_scheduler", None
+        )
+        transfuse_allocator: Optional["TransfuseAllocator"] = kwargs.get(
+            "transfuse_allocator", None
+        )
+        lod_scheduler: Optional["LevelOfDetailScheduler"] = kwargs.get(
+            "lod_scheduler", None
+        )
         ground_grid: np.ndarray = self.mediator.get_ground_grid
         avoid_grid: np.ndarray = self.mediator.get_ground_avoidance_grid
 
@@ -65,13 +80,59 @@ class QueensMovement(BaseControl):
             weight_safety_limit=exit_nydus_max_influence,
         ):
             safe_nydus_exit = False
+        if nydus_tags and safe_nydus_exit and nydus_scheduler:
+            nydus_scheduler.plan_squad(units, nydus_tags[1])
+
+        if squad_orders and not (nydus_tags and safe_nydus_exit):
+            # over the step time budget, one move order for the whole squad
+            move_to: Point2 = point if point else target
+            for queen in units:
+                queen.move(move_to)
+            return
 
-        for queen in units:
-            maneuver: CombatManeuver = CombatManeuver()
-            maneuver.add(KeepUnitSafe(queen, avoid_grid))
-            maneuver.add(UseTransfuse(queen, units))
-            maneuver.add(ShootTargetInRange(queen, self.ai.enemy_units))
-            maneuver.add(KeepUnitSafe(queen, ground_grid))
+        # one transfuse per injured unit across the squad
+        transfusions: Optional[dict[int, Unit]] = (
+            transfuse_allocator.assign(units) if transfuse_allocator else None
+        )
+        queens: list[Unit] = units
+        if lod_scheduler:
+            # queens away from the fight only get an order every few frames
+            queens, calm_queens = lod_scheduler.split(
+                units, ground_grid, transfusions or ()
+            )
+            for queen in calm_queens:
+                self.ai.register_behavior(
+                    self._nydus_movement(
+                        queen,
+                        point,
+                        exit_towards,
+                        nydus_tags,
+                        target,
+                        safe_nydus_exit,
+                        nydus_scheduler,
+                    )
+                )
+
+        pool: ManeuverPool = self.ai.maneuver_pool
+        for queen in queens:
+            maneuver: CombatManeuver = pool.maneuver(queen.tag)
+            maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, avoid_grid))
+            if transfusions is None:
+                maneuver.add(pool.get(queen.tag, UseTransfuse, queen, units))
+            elif transfuse_target := transfusions.get(queen.tag, None):
+                maneuver.add(
+                    pool.get(
+                        queen.tag,
+                        UseAbility,
+                        AbilityId.TRANSFUSION_TRANSFUSION,
+                        queen,
+                        transfuse_target,
+                    )
+                )
+            maneuver.add(
+                pool.get(queen.tag, ShootTargetInRange, queen, self.ai.enemy_units)
+            )
+            maneuver.add(pool.get(queen.tag, KeepUnitSafe, queen, ground_grid))
 
             maneuver.add(
                 self._nydus_movement(
@@ -81,6 +142,7 @@ class QueensMovement(BaseControl):
                     nydus_tags,
                     target,
                     safe_nydus_exit,
+                    nydus_scheduler,
                 )
             )
 
@@ -94,37 +156,46 @@ class QueensMovement(BaseControl):
         nydus_tags: list[int],
         target: Point2,
         safe_nydus_exit: bool,
+        nydus_scheduler: Optional["NydusTransitScheduler"] = None,
     ) -> CombatManeuver:
-        maneuver: CombatManeuver = CombatManeuver()
+        pool: ManeuverPool = self.ai.maneuver_pool
+        maneuver: CombatManeuver = pool.maneuver(unit.tag)
         if (
             nydus_tags
             and safe_nydus_exit
             and unit.tag not in self.mediator.get_banned_nydus_travellers
         ):
+            entry_tag: int = nydus_tags[0]
+            if nydus_scheduler:
+                entry_tag = nydus_scheduler.entrance_for(unit, entry_tag)
+            entrance: Unit = self.ai.unit_tag_dict[entry_tag]
             self.mediator.add_to_nydus_travellers(
                 unit=unit,
-                entry_nydus_tag=nydus_tags[0],
+                entry_nydus_tag=entry_tag,
                 exit_nydus_tag=nydus_tags[1],
                 exit_towards=exit_towards,
             )
+            # `point` is on the path to the entrance ares picked for the squad
             if (
-                cy_distance_to_squared(
-                    Point2(point), self.ai.unit_tag_dict[nydus_tags[0]].position
-                )
-                < 36.0
+                entry_tag != nydus_tags[0]
+                or cy_distance_to_squared(Point2(point), entrance.position) < 36.0
             ):
                 maneuver.add(
-                    UseAbility(
-                        AbilityId.SMART, unit, self.ai.unit_tag_dict[nydus_tags[0]]
-                    )
+                    pool.get(unit.tag, UseAbility, AbilityId.SMART, unit, entrance)
                 )
             else:
-                maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, point))
+                maneuver.add(
+                    pool.get(unit.tag, UseAbility, AbilityId.MOVE_MOVE, unit, point)
+                )
 
         else:
             if point:
-                maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, point))
+                maneuver.add(
+                    pool.get(unit.tag, UseAbility, AbilityId.MOVE_MOVE, unit, point)
+                )
             else:
-                maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, target))
+                maneuver.add(
+                    pool.get(unit.tag, UseAbility, AbilityId.MOVE_MOVE, unit, target)
+                )
 
         return maneuver
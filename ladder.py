@@ -12,6 +12,8 @@ import sc2
 from sc2.client import Client
 from sc2.protocol import ConnectionAlreadyClosed
 
+from bot.pipelined_game import play_game_pipelined
+
 
 def run_ladder_game(bot):
     # Load command line arguments
@@ -28,6 +30,11 @@ def run_ladder_game(bot):
     )
     parser.add_argument("--OpponentId", type=str, nargs="?", help="Opponent ID")
     parser.add_argument("--RealTime", action="store_true", help="real time flag")
+    parser.add_argument(
+        "--Pipelined",
+        action="store_true",
+        help="overlap observation requests with background work",
+    )
     args, unknown = parser.parse_known_args()
 
     if args.LadderServer is None:
@@ -56,6 +63,7 @@ def run_ladder_game(bot):
         players=[bot],
         realtime=args.RealTime,
         portconfig=portconfig,
+        pipelined=args.Pipelined,
     )
 
     # Run it
@@ -74,15 +82,26 @@ async def join_ladder_game(
     save_replay_as=None,
     step_time_limit=None,
     game_time_limit=None,
+    pipelined=False,
 ):
     ws_url = f"ws://{host}:{port}/sc2api"
     ws_connection = await aiohttp.ClientSession().ws_connect(ws_url, timeout=120)
 
     client = Client(ws_connection)
     try:
-        result = await sc2.main._play_game(
-            players[0], client, realtime, portconfig, step_time_limit, game_time_limit
-        )
+        if pipelined:
+            result = await play_game_pipelined(
+                players[0], client, realtime, portconfig, game_time_limit
+            )
+        else:
+            result = await sc2.main._play_game(
+                players[0],
+                client,
+                realtime,
+                portconfig,
+                step_time_limit,
+                game_time_limit,
+            )
         if save_replay_as is not None:
             await client.save_replay(save_replay_as)
     except ConnectionAlreadyClosed:
@@ -6,10 +6,8 @@ from pathlib import Path
 from typing import List
 
 from loguru import logger
-from sc2 import maps
-from sc2.data import AIBuild, Difficulty, Race
-from sc2.main import run_game
-from sc2.player import Bot, Computer
+from sc2.data import Race
+from sc2.player import Bot
 
 sys.path.append("ares-sc2/src/ares")
 sys.path.append("ares-sc2/src")
@@ -20,7 +18,6 @@ sys.path.append("queens-sc2/queens_sc2")
 import yaml
 
 from bot.main import MyBot
-from ladder import run_ladder_game
 
 plt = platform.system()
 # change if non default setup / linux
@@ -67,11 +64,19 @@ def main():
 
     if "--LadderServer" in sys.argv:
         # Ladder game started by LadderManager
+        # only the imports for the kind of game we are playing
+        from ladder import run_ladder_game
+
         print("Starting ladder game...")
         result, opponentid = run_ladder_game(bot1)
         print(result, " against opponent ", opponentid)
     else:
         # Local game
+        from sc2 import maps
+        from sc2.data import AIBuild, Difficulty
+        from sc2.main import run_game
+        from sc2.player import Computer
+
         # map_list: List[str] = [
         #     p.name.replace(f".{MAP_FILE_EXT}", "")
         #     for p in Path(MAPS_PATH).glob(f"*.{MAP_FILE_EXT}")
@@ -0,0 +1,145 @@
+"""
+Time filling, saving, loading and querying the base distance matrix.
+
+`--bases` base locations on a `--map-size` map split by walls with a few
+gaps, like high ground and chokes. Paths are found with a breadth first
+search standing in for ares' `find_raw_path` (set `--path-cost-us` to the
+real cost to estimate game numbers). Reports:
+
+- the cost of filling the whole matrix, which only happens the first time
+  a map is played,
+- loading it back from disk, which is what every later game pays,
+- a distance lookup against finding the path on demand.
+
+Usage:
+    python scripts/benchmarks/base_distances_benchmark.py --bases 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+from collections import deque
+from os import path
+from typing import Optional
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.base_distances import BaseDistances  # noqa: E402
+
+NEIGHBOURS: tuple[tuple[int, int], ...] = (
+    (1, 0),
+    (-1, 0),
+    (0, 1),
+    (0, -1),
+    (1, 1),
+    (1, -1),
+    (-1, 1),
+    (-1, -1),
+)
+
+
+def make_map(rng: np.random.Generator, size: int) -> np.ndarray:
+    """True where pathable, [x, y] like ares' grids."""
+    grid: np.ndarray = np.ones((size, size), dtype=bool)
+    for wall in range(size // 4, size, size // 4):
+        grid[wall, :] = False
+        grid[:, wall] = False
+        for gap in rng.integers(0, size - 4, 3).tolist():
+            grid[wall, gap : gap + 4] = True
+            grid[gap : gap + 4, wall] = True
+    return grid
+
+
+def bfs_path(
+    grid: np.ndarray, start: tuple[float, float], target: tuple[float, float]
+) -> Optional[np.ndarray]:
+    size: int = grid.shape[0]
+    begin: tuple[int, int] = (int(start[0]), int(start[1]))
+    end: tuple[int, int] = (int(target[0]), int(target[1]))
+    came_from: dict[tuple[int, int], Optional[tuple[int, int]]] = {begin: None}
+    queue: deque = deque([begin])
+    while queue:
+        cell: tuple[int, int] = queue.popleft()
+        if cell == end:
+            cells: list[tuple[int, int]] = []
+            while cell is not None:
+                cells.append(cell)
+                cell = came_from[cell]
+            return np.array(cells[::-1], dtype=np.float32) + 0.5
+        for dx, dy in NEIGHBOURS:
+            x, y = cell[0] + dx, cell[1] + dy
+            if 0 <= x < size and 0 <= y < size and grid[x, y]:
+                if (x, y) not in came_from:
+                    came_from[(x, y)] = cell
+                    queue.append((x, y))
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bases", type=int, default=16)
+    parser.add_argument("--map-size", type=int, default=144)
+    parser.add_argument("--path-cost-us", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    grid: np.ndarray = make_map(rng, args.map_size)
+    open_cells: np.ndarray = np.argwhere(grid)
+    chosen: np.ndarray = open_cells[
+        rng.choice(len(open_cells), args.bases, replace=False)
+    ]
+    points: np.ndarray = chosen.astype(np.float32) + 0.5
+
+    def find_path(
+        start: tuple[float, float], target: tuple[float, float]
+    ) -> Optional[np.ndarray]:
+        return bfs_path(grid, start, target)
+
+    matrix: BaseDistances = BaseDistances(points, find_path)
+    num_pairs: int = len(matrix.missing_pairs())
+    fill_s: float = timeit.timeit(
+        lambda: [matrix.fill_pair(i, j) for i, j in matrix.missing_pairs()],
+        number=1,
+    )
+    path_us: float = args.path_cost_us or fill_s / num_pairs * 1e6
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path: str = os.path.join(directory, "map.npz")
+        save_s: float = timeit.timeit(lambda: matrix.save(file_path), number=1)
+        size_kib: float = os.path.getsize(file_path) / 1024
+        # loaded in a different order, like the other spawn
+        shuffled: list = [tuple(p) for p in points[::-1].tolist()]
+        load_s: float = (
+            timeit.timeit(lambda: BaseDistances.load(file_path, shuffled), number=10)
+            / 10
+        )
+        loaded: Optional[BaseDistances] = BaseDistances.load(file_path, shuffled)
+
+    starts: list = [tuple(p) for p in points.tolist()]
+    lookup_us: float = (
+        timeit.timeit(
+            lambda: [loaded.distance(a, b) for a in starts for b in starts], number=20
+        )
+        / (20 * len(starts) ** 2)
+        * 1e6
+    )
+    same: bool = all(
+        loaded.distance(a, b) == matrix.distance(a, b) for a in starts for b in starts
+    )
+
+    print(f"{args.bases} bases, {num_pairs} pairs, map {args.map_size}")
+    print(f"fill the matrix (first game): {fill_s * 1e3:8.1f} ms")
+    print(
+        f"save: {save_s * 1e3:6.1f} ms, load: {load_s * 1e3:6.1f} ms, "
+        f"file: {size_kib:6.1f} KiB"
+    )
+    print(f"distance lookup: {lookup_us:8.2f} us, find a path: {path_us:8.1f} us")
+    print(f"loaded matrix matches after reordering: {same}")
+
+
+if __name__ == "__main__":
+    main()
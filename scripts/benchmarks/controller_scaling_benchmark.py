@@ -0,0 +1,518 @@
+"""
+Sweep the unit controllers over synthetic game states of growing size.
+
+`make_scenario` builds a fake game on a `--map-size` grid: N queens around
+our natural, M enemies of `--enemy-types` walking in, T creep tumors and
+O overlords. The bot and mediator are stand-ins with just what the
+controllers call (`ManagerMediator` queries, `split_ground_fliers`,
+`has_creep`...), registered behaviours are counted and not executed, so
+this measures the controllers themselves: step time and the memory they
+allocate per step (tracemalloc peak).
+
+Needs python-sc2, ares and cython-extensions installed, like the bot.
+
+Scaling regressions fail the run (exit code 1):
+  - time per unit at the largest size more than `--max-growth` times the
+    time per unit at the smallest size (ie. worse than linear scaling)
+  - with `--baseline results.json`, any size more than `--tolerance`
+    slower than the saved results, see `--save`
+
+Usage:
+    python scripts/benchmarks/controller_scaling_benchmark.py
+    python scripts/benchmarks/controller_scaling_benchmark.py \
+        --sizes 10 50 200 --enemy-types ZERGLING MUTALISK --save baseline.json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from os import path
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+import numpy as np
+import yaml
+
+ROOT: str = path.abspath(path.join(path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT)
+
+from sc2.ids.unit_typeid import UnitTypeId as UnitID  # noqa: E402
+from sc2.position import Point2  # noqa: E402
+from sc2.units import Units  # noqa: E402
+
+from bot.consts import (  # noqa: E402
+    EARLY_RESERVE,
+    ENERGY_PLANNER,
+    HORIZON,
+    THREAT_RESERVE,
+    SquadEngagement,
+)
+from bot.managers.energy_planning import EnergyPlan, plan_queen_energy  # noqa: E402
+from bot.managers.level_of_detail_scheduler import LevelOfDetailScheduler  # noqa: E402
+from bot.managers.nydus_transit_scheduler import NydusTransitScheduler  # noqa: E402
+from bot.managers.tag_registry import TagRegistry  # noqa: E402
+from bot.managers.transfuse_allocator import TransfuseAllocator  # noqa: E402
+from bot.unit_control.combat_queens import CombatQueens  # noqa: E402
+from bot.unit_control.creep_queens import CreepQueens  # noqa: E402
+from bot.unit_control.inject_queens import InjectQueens  # noqa: E402
+from bot.unit_control.maneuver_pool import ManeuverPool  # noqa: E402
+from bot.unit_control.overlord_creep_spotters import OverlordCreepSpotters  # noqa: E402
+from bot.unit_control.queens_movement import QueensMovement  # noqa: E402
+
+GAME_STEP: int = 2
+FLYING_TYPES: set[UnitID] = {
+    UnitID.BANSHEE,
+    UnitID.BATTLECRUISER,
+    UnitID.MEDIVAC,
+    UnitID.MUTALISK,
+    UnitID.OBSERVER,
+    UnitID.ORACLE,
+    UnitID.VIKINGFIGHTER,
+    UnitID.VOIDRAY,
+}
+GROUND_RANGE: dict[UnitID, float] = {
+    UnitID.MARINE: 5.0,
+    UnitID.MARAUDER: 6.0,
+    UnitID.STALKER: 6.0,
+    UnitID.ROACH: 4.0,
+    UnitID.HYDRALISK: 5.0,
+}
+
+
+class FakeUnit:
+    """Just enough of `sc2.unit.Unit` for the controllers."""
+
+    def __init__(
+        self,
+        tag: int,
+        type_id: UnitID,
+        position: tuple[float, float],
+        energy: float = 0.0,
+        health_percentage: float = 1.0,
+        is_flying: bool = False,
+        ground_range: float = 0.5,
+    ):
+        self.tag: int = tag
+        self.type_id: UnitID = type_id
+        self.position_tuple: tuple[float, float] = position
+        self.position: Point2 = Point2(position)
+        self._proto = SimpleNamespace(
+            pos=SimpleNamespace(x=position[0], y=position[1], z=10.0)
+        )
+        self.energy: float = energy
+        self.health_percentage: float = health_percentage
+        self.health_max: float = 175.0
+        self.health: float = self.health_max * health_percentage
+        self.is_flying: bool = is_flying
+        self.is_ready: bool = True
+        self.is_idle: bool = False
+        self.is_structure: bool = False
+        self.radius: float = 0.5
+        self.can_attack_ground: bool = ground_range > 0.0
+        self.ground_range: float = ground_range
+        self.abilities: set = set()
+        self.order_target: Optional[Point2] = None
+        self.orders: list = []
+
+    def is_using_ability(self, ability: Any) -> bool:
+        return bool(self.orders) and self.orders[-1][0] == ability
+
+    def has_buff(self, buff: Any) -> bool:
+        return False
+
+    def __call__(self, ability: Any, target: Any = None, queue: bool = False):
+        self.orders.append((ability, target))
+        return True
+
+    def move(self, target: Any, queue: bool = False) -> bool:
+        self.order_target = target
+        return self(None, target, queue)
+
+    def attack(self, target: Any, queue: bool = False) -> bool:
+        return self(None, target, queue)
+
+    def distance_to(self, other: Any) -> float:
+        return self.position.distance_to(
+            other.position if hasattr(other, "position") else other
+        )
+
+
+class FakeMediator:
+    """The `ManagerMediator` queries the controllers make."""
+
+    def __init__(self, scenario: dict):
+        self.scenario: dict = scenario
+        size: int = scenario["map_size"]
+        self.get_ground_grid: np.ndarray = scenario["ground_grid"]
+        self.get_ground_avoidance_grid: np.ndarray = np.ones((size, size))
+        self.get_air_grid: np.ndarray = scenario["air_grid"]
+        self.get_own_nat: Point2 = scenario["natural"]
+        self.get_creep_coverage: float = 30.0
+        self.get_banned_nydus_travellers: set[int] = set()
+        self.get_own_structures_dict: dict[UnitID, list[FakeUnit]] = defaultdict(
+            list,
+            {
+                UnitID.CREEPTUMORQUEEN: scenario["tumors"],
+                UnitID.CREEPTUMORBURROWED: scenario["tumors"],
+            },
+        )
+        self.enemy_positions: np.ndarray = np.array(
+            [u.position_tuple for u in scenario["enemies"]]
+        ).reshape(-1, 2)
+
+    def get_units_in_range(
+        self, start_points: list, distances: list, query_tree: Any, **kwargs
+    ) -> list[Units]:
+        enemies: list[FakeUnit] = self.scenario["enemies"]
+        found: list[Units] = []
+        for point, distance in zip(start_points, distances):
+            if len(self.enemy_positions) == 0:
+                found.append(Units([], self.scenario["ai"]))
+                continue
+            offsets: np.ndarray = self.enemy_positions - np.array(point)
+            close = np.flatnonzero(
+                np.einsum("ij,ij->i", offsets, offsets) < distance * distance
+            )
+            found.append(Units([enemies[i] for i in close], self.scenario["ai"]))
+        return found
+
+    def is_position_safe(self, grid: np.ndarray, position: Any, **kwargs) -> bool:
+        return grid[int(position[0]), int(position[1])] <= 1.0
+
+    def find_nydus_path_next_point(self, start: Point2, target: Point2, **kwargs):
+        # no nydus network, walk straight at the target
+        return start.towards(target, 4.0), None, []
+
+    def get_position_blocks_expansion(self, position: Any) -> bool:
+        return False
+
+    def get_overlord_creep_spotter_positions(
+        self, overlords: Any, target_pos: Point2
+    ) -> dict[int, Point2]:
+        return {ol.tag: ol.position.towards(target_pos, 5.0) for ol in overlords}
+
+    def add_to_nydus_travellers(self, **kwargs) -> None:
+        pass
+
+
+class FakeBot:
+    """The `AresBot` attributes the controllers use."""
+
+    def __init__(self, scenario: dict, config: dict):
+        self.config: dict = config
+        self.state = SimpleNamespace(game_loop=0)
+        self.time: float = 0.0
+        self.tag_registry: TagRegistry = TagRegistry()
+        self.maneuver_pool: ManeuverPool = ManeuverPool(self)
+        self.enemy_start_locations: list[Point2] = [scenario["enemy_start"]]
+        self.creep: np.ndarray = scenario["creep"]
+        self.registered: int = 0
+        self.mediator: Optional[FakeMediator] = None
+        self.enemy_units: Optional[Units] = None
+        self.unit_tag_dict: dict[int, FakeUnit] = {}
+
+    def register_behavior(self, behavior: Any) -> None:
+        self.registered += 1
+
+    def has_creep(self, position: Any) -> bool:
+        return bool(self.creep[int(position[0]), int(position[1])])
+
+    def split_ground_fliers(self, units: Any, return_as_lists: bool = False):
+        ground: list = [u for u in units if not u.is_flying]
+        fliers: list = [u for u in units if u.is_flying]
+        if return_as_lists:
+            return ground, fliers
+        return Units(ground, self), Units(fliers, self)
+
+    def queue_background_job(self, job: Callable[[], None]) -> None:
+        # the real bot runs these between steps
+        job()
+
+
+def make_scenario(
+    num_queens: int,
+    num_enemies: int,
+    num_tumors: int,
+    num_overlords: int,
+    enemy_types: list[UnitID],
+    map_size: int = 160,
+    seed: int = 0,
+) -> dict:
+    """A synthetic game state, see `FakeBot` and `FakeMediator`."""
+    rng: np.random.Generator = np.random.default_rng(seed)
+    natural: np.ndarray = np.array([map_size * 0.3, map_size * 0.3])
+    enemy_start: np.ndarray = np.array([map_size * 0.8, map_size * 0.8])
+
+    def around(center: np.ndarray, spread: float, n: int) -> np.ndarray:
+        return np.clip(rng.normal(center, spread, (n, 2)), 1.0, map_size - 2.0)
+
+    tags = iter(range(1, 1_000_000))
+    queens: list[FakeUnit] = [
+        FakeUnit(
+            next(tags),
+            UnitID.QUEEN,
+            tuple(pos.tolist()),
+            energy=float(rng.uniform(0.0, 200.0)),
+            health_percentage=float(rng.choice([1.0, 1.0, 0.6, 0.3])),
+            ground_range=5.0,
+        )
+        for pos in around(natural, 6.0, num_queens)
+    ]
+    # enemies walking from the middle of the map at the natural
+    enemies: list[FakeUnit] = []
+    for pos in around((natural + enemy_start) / 2 - 10.0, 8.0, num_enemies):
+        type_id: UnitID = enemy_types[int(rng.integers(len(enemy_types)))]
+        enemies.append(
+            FakeUnit(
+                next(tags),
+                type_id,
+                tuple(pos.tolist()),
+                is_flying=type_id in FLYING_TYPES,
+                ground_range=GROUND_RANGE.get(type_id, 0.5),
+            )
+        )
+    tumors: list[FakeUnit] = [
+        FakeUnit(next(tags), UnitID.CREEPTUMORBURROWED, tuple(pos.tolist()))
+        for pos in around(natural, map_size * 0.1, num_tumors)
+    ]
+    overlords: list[FakeUnit] = [
+        FakeUnit(next(tags), UnitID.OVERLORD, tuple(pos.tolist()), is_flying=True)
+        for pos in around(natural, map_size * 0.15, num_overlords)
+    ]
+    townhalls: list[FakeUnit] = [
+        FakeUnit(next(tags), UnitID.HATCHERY, tuple(pos.tolist()))
+        for pos in around(natural, map_size * 0.1, max(1, num_queens // 4))
+    ]
+
+    ground_grid: np.ndarray = np.ones((map_size, map_size), dtype=np.float32)
+    air_grid: np.ndarray = np.ones((map_size, map_size), dtype=np.float32)
+    for enemy in enemies:
+        x, y = int(enemy.position_tuple[0]), int(enemy.position_tuple[1])
+        grid: np.ndarray = air_grid if enemy.is_flying else ground_grid
+        grid[max(0, x - 5) : x + 6, max(0, y - 5) : y + 6] += 10.0
+    creep: np.ndarray = np.zeros((map_size, map_size), dtype=bool)
+    for tumor in tumors:
+        x, y = int(tumor.position_tuple[0]), int(tumor.position_tuple[1])
+        creep[max(0, x - 10) : x + 11, max(0, y - 10) : y + 11] = True
+
+    return {
+        "map_size": map_size,
+        "natural": Point2(natural.tolist()),
+        "enemy_start": Point2(enemy_start.tolist()),
+        "queens": queens,
+        "enemies": enemies,
+        "tumors": tumors,
+        "overlords": overlords,
+        "townhalls": townhalls,
+        "ground_grid": ground_grid,
+        "air_grid": air_grid,
+        "creep": creep,
+    }
+
+
+def make_bot(scenario: dict, config: dict) -> FakeBot:
+    ai: FakeBot = FakeBot(scenario, config)
+    scenario["ai"] = ai
+    ai.mediator = FakeMediator(scenario)
+    ai.enemy_units = Units(scenario["enemies"], ai)
+    for key in ("queens", "enemies", "tumors", "overlords", "townhalls"):
+        ai.unit_tag_dict.update({u.tag: u for u in scenario[key]})
+    return ai
+
+
+def make_energy_plan(queens: list[FakeUnit], config: dict) -> EnergyPlan:
+    """Like `EnergyManager.update`, all queens one squad with enemies close."""
+    settings: dict = config[ENERGY_PLANNER]
+    tags: list[int] = [q.tag for q in queens]
+    _, can_tumor, can_inject, projected = plan_queen_energy(
+        np.array([q.energy for q in queens]),
+        np.ones(len(queens), dtype=bool),
+        np.zeros(len(queens), dtype=int),
+        settings[EARLY_RESERVE],
+        1.0,
+        settings[THREAT_RESERVE],
+        settings[HORIZON],
+    )
+    return EnergyPlan(
+        {tag for tag, ok in zip(tags, can_tumor.tolist()) if ok},
+        {tag for tag, ok in zip(tags, can_inject.tolist()) if ok},
+        float(projected.mean()),
+    )
+
+
+def controller_runs(ai: FakeBot, scenario: dict) -> dict[str, Callable[[], None]]:
+    """One step of each controller, on the scenario's units.
+
+    Controllers get the same helpers `QueenManager` passes them.
+    """
+    args: tuple = (ai, ai.config, ai.mediator)
+    queens: list[FakeUnit] = scenario["queens"]
+    townhalls: list[FakeUnit] = scenario["townhalls"]
+    inject_targets: dict[int, int] = {
+        q.tag: townhalls[i % len(townhalls)].tag for i, q in enumerate(queens)
+    }
+    energy_plan: EnergyPlan = make_energy_plan(queens, ai.config)
+    lod_scheduler: LevelOfDetailScheduler = LevelOfDetailScheduler(ai)
+    lod_scheduler.update(ai.mediator.enemy_positions.astype(np.float32))
+    squad_helpers: dict[str, Any] = {
+        "squad_orders": False,
+        "nydus_scheduler": NydusTransitScheduler(ai),
+        "transfuse_allocator": TransfuseAllocator(ai),
+        "lod_scheduler": lod_scheduler,
+    }
+    close_enemy: Units = ai.mediator.get_units_in_range(
+        start_points=[
+            Point2(np.mean([q.position_tuple for q in queens], axis=0).tolist())
+        ],
+        distances=[13.5],
+        query_tree=None,
+    )[0]
+
+    combat, movement = CombatQueens(*args), QueensMovement(*args)
+    creep, inject = CreepQueens(*args), InjectQueens(*args)
+    spotters: OverlordCreepSpotters = OverlordCreepSpotters(*args)
+    return {
+        "CombatQueens": lambda: combat.execute(
+            queens,
+            target=scenario["enemy_start"],
+            can_engage=True,
+            close_enemy=close_enemy,
+            engagement=SquadEngagement.ENGAGE,
+            spread_creep=True,
+            energy_plan=energy_plan,
+            **squad_helpers,
+        ),
+        "QueensMovement": lambda: movement.execute(
+            queens, target=scenario["enemy_start"], **squad_helpers
+        ),
+        "CreepQueens": lambda: creep.execute(queens, energy_plan=energy_plan),
+        "InjectQueens": lambda: inject.execute(
+            queens, inject_q_to_th_tags=inject_targets, energy_plan=energy_plan
+        ),
+        "OverlordCreepSpotters": lambda: spotters.execute(scenario["overlords"]),
+    }
+
+
+def measure(ai: FakeBot, run: Callable[[], None], steps: int) -> tuple[float, float]:
+    """ms per step and KiB allocated at peak per step."""
+
+    def next_step() -> None:
+        ai.state.game_loop += GAME_STEP
+        ai.time = ai.state.game_loop / 22.4
+
+    # warm up, fills caches and the maneuver pool
+    next_step()
+    run()
+
+    start: float = time.perf_counter()
+    for _ in range(steps):
+        next_step()
+        run()
+    elapsed: float = time.perf_counter() - start
+
+    peak: int = 0
+    tracemalloc.start()
+    for _ in range(min(steps, 10)):
+        next_step()
+        before: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return elapsed / steps * 1000, peak / 1024
+
+
+def sweep(args: argparse.Namespace, config: dict) -> dict[str, dict[int, dict]]:
+    enemy_types: list[UnitID] = [UnitID[name] for name in args.enemy_types]
+    results: dict[str, dict[int, dict]] = defaultdict(dict)
+    for size in args.sizes:
+        scenario: dict = make_scenario(
+            num_queens=size,
+            num_enemies=int(size * args.enemy_ratio),
+            num_tumors=int(size * args.tumor_ratio),
+            num_overlords=int(size * args.overlord_ratio),
+            enemy_types=enemy_types,
+            map_size=args.map_size,
+            seed=args.seed,
+        )
+        ai: FakeBot = make_bot(scenario, config)
+        for name, run in controller_runs(ai, scenario).items():
+            ms, kib = measure(ai, run, args.steps)
+            results[name][size] = {"ms": ms, "kib": kib}
+    return results
+
+
+def check(
+    results: dict[str, dict[int, dict]],
+    max_growth: float,
+    baseline: Optional[dict],
+    tolerance: float,
+) -> list[str]:
+    """Scaling regressions, empty if there are none."""
+    failures: list[str] = []
+    for name, by_size in results.items():
+        sizes: list[int] = sorted(by_size)
+        small, large = sizes[0], sizes[-1]
+        per_unit_small: float = by_size[small]["ms"] / small
+        per_unit_large: float = by_size[large]["ms"] / large
+        if per_unit_small > 0 and per_unit_large / per_unit_small > max_growth:
+            failures.append(
+                f"{name}: {per_unit_large / per_unit_small:.1f}x time per unit "
+                f"from {small} to {large} units (limit {max_growth}x)"
+            )
+        if not baseline or name not in baseline:
+            continue
+        for size in sizes:
+            previous: Optional[dict] = baseline[name].get(str(size), None)
+            if previous and by_size[size]["ms"] > previous["ms"] * (1 + tolerance):
+                failures.append(
+                    f"{name} @ {size}: {by_size[size]['ms']:.2f} ms, "
+                    f"baseline {previous['ms']:.2f} ms"
+                )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument(
+        "--enemy-types", nargs="+", default=["ZERGLING", "ROACH", "MUTALISK"]
+    )
+    parser.add_argument("--enemy-ratio", type=float, default=1.0)
+    parser.add_argument("--tumor-ratio", type=float, default=0.5)
+    parser.add_argument("--overlord-ratio", type=float, default=0.5)
+    parser.add_argument("--map-size", type=int, default=160)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-growth", type=float, default=2.0)
+    parser.add_argument("--baseline", type=str, default="")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--save", type=str, default="")
+    args = parser.parse_args()
+
+    with open(path.join(ROOT, "config.yml")) as config_file:
+        config: dict = yaml.safe_load(config_file)
+
+    results: dict[str, dict[int, dict]] = sweep(args, config)
+    print(f"{'controller':22s} {'units':>6s} {'ms/step':>9s} {'KiB/step':>9s}")
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            print(f"{name:22s} {size:6d} {result['ms']:9.3f} {result['kib']:9.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline: Optional[dict] = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if failures := check(results, args.max_growth, baseline, args.tolerance):
+        print("\n".join(["", "scaling regressions:"] + failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
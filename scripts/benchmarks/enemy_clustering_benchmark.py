@@ -0,0 +1,123 @@
+"""
+Time enemy clustering and squad assignment as the enemy count grows.
+
+Enemies are placed in `--groups` blobs over a `--map-size` map. For each
+enemy count the grid clustering (`cluster_enemies`) is timed against a
+pairwise center of mass like `cy_find_units_center_mass`, which counts the
+neighbours of every enemy and only finds the one biggest group. Then
+`--squads` queen squads are handed out to the clusters with
+`assign_squads`, and the report shows how many separate groups they cover
+and how many squads were strong enough for none of them.
+
+The pairwise reference is NumPy rather than the Cython original, so the
+absolute numbers differ in game; what matters is how each grows.
+
+Usage:
+    python scripts/benchmarks/enemy_clustering_benchmark.py --groups 4
+"""
+import argparse
+import sys
+import timeit
+from os import path
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.enemy_clustering import (  # noqa: E402
+    EnemyClusters,
+    assign_squads,
+    cluster_enemies,
+)
+
+QUEEN_HP: float = 175.0
+QUEEN_DPS: float = 11.2
+
+
+def make_enemies(
+    rng: np.random.Generator, num: int, groups: int, map_size: float
+) -> np.ndarray:
+    centers: np.ndarray = rng.uniform(20.0, map_size - 20.0, (groups, 2))
+    members: np.ndarray = rng.integers(groups, size=num)
+    positions: np.ndarray = centers[members] + rng.normal(0.0, 3.0, (num, 2))
+    return np.clip(positions, 0.0, map_size).astype(np.float32)
+
+
+def pairwise_center_mass(positions: np.ndarray, distance: float) -> tuple:
+    offsets: np.ndarray = positions[:, None, :] - positions[None, :, :]
+    close: np.ndarray = (offsets**2).sum(axis=2) < distance * distance
+    counts: np.ndarray = close.sum(axis=1)
+    best: int = int(np.argmax(counts))
+    return positions[best], int(counts[best])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[25, 100, 400])
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--squads", type=int, default=4)
+    parser.add_argument("--cell-size", type=float, default=6.0)
+    parser.add_argument("--min-share", type=float, default=0.1)
+    parser.add_argument("--squad-share", type=float, default=1.0)
+    parser.add_argument("--map-size", type=float, default=176.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    squad_positions: np.ndarray = rng.uniform(0.0, args.map_size, (args.squads, 2))
+    squad_queens: np.ndarray = rng.integers(2, 10, args.squads).astype(np.float64)
+    squad_hp: np.ndarray = squad_queens * QUEEN_HP
+    squad_dps: np.ndarray = squad_queens * QUEEN_DPS
+
+    print(f"{'enemies':>8} {'pairwise us':>12} {'grid us':>10} {'assign us':>10} "
+          f"{'clusters':>9} {'targets':>8} {'no target':>10}")  # fmt: skip
+    for num in args.counts:
+        positions: np.ndarray = make_enemies(rng, num, args.groups, args.map_size)
+        hp: np.ndarray = rng.uniform(35.0, 200.0, num)
+        dps: np.ndarray = rng.uniform(5.0, 20.0, num)
+
+        pairwise_us: float = (
+            timeit.timeit(lambda: pairwise_center_mass(positions, 12.5), number=20)
+            / 20
+            * 1e6
+        )
+        grid_us: float = (
+            timeit.timeit(
+                lambda: cluster_enemies(positions, hp, dps, args.cell_size), number=20
+            )
+            / 20
+            * 1e6
+        )
+        clusters: EnemyClusters = cluster_enemies(positions, hp, dps, args.cell_size)
+        assign_us: float = (
+            timeit.timeit(
+                lambda: assign_squads(
+                    squad_positions,
+                    squad_hp,
+                    squad_dps,
+                    clusters,
+                    args.min_share,
+                    args.squad_share,
+                ),
+                number=200,
+            )
+            / 200
+            * 1e6
+        )
+        assigned: np.ndarray = assign_squads(
+            squad_positions,
+            squad_hp,
+            squad_dps,
+            clusters,
+            args.min_share,
+            args.squad_share,
+        )
+        print(
+            f"{num:>8} {pairwise_us:>12.1f} {grid_us:>10.1f} {assign_us:>10.1f} "
+            f"{len(clusters):>9} {len(np.unique(assigned[assigned >= 0])):>8} "
+            f"{int((assigned < 0).sum()):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Time `EnemyMemory` updates and queries against filtering enemy lists.
+
+`--enemies` enemy units and structures spread over a `--map-size` map, of
+which a random `--visible` share is in vision each frame. Every frame the
+memory observes what is visible, forgets what is in vision but gone, and
+expires old entries; then the attack target (closest structure to our
+start) and the nydus candidates (every townhall) are looked up. The
+baseline does the same lookups by filtering a list of the visible enemies
+in Python, the way `enemy_structures(...)` does.
+
+Also reports how often the target had to fall back to the enemy start
+location because nothing was visible, with and without the memory.
+
+Usage:
+    python scripts/benchmarks/enemy_memory_benchmark.py --enemies 300
+"""
+import argparse
+import sys
+import timeit
+from dataclasses import dataclass
+from os import path
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.enemy_memory import STRUCTURE, EnemyMemory  # noqa: E402
+
+# unit type ids, same values as sc2's UnitTypeId
+HATCHERY: int = 86
+LAIR: int = 100
+HIVE: int = 101
+ZERGLING: int = 105
+ROACH: int = 110
+SPINECRAWLER: int = 98
+TOWNHALLS: set[int] = {HATCHERY, LAIR, HIVE}
+
+
+@dataclass
+class FakeEnemy:
+    tag: int
+    position: tuple[float, float]
+    type_id: int
+    is_structure: bool
+    health: float
+    health_max: float
+
+
+def make_enemies(rng: np.random.Generator, num: int, map_size: float) -> list:
+    enemies: list[FakeEnemy] = []
+    for tag in range(num):
+        structure: bool = rng.random() < 0.3
+        type_id: int = int(
+            rng.choice([HATCHERY, LAIR, SPINECRAWLER, SPINECRAWLER])
+            if structure
+            else rng.choice([ZERGLING, ROACH])
+        )
+        enemies.append(
+            FakeEnemy(
+                tag=tag + 1,
+                position=tuple(rng.uniform(0.0, map_size, 2).tolist()),
+                type_id=type_id,
+                is_structure=structure,
+                health=float(rng.uniform(10.0, 1500.0)),
+                health_max=1500.0,
+            )
+        )
+    return enemies
+
+
+def closest(enemies: list, point: tuple[float, float]) -> FakeEnemy:
+    return min(
+        enemies,
+        key=lambda e: (e.position[0] - point[0]) ** 2 + (e.position[1] - point[1]) ** 2,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--enemies", type=int, default=300)
+    parser.add_argument("--visible", type=float, default=0.2)
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--map-size", type=float, default=176.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    enemies: list[FakeEnemy] = make_enemies(rng, args.enemies, args.map_size)
+    start: tuple[float, float] = (20.0, 20.0)
+    size: int = int(args.map_size)
+    visibility: np.ndarray = np.zeros((size, size), dtype=np.uint8)
+    frames: list[list[FakeEnemy]] = [
+        [e for e in enemies if rng.random() < args.visible] for _ in range(args.frames)
+    ]
+
+    memory: EnemyMemory = EnemyMemory()
+    stats: dict[str, int] = {"fallback_visible": 0, "fallback_memory": 0}
+
+    # in game these come straight from `EnemySpatialIndex`'s arrays
+    observations: list[tuple] = [
+        (
+            [e.tag for e in visible],
+            np.array([e.position for e in visible], dtype=np.float32).reshape(-1, 2),
+            np.array([e.type_id for e in visible], dtype=np.int32),
+            np.array([STRUCTURE if e.is_structure else 0 for e in visible], np.uint8),
+            np.array([e.health for e in visible], dtype=np.float32),
+            np.array([e.health_max for e in visible], dtype=np.float32),
+        )
+        for visible in frames
+    ]
+
+    def memory_frame(frame: int) -> None:
+        time: float = frame / 22.4
+        memory.observe(*observations[frame], time)
+        memory.forget_unseen(visibility, time)
+        memory.expire(time, 60.0, 600.0)
+        structures: np.ndarray = memory.query(include_flags=STRUCTURE)
+        if structures.size:
+            memory.closest(structures, start)
+        else:
+            stats["fallback_memory"] += 1
+        memory.query(type_ids=TOWNHALLS)
+
+    def filter_frame(frame: int) -> None:
+        visible: list[FakeEnemy] = frames[frame]
+        structures: list[FakeEnemy] = [e for e in visible if e.is_structure]
+        if structures:
+            closest(structures, start)
+        else:
+            stats["fallback_visible"] += 1
+        [e for e in visible if e.type_id in TOWNHALLS]
+
+    memory_s: float = timeit.timeit(
+        lambda: [memory_frame(f) for f in range(args.frames)], number=1
+    )
+    filter_s: float = timeit.timeit(
+        lambda: [filter_frame(f) for f in range(args.frames)], number=1
+    )
+
+    print(
+        f"{args.enemies} enemies, {args.visible:.0%} visible per frame, "
+        f"{len(memory)} remembered at the end"
+    )
+    print(f"filter visible: {filter_s / args.frames * 1e6:8.1f} us per frame")
+    print(f"enemy memory:   {memory_s / args.frames * 1e6:8.1f} us per frame")
+
+    lookup_us: float = (
+        timeit.timeit(lambda: memory.query(type_ids=TOWNHALLS), number=1000)
+        / 1000
+        * 1e6
+    )
+    print(f"townhall lookup from memory: {lookup_us:8.1f} us")
+    print(
+        "frames falling back to the enemy start location: "
+        f"{stats['fallback_visible']} visible only, {stats['fallback_memory']} memory"
+    )
+
+
+if __name__ == "__main__":
+    main()
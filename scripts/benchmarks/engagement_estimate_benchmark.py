@@ -0,0 +1,188 @@
+"""
+Check the Lanchester engagement estimate against a reference fight sim.
+
+Random fights between armies of 1 to `--max-units` units (per type dps,
+health, and which units can hit air), like the ones `CombatManager` and the
+queen controllers ask about. Fights with a strength ratio beyond
+`--confident-ratio` either way are answered by the estimate, the rest would
+go to the full combat sim. Reports how many fights skip the sim, how often
+the estimate agrees with the reference sim on those, and the time saved.
+
+ares' combat sim needs the game, so the reference here is a small per unit
+sim: every unit hits a random enemy it can target each tick, dead units stop
+fighting. Set `--sim-cost-us` to the real `can_win_fight` cost to estimate
+the saving in game; in game agreement is in the telemetry columns. Also
+times `--squads` queen squads estimated one by one against in one batch.
+
+Usage:
+    python scripts/benchmarks/engagement_estimate_benchmark.py --fights 2000
+"""
+import argparse
+import math
+import sys
+import timeit
+from os import path
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.engagement_estimate import (  # noqa: E402
+    lanchester_log_ratio,
+    squad_log_ratios,
+)
+
+# name: (ground dps, air dps, health plus shields, flying)
+UNIT_TYPES: dict[str, tuple[float, float, float, bool]] = {
+    "queen": (11.2, 12.6, 175.0, False),
+    "zergling": (10.0, 0.0, 35.0, False),
+    "roach": (11.2, 0.0, 145.0, False),
+    "hydralisk": (22.4, 22.4, 90.0, False),
+    "mutalisk": (11.2, 11.2, 120.0, True),
+    "marine": (9.8, 9.8, 45.0, False),
+    "marauder": (9.3, 0.0, 125.0, False),
+    "zealot": (18.6, 0.0, 150.0, False),
+    "stalker": (9.7, 9.7, 160.0, False),
+    "banshee": (27.0, 0.0, 140.0, True),
+}
+TICK: float = 0.5
+
+
+def make_army(rng: np.random.Generator, max_units: int) -> np.ndarray:
+    """(n, 4) ground dps, air dps, health, flying; one or two unit types."""
+    names: list[str] = list(UNIT_TYPES)
+    kinds = rng.choice(len(names), size=int(rng.integers(1, 3)), replace=False)
+    rows: list = []
+    for kind in kinds:
+        rows += [UNIT_TYPES[names[kind]]] * int(rng.integers(1, max_units + 1))
+    return np.array(rows, dtype=np.float64)
+
+
+def estimate(own: np.ndarray, enemy: np.ndarray) -> float:
+    return lanchester_log_ratio(
+        own[:, 0], own[:, 1], own[:, 2], own[:, 3] > 0,
+        enemy[:, 0], enemy[:, 1], enemy[:, 2], enemy[:, 3] > 0,
+    )  # fmt: skip
+
+
+def reference_sim(own: np.ndarray, enemy: np.ndarray, rng: np.random.Generator) -> bool:
+    """True if we have units left when the fight ends."""
+    sides: list[np.ndarray] = [own.copy(), enemy.copy()]
+    for _ in range(2000):
+        alive: list[np.ndarray] = [side[:, 2] > 0 for side in sides]
+        if not alive[0].any() or not alive[1].any():
+            break
+        damage: list[np.ndarray] = [np.zeros(len(side)) for side in sides]
+        for attacker, defender in ((0, 1), (1, 0)):
+            targets: np.ndarray = sides[defender]
+            target_alive: np.ndarray = alive[defender]
+            for unit in sides[attacker][alive[attacker]]:
+                for dps, can_hit in (
+                    (unit[0], targets[:, 3] == 0),
+                    (unit[1], targets[:, 3] > 0),
+                ):
+                    choices: np.ndarray = np.flatnonzero(target_alive & can_hit)
+                    if dps > 0 and len(choices):
+                        damage[defender][rng.choice(choices)] += dps * TICK
+                        break
+        for side, dealt in zip(sides, damage):
+            side[:, 2] -= dealt
+    return bool((sides[0][:, 2] > 0).any())
+
+
+def squad_batch_times(
+    rng: np.random.Generator, num_squads: int, max_units: int
+) -> tuple[float, float]:
+    """us per step estimating every squad one by one, and in one batch.
+
+    Enemies are shared between neighbouring squads, like squads spread
+    around a fight.
+    """
+    squads: list[np.ndarray] = [
+        np.array([UNIT_TYPES["queen"]] * int(rng.integers(2, 12)))
+        for _ in range(num_squads)
+    ]
+    enemies: np.ndarray = make_army(rng, max_units * num_squads)
+    membership: np.ndarray = np.zeros((num_squads, len(enemies)), dtype=bool)
+    for i in range(num_squads):
+        start: int = int(rng.integers(len(enemies)))
+        membership[i, start : start + max_units] = True
+    own: np.ndarray = np.concatenate(squads)
+    own_squad: np.ndarray = np.repeat(np.arange(num_squads), [len(s) for s in squads])
+
+    def one_by_one() -> None:
+        for squad, near in zip(squads, membership):
+            estimate(squad, enemies[near])
+
+    def batch() -> None:
+        squad_log_ratios(
+            own_squad, own[:, 0], own[:, 1], own[:, 2], own[:, 3] > 0,
+            membership,
+            enemies[:, 0], enemies[:, 1], enemies[:, 2], enemies[:, 3] > 0,
+        )  # fmt: skip
+
+    return (
+        timeit.timeit(one_by_one, number=200) / 200 * 1e6,
+        timeit.timeit(batch, number=200) / 200 * 1e6,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fights", type=int, default=2000)
+    parser.add_argument("--max-units", type=int, default=30)
+    parser.add_argument("--confident-ratio", type=float, default=2.5)
+    parser.add_argument("--sim-cost-us", type=float, default=0.0)
+    parser.add_argument("--squads", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    fights: list[tuple[np.ndarray, np.ndarray]] = [
+        (make_army(rng, args.max_units), make_army(rng, args.max_units))
+        for _ in range(args.fights)
+    ]
+    confident: float = math.log(args.confident_ratio)
+
+    num_confident: int = 0
+    agreed: int = 0
+    for own, enemy in fights:
+        log_ratio: float = estimate(own, enemy)
+        if math.isnan(log_ratio) or abs(log_ratio) < confident:
+            continue
+        num_confident += 1
+        agreed += reference_sim(own, enemy, rng) == (log_ratio > 0.0)
+
+    estimate_us: float = (
+        timeit.timeit(lambda: [estimate(o, e) for o, e in fights], number=3)
+        / (3 * len(fights))
+        * 1e6
+    )
+    sim_sample: list = fights[:100]
+    sim_us: float = args.sim_cost_us or (
+        timeit.timeit(
+            lambda: [reference_sim(o, e, rng) for o, e in sim_sample], number=1
+        )
+        / len(sim_sample)
+        * 1e6
+    )
+    share: float = num_confident / len(fights)
+    # every fight pays for the estimate, only the ambiguous ones for the sim
+    before: float = sim_us
+    after: float = estimate_us + (1.0 - share) * sim_us
+
+    print(f"{len(fights)} fights, confident ratio {args.confident_ratio}")
+    print(f"answered by the estimate: {share:6.1%}")
+    print(f"agreement with the sim:   {agreed / max(num_confident, 1):6.1%}")
+    print(f"estimate: {estimate_us:8.1f} us, sim: {sim_us:8.1f} us per fight")
+    print(f"per fight: {before:8.1f} us -> {after:8.1f} us")
+
+    loop_us, batch_us = squad_batch_times(rng, args.squads, args.max_units)
+    print(
+        f"{args.squads} squads: {loop_us:8.1f} us one by one, "
+        f"{batch_us:8.1f} us in one batch"
+    )
+
+
+if __name__ == "__main__":
+    main()
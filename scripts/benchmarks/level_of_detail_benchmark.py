@@ -0,0 +1,87 @@
+"""
+Count the per step work for a large idle queen army, with and without LOD.
+
+Without level of detail every queen gets a full `CombatManeuver` every
+step (two `KeepUnitSafe`, a transfuse, three `ShootTargetInRange` and a
+move, so seven ares behaviours each). With `LevelOfDetailScheduler` only
+queens near an enemy do, the rest get one order every `CalmInterval` game
+loops. Queens idle at the natural while small enemy groups walk past now
+and then. Also times the contested / due split itself.
+
+Usage:
+    python scripts/benchmarks/level_of_detail_benchmark.py --queens 60
+"""
+import argparse
+import sys
+import timeit
+from os import path
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.level_of_detail import contested_mask, due_mask  # noqa: E402
+
+BEHAVIOURS_PER_MANEUVER: int = 7
+CONTESTED_RADIUS: float = 15.0
+CALM_INTERVAL: int = 16
+GAME_STEP: int = 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queens", type=int, default=60)
+    parser.add_argument("--minutes", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    natural: np.ndarray = np.array([40.0, 40.0])
+    queens: np.ndarray = natural + rng.normal(0.0, 4.0, (args.queens, 2))
+    last_order: np.ndarray = np.full(args.queens, -1000000)
+
+    steps: int = int(args.minutes * 60 * 22.4 / GAME_STEP)
+    full_maneuvers: int = 0
+    lod_maneuvers: int = 0
+    calm_orders: int = 0
+    enemies: np.ndarray = np.empty((0, 2))
+    for step in range(steps):
+        game_loop: int = step * GAME_STEP
+        # an enemy group walks past the natural roughly once a minute
+        if step % 670 == 0:
+            enemies = natural + np.array([30.0, 0.0]) + rng.normal(0.0, 2.0, (8, 2))
+        enemies = enemies + np.array([-0.25, 0.0])
+        visible: np.ndarray = enemies[np.abs(enemies[:, 0] - natural[0]) < 40.0]
+
+        contested: np.ndarray = contested_mask(queens, visible, CONTESTED_RADIUS)
+        due: np.ndarray = ~contested & due_mask(last_order, game_loop, CALM_INTERVAL)
+        last_order[due] = game_loop
+        last_order[contested] = -1000000
+
+        full_maneuvers += args.queens
+        lod_maneuvers += int(contested.sum())
+        calm_orders += int(due.sum())
+
+    split_time: float = timeit.timeit(
+        lambda: (
+            contested_mask(queens, visible, CONTESTED_RADIUS),
+            due_mask(last_order, game_loop, CALM_INTERVAL),
+        ),
+        number=1000,
+    )
+
+    print(f"{args.queens} queens, {steps} steps")
+    print(
+        f"full micro: {full_maneuvers / steps:6.1f} maneuvers/step "
+        f"({full_maneuvers / steps * BEHAVIOURS_PER_MANEUVER:6.1f} behaviours)"
+    )
+    print(
+        f"LOD:        {lod_maneuvers / steps:6.1f} maneuvers/step "
+        f"({lod_maneuvers / steps * BEHAVIOURS_PER_MANEUVER:6.1f} behaviours) "
+        f"+ {calm_orders / steps:5.1f} calm orders/step"
+    )
+    print(f"split: {split_time * 1000:.1f} us per step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Count the behaviour objects built per step for a big queen army, with and
+without `ManeuverPool`.
+
+Every queen gets the `CombatQueens` maneuver (two `KeepUnitSafe`, three
+`ShootTargetInRange`, a transfuse and a move). ares is not needed, the
+behaviours are stand-in dataclasses with the same fields. Like ares, a
+maneuver is "executed" when registered; the registered maneuvers are kept
+until the end of the step so tracemalloc can count what the step built.
+
+Usage:
+    python scripts/benchmarks/maneuver_pool_benchmark.py --queens 200
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from os import path
+from types import SimpleNamespace
+from typing import Any, Optional
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.unit_control.maneuver_pool import ManeuverPool  # noqa: E402
+
+GAME_STEP: int = 2
+
+
+@dataclass
+class CombatManeuver:
+    micros: list = field(default_factory=list)
+
+    def add(self, behavior: Any) -> None:
+        self.micros.append(behavior)
+
+
+@dataclass
+class KeepUnitSafe:
+    unit: Any
+    grid: Any
+
+
+@dataclass
+class ShootTargetInRange:
+    unit: Any
+    targets: Any
+    extra_range: float = 0.0
+
+
+@dataclass
+class UseTransfuse:
+    unit: Any
+    targets: Any
+
+
+@dataclass
+class UseAbility:
+    ability: Any
+    unit: Any
+    target: Optional[Any] = None
+
+
+class _Registry:
+    def track(self, *args, **kwargs) -> None:
+        pass
+
+
+class _Pool(ManeuverPool):
+    """`ManeuverPool` with the stand-in `CombatManeuver`."""
+
+    def maneuver(self, tag: int) -> CombatManeuver:
+        maneuver: Optional[CombatManeuver] = self._next_template(tag, CombatManeuver)
+        if maneuver is None:
+            return self._store(tag, CombatManeuver())
+        maneuver.micros.clear()
+        return maneuver
+
+
+def step(queens: list, pool: Optional[ManeuverPool], registered: list) -> None:
+    grid, enemies = object(), []
+    for queen in queens:
+        tag: int = queen.tag
+        if pool:
+            maneuver = pool.maneuver(tag)
+            maneuver.add(pool.get(tag, KeepUnitSafe, queen, grid))
+            maneuver.add(pool.get(tag, UseTransfuse, queen, queens))
+            for _ in range(3):
+                maneuver.add(pool.get(tag, ShootTargetInRange, queen, enemies))
+            maneuver.add(pool.get(tag, KeepUnitSafe, queen, grid))
+            maneuver.add(pool.get(tag, UseAbility, "MOVE_MOVE", queen, (0.0, 0.0)))
+        else:
+            maneuver = CombatManeuver()
+            maneuver.add(KeepUnitSafe(queen, grid))
+            maneuver.add(UseTransfuse(queen, queens))
+            for _ in range(3):
+                maneuver.add(ShootTargetInRange(queen, enemies))
+            maneuver.add(KeepUnitSafe(queen, grid))
+            maneuver.add(UseAbility("MOVE_MOVE", queen, (0.0, 0.0)))
+        registered.append(maneuver)
+
+
+def run(queens: list, pooled: bool, steps: int) -> tuple[float, float, float]:
+    """Objects built per step, ms per step and gc collections per 100 steps."""
+    ai = SimpleNamespace(state=SimpleNamespace(game_loop=0), tag_registry=_Registry())
+    pool: Optional[ManeuverPool] = _Pool(ai) if pooled else None
+    # warm up, fills the pool
+    step(queens, pool, [])
+
+    objects: int = 0
+    tracemalloc.start()
+    for i in range(steps):
+        ai.state.game_loop = (i + 1) * GAME_STEP
+        registered: list = []
+        before = tracemalloc.take_snapshot()
+        step(queens, pool, registered)
+        after = tracemalloc.take_snapshot()
+        objects += sum(
+            s.count_diff for s in after.compare_to(before, "lineno") if s.count_diff > 0
+        )
+    tracemalloc.stop()
+
+    collections: list[int] = [0]
+
+    def count_collections(phase: str, info: dict) -> None:
+        if phase == "start":
+            collections[0] += 1
+
+    gc.callbacks.append(count_collections)
+    start: float = time.perf_counter()
+    for i in range(steps):
+        ai.state.game_loop = (steps + i + 1) * GAME_STEP
+        step(queens, pool, [])
+    elapsed: float = time.perf_counter() - start
+    gc.callbacks.remove(count_collections)
+    return objects / steps, elapsed / steps * 1000, collections[0] / steps * 100
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queens", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    queens: list = [SimpleNamespace(tag=i) for i in range(args.queens)]
+    for name, pooled in (("allocate", False), ("pooled", True)):
+        objects, ms, collections = run(queens, pooled, args.steps)
+        print(
+            f"{name:9s} {objects:8.0f} objects/step {ms:6.2f} ms/step "
+            f"{collections:6.1f} gc runs/100 steps"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Simulate a queen squad travelling through our nydus network.
+
+Before the transit scheduler every queen used the entrance ares' pathing
+picked for the squad centre, so they all queued at one entrance. This
+compares that against `plan_nydus_transit` spreading the squad over every
+entrance, using the same load / unload model, and times the planner.
+
+Usage:
+    python scripts/benchmarks/nydus_transit_benchmark.py --queens 20 --entrances 3
+"""
+import argparse
+import sys
+import timeit
+from os import path
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.nydus_transit import (  # noqa: E402
+    NydusTransitPlan,
+    plan_nydus_transit,
+)
+
+# queen speed on creep
+QUEEN_SPEED: float = 3.5
+LOAD_TIME: float = 0.5
+UNLOAD_TIME: float = 0.25
+
+
+def single_entrance(
+    queen_positions: np.ndarray, entrance_positions: np.ndarray
+) -> NydusTransitPlan:
+    """Everyone queues at the entrance closest to the squad centre."""
+    centre: np.ndarray = queen_positions.mean(axis=0)
+    entrance_idx: int = int(
+        np.argmin(np.sum((entrance_positions - centre) ** 2, axis=1))
+    )
+    return plan_nydus_transit(
+        queen_positions,
+        np.full(len(queen_positions), QUEEN_SPEED),
+        entrance_positions[entrance_idx : entrance_idx + 1],
+        np.zeros(1),
+        LOAD_TIME,
+        UNLOAD_TIME,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queens", type=int, default=20)
+    parser.add_argument("--entrances", type=int, default=3)
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(0)
+    baseline_total: list[float] = []
+    baseline_squad: list[float] = []
+    scheduled_total: list[float] = []
+    scheduled_squad: list[float] = []
+    for _ in range(args.games):
+        # a squad bunched up somewhere in our base, entrances spread around it
+        squad_centre: np.ndarray = rng.uniform(30.0, 50.0, 2)
+        queen_positions: np.ndarray = squad_centre + rng.normal(
+            0.0, 3.0, (args.queens, 2)
+        )
+        entrance_positions: np.ndarray = rng.uniform(20.0, 60.0, (args.entrances, 2))
+
+        baseline: NydusTransitPlan = single_entrance(
+            queen_positions, entrance_positions
+        )
+        scheduled: NydusTransitPlan = plan_nydus_transit(
+            queen_positions,
+            np.full(args.queens, QUEEN_SPEED),
+            entrance_positions,
+            np.zeros(args.entrances),
+            LOAD_TIME,
+            UNLOAD_TIME,
+        )
+        baseline_total.append(baseline.total_transit_time)
+        baseline_squad.append(baseline.squad_transit_time)
+        scheduled_total.append(scheduled.total_transit_time)
+        scheduled_squad.append(scheduled.squad_transit_time)
+
+    plan_time: float = timeit.timeit(
+        lambda: plan_nydus_transit(
+            queen_positions,
+            np.full(args.queens, QUEEN_SPEED),
+            entrance_positions,
+            np.zeros(args.entrances),
+            LOAD_TIME,
+            UNLOAD_TIME,
+        ),
+        number=1000,
+    )
+
+    print(f"{args.queens} queens, {args.entrances} entrances, {args.games} squads")
+    print(
+        f"single entrance: total {np.mean(baseline_total):7.1f}s, "
+        f"last queen out {np.mean(baseline_squad):5.1f}s"
+    )
+    print(
+        f"scheduled:       total {np.mean(scheduled_total):7.1f}s, "
+        f"last queen out {np.mean(scheduled_squad):5.1f}s"
+    )
+    print(f"planning: {plan_time * 1000:.1f} us per squad")
+
+
+if __name__ == "__main__":
+    main()
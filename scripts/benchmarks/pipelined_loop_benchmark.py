@@ -0,0 +1,124 @@
+"""
+Measure the latency saved by the pipelined game loop against a stub SC2 server.
+
+A local websocket server stands in for the SC2 API: every request gets a reply
+after `--latency` ms. Each simulated step does `--foreground` ms of CPU work
+that needs the new state (`on_step`), `--background` ms of work that doesn't
+(split into `--jobs` background jobs), then the three round trips the game
+loop makes (actions, observation, game info).
+
+Usage:
+    python scripts/benchmarks/pipelined_loop_benchmark.py --latency 4 --background 6
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import deque
+from multiprocessing import Process
+from os import path
+from typing import Callable, Optional
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.pipelined_game import overlap_with_background_work  # noqa: E402
+
+HOST: str = "127.0.0.1"
+PORT: int = 5677
+ROUND_TRIPS_PER_STEP: int = 3
+
+
+def busy_wait(ms: float) -> None:
+    end: float = time.perf_counter() + ms / 1000.0
+    while time.perf_counter() < end:
+        pass
+
+
+def run_stub_server(latency: float) -> None:
+    """Runs in its own process, like the real SC2 client would."""
+
+    async def sc2api(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            await asyncio.sleep(latency / 1000.0)
+            await ws.send_bytes(msg.data)
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/sc2api", sc2api)
+    web.run_app(app, host=HOST, port=PORT, print=None)
+
+
+async def play(
+    ws: aiohttp.ClientWebSocketResponse, args: argparse.Namespace, pipelined: bool
+) -> float:
+    jobs: deque[Callable[[], None]] = deque()
+
+    def next_job() -> Optional[Callable[[], None]]:
+        return jobs.popleft() if jobs else None
+
+    async def round_trips() -> None:
+        for _ in range(ROUND_TRIPS_PER_STEP):
+            await ws.send_bytes(b"request")
+            await ws.receive_bytes()
+
+    start: float = time.perf_counter()
+    for _ in range(args.steps):
+        # leftover jobs run before the step, like `MyBot.on_step`
+        while job := next_job():
+            job()
+        busy_wait(args.foreground)
+        for _ in range(args.jobs):
+            jobs.append(lambda: busy_wait(args.background / args.jobs))
+
+        if pipelined:
+            await overlap_with_background_work(round_trips(), next_job)
+        else:
+            while job := next_job():
+                job()
+            await round_trips()
+    return (time.perf_counter() - start) / args.steps * 1000.0
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=4.0, help="ms per reply")
+    parser.add_argument("--foreground", type=float, default=10.0, help="ms")
+    parser.add_argument("--background", type=float, default=6.0, help="ms")
+    parser.add_argument("--jobs", type=int, default=6)
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    server = Process(target=run_stub_server, args=(args.latency,), daemon=True)
+    server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            for _ in range(50):
+                try:
+                    ws = await session.ws_connect(f"ws://{HOST}:{PORT}/sc2api")
+                    break
+                except aiohttp.ClientConnectionError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("Stub server did not start")
+            sequential: float = await play(ws, args, pipelined=False)
+            pipelined: float = await play(ws, args, pipelined=True)
+            await ws.close()
+    finally:
+        server.terminate()
+
+    print(
+        f"{args.steps} steps, {args.latency}ms per reply, "
+        f"{args.foreground}ms on_step, {args.background}ms background work"
+    )
+    print(f"sequential: {sequential:6.2f} ms/step")
+    print(f"pipelined:  {pipelined:6.2f} ms/step")
+    print(f"saved:      {sequential - pipelined:6.2f} ms/step")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+Measure how long the bot takes to start, before and after lazy imports.
+
+Each run is a fresh python process that does what `run.py` does before the
+game connects (`import bot.main`), then what `MyBot.on_start` imports before
+the first step. `eager` imports the managers up front like `bot/main.py`
+used to, `lazy` leaves them to `on_start`. Reported per mode:
+
+- import: seconds spent importing before the game connects
+- first step: process start until everything the first step needs is
+  imported (excludes launching SC2 itself)
+
+`--cold` gives every run an empty bytecode cache, like a freshly unzipped
+ladder bot. Point `--root` at an unzipped `create_ladder_zip.py --bytecode`
+bundle to compare it against the source tree.
+
+Usage:
+    python scripts/benchmarks/startup_benchmark.py --runs 10 --cold
+    python scripts/benchmarks/startup_benchmark.py --root /tmp/bot_zip --cold
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from os import environ, path
+
+import numpy as np
+
+ROOT: str = path.abspath(path.join(path.dirname(__file__), "..", ".."))
+
+# imported in `MyBot.on_start`
+ON_START_MODULES: list[str] = [
+    "bot.managers.base_distance_manager",
+    "bot.managers.combat_manager",
+    "bot.managers.decision_log_manager",
+    "bot.managers.enemy_intel_manager",
+    "bot.managers.energy_manager",
+    "bot.managers.game_step_manager",
+    "bot.managers.macro_manager",
+    "bot.managers.nydus_manager",
+    "bot.managers.performance_manager",
+    "bot.managers.queen_manager",
+    "bot.managers.scout_manager",
+    "bot.managers.telemetry_manager",
+    "bot.managers.worker_defence_manager",
+    "bot.unit_control.overlord_creep_spotters",
+]
+
+CHILD: str = """
+import importlib, json, sys, time
+sys.path.extend(
+    ["ares-sc2/src/ares", "ares-sc2/src", "ares-sc2", "queens-sc2",
+     "queens-sc2/queens_sc2"]
+)
+modules = {modules!r}
+start = time.perf_counter()
+if {eager!r}:
+    for module in modules:
+        importlib.import_module(module)
+import bot.main
+connect = time.perf_counter()
+for module in modules:
+    importlib.import_module(module)
+print(json.dumps({{"import": connect - start}}))
+"""
+
+
+def run_once(root: str, eager: bool, cold: bool) -> tuple[float, float]:
+    env: dict = dict(environ)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if cold:
+            env["PYTHONPYCACHEPREFIX"] = cache_dir
+        start: float = time.perf_counter()
+        output: str = subprocess.run(
+            [sys.executable, "-c", CHILD.format(modules=ON_START_MODULES, eager=eager)],
+            cwd=root,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        first_step: float = time.perf_counter() - start
+    return json.loads(output.splitlines()[-1])["import"], first_step
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", type=str, default=ROOT)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--cold", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{args.root}, {args.runs} runs, {'cold' if args.cold else 'warm'} cache")
+    for label, eager in (("eager", True), ("lazy", False)):
+        results: np.ndarray = np.array(
+            [run_once(args.root, eager, args.cold) for _ in range(args.runs)]
+        )
+        print(
+            f"{label:<6} import {np.median(results[:, 0]) * 1000:7.1f} ms, "
+            f"first step {np.median(results[:, 1]) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
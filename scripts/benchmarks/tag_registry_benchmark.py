@@ -0,0 +1,128 @@
+"""
+Check that tag keyed manager state stays bounded over a long game.
+
+Plays out a 30 minute game of unit churn (drones pulled to defend and dying,
+overlords morphing, queens pairing with townhalls that get killed) against
+stand-ins for the manager attributes `TagRegistry` tracks. The same game is
+run with and without the registry, printing how many tags are held and the
+memory they use.
+
+Usage:
+    python scripts/benchmarks/tag_registry_benchmark.py --minutes 30
+"""
+import argparse
+import random
+import sys
+import tracemalloc
+from os import path
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.tag_registry import TagRegistry  # noqa: E402
+
+STEPS_PER_MINUTE: int = int(22.4 * 60 / 2)
+MAX_ALIVE: int = 200
+
+
+class ManagerState:
+    """The tag keyed attributes of the managers, as in `bot/managers`."""
+
+    def __init__(self, registry: TagRegistry):
+        self.worker_defence_tags: list[int] = []
+        self.bunker_drone_tags: set[int] = set()
+        self.creep_queen_dropperlord_tags: set[int] = set()
+        self.inject_queen_to_th: dict[int, int] = {}
+        self.spotter_positions: dict[int, tuple[float, float]] = {}
+        self.roles: dict[int, str] = {}
+
+        registry.track(self, "worker_defence_tags", evict_on_type_change=True)
+        registry.track(self, "bunker_drone_tags", evict_on_type_change=True)
+        registry.track(self, "creep_queen_dropperlord_tags")
+        registry.track(self, "inject_queen_to_th", by_value=True)
+        registry.track(self, "spotter_positions", evict_on_type_change=True)
+        registry.track(self, "roles")
+
+    def num_tags(self) -> int:
+        return (
+            len(self.worker_defence_tags)
+            + len(self.bunker_drone_tags)
+            + len(self.creep_queen_dropperlord_tags)
+            + len(self.inject_queen_to_th)
+            + len(self.spotter_positions)
+            + len(self.roles)
+        )
+
+
+def play(minutes: int, use_registry: bool, seed: int) -> tuple[list[int], int]:
+    rng: random.Random = random.Random(seed)
+    registry: TagRegistry = TagRegistry()
+    state: ManagerState = ManagerState(registry)
+    alive: set[int] = set()
+    townhalls: list[int] = []
+    next_tag: int = 1
+    samples: list[int] = []
+
+    def new_unit() -> int:
+        nonlocal next_tag
+        next_tag += 1
+        alive.add(next_tag)
+        return next_tag
+
+    def destroy(tag: int) -> None:
+        alive.discard(tag)
+        if use_registry:
+            registry.on_unit_destroyed(tag)
+
+    tracemalloc.start()
+    for step in range(minutes * STEPS_PER_MINUTE):
+        # new units get a role, some drones are pulled to defend
+        if rng.random() < 0.3:
+            tag: int = new_unit()
+            state.roles[tag] = "GATHERING"
+            if rng.random() < 0.05:
+                state.worker_defence_tags.append(tag)
+            if rng.random() < 0.02:
+                state.bunker_drone_tags.add(tag)
+        # overlords spot creep, and occasionally morph
+        if rng.random() < 0.02:
+            tag = new_unit()
+            state.spotter_positions[tag] = (rng.random(), rng.random())
+            if rng.random() < 0.1:
+                state.creep_queen_dropperlord_tags.add(tag)
+                if use_registry:
+                    registry.on_unit_type_changed(tag)
+        # expand and pair a queen with the new townhall
+        if rng.random() < 0.002:
+            townhalls.append(new_unit())
+            state.inject_queen_to_th[new_unit()] = townhalls[-1]
+        # fights: random units die (supply capped army), townhalls get sniped
+        if len(alive) > MAX_ALIVE or (alive and rng.random() < 0.25):
+            destroy(rng.choice(tuple(alive)))
+        if len(townhalls) > 2 and rng.random() < 0.001:
+            destroy(townhalls.pop(rng.randrange(len(townhalls))))
+
+        if step % STEPS_PER_MINUTE == 0:
+            samples.append(state.num_tags())
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return samples, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for use_registry in (False, True):
+        samples, peak = play(args.minutes, use_registry, args.seed)
+        label: str = "with registry" if use_registry else "without registry"
+        print(
+            f"{label:<17} tags held every 5 min: "
+            f"{samples[::5]} (end {samples[-1]}), peak memory {peak / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
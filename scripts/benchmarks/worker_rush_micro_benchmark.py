@@ -0,0 +1,114 @@
+"""
+Benchmark the batch worker rush micro solver against a per drone Python loop.
+
+The per drone loop mirrors what `WorkerDefenceManager` used to do: every drone
+scans all enemies for in range targets, the closest enemy and the enemy
+closest to the mineral patch, and the stack check runs for every drone.
+
+Usage:
+    python scripts/benchmarks/worker_rush_micro_benchmark.py --drones 20 --enemies 20
+"""
+import argparse
+import math
+import sys
+import timeit
+from os import path
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..", "..")))
+
+from bot.managers.worker_rush_micro import solve_worker_rush_micro  # noqa: E402
+
+START_LOCATION: tuple[float, float] = (30.0, 30.0)
+MINERAL_POSITION: tuple[float, float] = (26.0, 33.0)
+DRONE_REACH: float = 0.1 + 0.375
+ENEMY_RADIUS: float = 0.375
+
+
+def make_scenario(num_drones: int, num_enemies: int, seed: int = 0) -> dict:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    return {
+        "drone_positions": rng.uniform(25.0, 35.0, (num_drones, 2)),
+        "drone_cooldowns": rng.choice([0.0, 0.0, 5.0, 15.0], num_drones),
+        "drone_reach": np.full(num_drones, DRONE_REACH),
+        "enemy_positions": rng.uniform(25.0, 35.0, (num_enemies, 2)),
+        "enemy_radii": np.full(num_enemies, ENEMY_RADIUS),
+        "enemy_health": rng.uniform(5.0, 40.0, num_enemies),
+        "enemy_armor": np.zeros(num_enemies),
+        "mineral_position": np.array(MINERAL_POSITION),
+        "start_location": np.array(START_LOCATION),
+    }
+
+
+def per_drone_loop(scenario: dict) -> list[int]:
+    drones: list = scenario["drone_positions"].tolist()
+    cooldowns: list = scenario["drone_cooldowns"].tolist()
+    enemies: list = scenario["enemy_positions"].tolist()
+    health: list = scenario["enemy_health"].tolist()
+    mineral: tuple = MINERAL_POSITION
+
+    def stack_detected() -> bool:
+        if len(enemies) <= 5:
+            return False
+        cx = sum(e[0] for e in enemies) / len(enemies)
+        cy = sum(e[1] for e in enemies) / len(enemies)
+        if (cx - START_LOCATION[0]) ** 2 + (cy - START_LOCATION[1]) ** 2 > 122:
+            return False
+        return sum(1 for e in enemies if math.dist(e, (cx, cy)) < 0.5) > 5
+
+    targets: list[int] = []
+    for drone, cooldown in zip(drones, cooldowns):
+        in_range: list[int] = [
+            i
+            for i, e in enumerate(enemies)
+            if math.dist(drone, e) <= DRONE_REACH + ENEMY_RADIUS
+        ]
+        in_range_target = min(in_range, key=lambda i: health[i]) if in_range else None
+        closest: int = min(
+            range(len(enemies)), key=lambda i: math.dist(drone, enemies[i])
+        )
+        near_mineral: int = min(
+            range(len(enemies)), key=lambda i: math.dist(mineral, enemies[i])
+        )
+        if math.dist(enemies[near_mineral], mineral) < 2 and stack_detected():
+            targets.append(-1)
+        elif in_range_target is not None and cooldown == 0:
+            targets.append(in_range_target)
+        elif cooldown == 0:
+            targets.append(closest)
+        else:
+            targets.append(-1)
+    return targets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drones", type=int, default=20)
+    parser.add_argument("--enemies", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    scenario: dict = make_scenario(args.drones, args.enemies)
+    batch: float = timeit.timeit(
+        lambda: solve_worker_rush_micro(**scenario), number=args.repeat
+    )
+    loop: float = timeit.timeit(lambda: per_drone_loop(scenario), number=args.repeat)
+
+    result = solve_worker_rush_micro(**scenario)
+    targets: np.ndarray = result.targets[result.targets >= 0]
+    hits_needed: np.ndarray = np.ceil(scenario["enemy_health"] / 5.0)
+    overkill: int = int(
+        np.sum(
+            np.maximum(np.bincount(targets, minlength=args.enemies) - hits_needed, 0)
+        )
+    )
+
+    print(f"{args.drones} drones vs {args.enemies} enemies, {args.repeat} runs")
+    print(f"batch solver:   {batch / args.repeat * 1e6:8.1f} us/step")
+    print(f"per drone loop: {loop / args.repeat * 1e6:8.1f} us/step")
+    print(f"drones attacking: {targets.size}, wasted (overkill) attacks: {overkill}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,14 @@ Zips the relevant files and directories so that Bot can be updated
 to ladder or tournaments.
 TODO: check all files and folders are present before zipping
 """
+import argparse
 import os
 import platform
+import py_compile
 import shutil
 import site
+import sys
+import tempfile
 import zipfile
 from os import path, remove, walk
 from subprocess import Popen, run
@@ -16,6 +20,8 @@ import yaml
 
 MY_BOT_NAME: str = "MyBotName"
 ZIPFILE_NAME: str = "bot.zip"
+# shipped as optimized bytecode with `--bytecode`, everything else stays source
+BYTECODE_DIRECTORIES: List[str] = ["bot"]
 
 CONFIG_FILE: str = "config.yml"
 ZIP_FILES: List[str] = [
@@ -81,8 +87,45 @@ def zip_dir(dir_path, zip_file):
             )
 
 
-def zip_files_and_directories(zipfile_name: str) -> None:
+def zip_bytecode(dir_path, zip_file):
     """
+    Like `zip_dir`, but python files are compiled and only the `.pyc` is added.
+    Sourceless `.pyc` files are imported directly, so the ladder skips compiling
+    our modules on startup. They only load on the python version that built
+    them, so build the zip with the ladder's python version
+    @param dir_path:
+    @param zip_file:
+    @return:
+    """
+    with tempfile.TemporaryDirectory() as build_dir:
+        for root, _, files in walk(dir_path):
+            if any(exclude in root for exclude in EXCLUDE):
+                continue
+            for file in files:
+                if file.lower().endswith(FILETYPES_TO_IGNORE) or file.endswith(
+                    (".pyc", ".pyo")
+                ):
+                    continue
+                arcname: str = path.relpath(
+                    path.join(root, file), path.join(dir_path, "..")
+                )
+                if not file.endswith(".py"):
+                    zip_file.write(path.join(root, file), arcname)
+                    continue
+                cfile: str = path.join(build_dir, arcname + "c")
+                py_compile.compile(
+                    path.join(root, file),
+                    cfile=cfile,
+                    dfile=arcname,
+                    doraise=True,
+                    optimize=1,
+                )
+                zip_file.write(cfile, arcname + "c")
+
+
+def zip_files_and_directories(zipfile_name: str, bytecode: bool = False) -> None:
+    """
+    @param bytecode: ship `BYTECODE_DIRECTORIES` as optimized `.pyc` files
     @return:
     """
 
@@ -95,7 +138,10 @@ def zip_files_and_directories(zipfile_name: str) -> None:
 
     # write directories to the zipfile
     for directory, values in ZIP_DIRECTORIES.items():
-        if values["zip_all"]:
+        if bytecode and directory in BYTECODE_DIRECTORIES:
+            print(f"Compiling {directory} to bytecode for {sys.version.split()[0]}...")
+            zip_bytecode(path.join(ROOT_DIRECTORY, directory), zip_file)
+        elif values["zip_all"]:
             zip_dir(path.join(ROOT_DIRECTORY, directory), zip_file)
         else:
             path_to_dir = path.join(ROOT_DIRECTORY, directory, values["folder_to_zip"])
@@ -193,6 +239,14 @@ def on_error(func, path, exc_info):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--bytecode",
+        action="store_true",
+        help="ship our modules as optimized .pyc files for a faster startup",
+    )
+    args = parser.parse_args()
+
     print("Cloning python-sc2...")
     destination_directory = os.path.join("../", "python-sc2")
     if os.path.exists(destination_directory):
@@ -266,7 +320,7 @@ if __name__ == "__main__":
 
     print(f"Zipping files and directories to {zipfile_name}...")
     # copy everything we need into a zip file
-    zip_files_and_directories(zipfile_name)
+    zip_files_and_directories(zipfile_name, bytecode=args.bytecode)
 
     print(f"Cleaning up...")
 
@@ -0,0 +1,100 @@
+"""
+Report where two decision logs (see `bot/managers/decision_log.py`) diverge.
+
+Enable `DecisionLog` in `config.yml`, then play the same game with both
+versions of the bot: same map, same opponent and the same `random_seed`
+passed to `run_game`. Until a decision changes the game plays out the same,
+so the first divergence is the first decision the change affected.
+
+Usage:
+    python scripts/diff_decision_logs.py old.qbdl new.qbdl --limit 5
+"""
+import argparse
+import sys
+from os import path
+from typing import Optional
+
+import numpy as np
+
+sys.path.append(path.abspath(path.join(path.dirname(__file__), "..")))
+
+from bot.managers.decision_log import DecisionType, read_decision_log  # noqa: E402
+
+# decisions made in the same game loop are compared as a set
+SORT_ORDER: list[str] = ["game_loop", "decision", "key", "value", "x", "y"]
+
+
+def format_record(record: Optional[np.void]) -> str:
+    if record is None:
+        return "-"
+    decision: DecisionType = DecisionType(int(record["decision"]))
+    if decision in {
+        DecisionType.NYDUS_CANAL_TARGET,
+        DecisionType.NYDUS_ATTACK_TARGET,
+    }:
+        details: str = f"({record['x']:.1f}, {record['y']:.1f})"
+    elif decision == DecisionType.STRUCTURE_PLACED:
+        details = f"type {record['key']} at ({record['x']:.1f}, {record['y']:.1f})"
+    else:
+        details = f"key {record['key']} value {record['value']}"
+    return f"loop {record['game_loop']:>6} {decision.name:<20} {details}"
+
+
+def divergences(old: np.ndarray, new: np.ndarray, limit: int) -> list[tuple]:
+    """Index and records of the first `limit` positions where the logs differ.
+
+    Once the logs differ the game itself usually differs too, so after the
+    first divergence the remaining ones are mostly knock on effects.
+    """
+    num_common: int = min(len(old), len(new))
+    differs: np.ndarray = np.flatnonzero(old[:num_common] != new[:num_common])
+    found: list[tuple] = [(int(i), old[i], new[i]) for i in differs[:limit]]
+    if len(found) < limit and len(old) != len(new):
+        found.append(
+            (
+                num_common,
+                old[num_common] if num_common < len(old) else None,
+                new[num_common] if num_common < len(new) else None,
+            )
+        )
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old", help="decision log from the baseline version")
+    parser.add_argument("new", help="decision log from the changed version")
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    old: np.ndarray = np.sort(read_decision_log(args.old), order=SORT_ORDER)
+    new: np.ndarray = np.sort(read_decision_log(args.new), order=SORT_ORDER)
+
+    first: list[tuple] = divergences(old, new, 1)
+    if not first:
+        print(f"Logs are identical ({len(old)} decisions)")
+        sys.exit(0)
+    _, old_record, new_record = first[0]
+    loop: int = min(
+        int(r["game_loop"]) for r in (old_record, new_record) if r is not None
+    )
+    print(f"First divergence at game loop {loop} ({loop / 22.4:.1f}s)\n")
+
+    for decision in DecisionType:
+        old_decisions: np.ndarray = old[old["decision"] == decision]
+        new_decisions: np.ndarray = new[new["decision"] == decision]
+        found: list[tuple] = divergences(old_decisions, new_decisions, args.limit)
+        print(
+            f"{decision.name}: {len(old_decisions)} old, {len(new_decisions)} new"
+            f"{', identical' if not found else ''}"
+        )
+        for i, old_record, new_record in found:
+            print(f"  #{i}")
+            print(f"    old: {format_record(old_record)}")
+            print(f"    new: {format_record(new_record)}")
+
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()